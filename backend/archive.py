@@ -0,0 +1,251 @@
+# backend/archive.py
+# Archive Parquet des saisons terminées: fichiers compressés partitionnés par saison et par mois,
+# lus avec filtrage poussé jusqu'aux fichiers (partitions et statistiques des row groups)
+#   python -m backend.archive 2425 [--remove]
+import argparse
+import os
+from datetime import date, time
+from enum import Enum
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import delete, func, insert
+from sqlmodel import Session, select
+
+from backend.database import DATA_DIR, engine_permanent, season_registry, season_path, create_permanent_tables
+from backend.models import TrainingSession, UserTrainingLinks, CoachTrainingLinks, HealthCheck, SeasonSummary
+from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+
+# Lignes lues dans SQLite puis écrites dans Parquet par paquet
+archive_batch_size = 5000
+
+# --- Tables archivées: nom -> (table, colonne de date servant au partitionnement) ---
+# les liens n'ont pas de date: ils sont rangés au mois de leur séance
+archive_tables = {
+    "trainingsession": (TrainingSession.__table__, "date"),
+    "usertraininglinks": (UserTrainingLinks.__table__, None),
+    "coachtraininglinks": (CoachTrainingLinks.__table__, None),
+    "health_check": (HealthCheck.__table__, "date"),
+    "physicalissueticket": (PhysicalIssueTicket.__table__, "date_opened"),
+    "physicalissuefollowup": (PhysicalIssueFollowUp.__table__, "date"),
+}
+
+arrow_types = {
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    date: pa.date32(),
+    time: pa.time64("us"),
+}
+
+archive_partitioning = ds.partitioning(pa.schema([("season", pa.string()), ("month", pa.string())]), flavor="hive")
+
+
+def arrow_type(column):
+    python_type = column.type.python_type
+    if issubclass(python_type, Enum):
+        return pa.string()
+    return arrow_types.get(python_type, pa.string())
+
+
+def arrow_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def archive_statement(name):
+    table, date_column = archive_tables[name]
+    if date_column is None:
+        training = TrainingSession.__table__
+        return (
+            select(*table.columns, training.c.date.label("partition_date"))
+            # jointure externe: un lien vers une séance supprimée est archivé quand même (mois "inconnu")
+            .join(training, training.c.id == table.c.training_id, isouter=True)
+        )
+    return select(*table.columns, table.c[date_column].label("partition_date"))
+
+
+# --- Écriture ---
+def archive_table(engine, season_id, name):
+    table, _ = archive_tables[name]
+    schema = pa.schema([pa.field(c.name, arrow_type(c)) for c in table.columns] + [pa.field("month", pa.string())])
+    written = [0]
+
+    def batches():
+        with Session(engine) as session:
+            result = session.execute(archive_statement(name).execution_options(yield_per=archive_batch_size))
+            for rows in result.partitions():
+                records = []
+                for row in rows:
+                    values = row._mapping
+                    record = {c.name: arrow_value(values[c.name]) for c in table.columns}
+                    record["month"] = str(values["partition_date"])[:7] if values["partition_date"] else "inconnu"
+                    records.append(record)
+                written[0] += len(records)
+                yield pa.RecordBatch.from_pylist(records, schema=schema)
+
+    ds.write_dataset(
+        batches(),
+        base_dir=os.path.join(ARCHIVE_DIR, name, f"season={season_id}"),
+        schema=schema,
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("month", pa.string())]), flavor="hive"),
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        existing_data_behavior="delete_matching",
+    )
+    return written[0]
+
+
+def season_summaries(session, season_id):
+    # résumé mensuel par athlète, gardé dans la base permanente
+    summaries = {}
+
+    def summary(user_id, month):
+        return summaries.setdefault((user_id, month), {"season": season_id, "user_id": user_id, "month": month})
+
+    month = func.strftime("%Y-%m", TrainingSession.date)
+    for user_id, m, sessions, duration, load, intensity in session.exec(
+        select(
+            UserTrainingLinks.user_id, month, func.count(),
+            func.sum(func.coalesce(TrainingSession.duration_minutes, 0)),
+            func.sum(func.coalesce(TrainingSession.duration_minutes, 0) * TrainingSession.intensity),
+            func.avg(TrainingSession.intensity),
+        )
+        .join(TrainingSession, TrainingSession.id == UserTrainingLinks.training_id)
+        .group_by(UserTrainingLinks.user_id, month)
+    ).all():
+        summary(user_id, m).update(sessions=sessions, duration=duration, load=load, avg_intensity=intensity)
+
+    month = func.strftime("%Y-%m", HealthCheck.date)
+    for user_id, m, checks, sleep_quality, energy_level, muscle_soreness in session.exec(
+        select(
+            HealthCheck.athlete_id, month, func.count(),
+            func.avg(HealthCheck.sleep_quality), func.avg(HealthCheck.energy_level), func.avg(HealthCheck.muscle_soreness),
+        )
+        .group_by(HealthCheck.athlete_id, month)
+    ).all():
+        summary(user_id, m).update(health_checks=checks, avg_sleep_quality=sleep_quality,
+                                   avg_energy_level=energy_level, avg_muscle_soreness=muscle_soreness)
+
+    month = func.substr(PhysicalIssueTicket.date_opened, 1, 7)
+    for user_id, m, issues in session.exec(
+        select(PhysicalIssueTicket.athlete_id, month, func.count())
+        .group_by(PhysicalIssueTicket.athlete_id, month)
+    ).all():
+        summary(user_id, m).update(issues_opened=issues)
+
+    return [SeasonSummary(**values).model_dump() for values in summaries.values()]
+
+
+def archive_season(season_id, remove=False):
+    if season_id == season_registry.current:
+        raise ValueError("La saison courante ne peut pas être archivée")
+    engine = season_registry.engines(season_id)[1]
+
+    report = {}
+    with Session(engine) as session:
+        for name, (table, _) in archive_tables.items():
+            expected = session.exec(select(func.count()).select_from(table)).one()
+            written = archive_table(engine, season_id, name)
+            if written != expected:
+                raise RuntimeError(f"{name}: {written} lignes archivées sur {expected}")
+            report[name] = written
+        summaries = season_summaries(session, season_id)
+
+    create_permanent_tables()
+    with Session(engine_permanent) as session:
+        session.exec(delete(SeasonSummary).where(SeasonSummary.season == season_id))
+        if summaries:
+            session.execute(insert(SeasonSummary.__table__), summaries)
+        session.commit()
+    report["season_summary"] = len(summaries)
+
+    # la base SQLite n'est supprimée qu'une fois toutes les tables archivées et vérifiées
+    if remove:
+        season_registry.close(season_id)
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(season_path(season_id) + suffix):
+                os.remove(season_path(season_id) + suffix)
+    return report
+
+
+# --- Lecture ---
+def archived_seasons():
+    path = os.path.join(ARCHIVE_DIR, "trainingsession")
+    if not os.path.isdir(path):
+        return []
+    return sorted(d.split("=", 1)[1] for d in os.listdir(path) if d.startswith("season="))
+
+
+def archive_dataset(name):
+    path = os.path.join(ARCHIVE_DIR, name)
+    if not os.path.isdir(path):
+        return None
+    return ds.dataset(path, format="parquet", partitioning=archive_partitioning)
+
+
+def period_filter(date_field, start_date=None, end_date=None):
+    # le filtre sur "month" élague les partitions, celui sur la date les row groups
+    expression = ds.scalar(True)
+    if start_date:
+        expression = expression & (ds.field("month") >= start_date.strftime("%Y-%m"))
+        if date_field:
+            expression = expression & (ds.field(date_field) >= start_date)
+    if end_date:
+        expression = expression & (ds.field("month") <= end_date.strftime("%Y-%m"))
+        if date_field:
+            expression = expression & (ds.field(date_field) <= end_date)
+    return expression
+
+
+def scan_archive(name, expression, columns=None):
+    dataset = archive_dataset(name)
+    if dataset is None:
+        return []
+    return dataset.to_table(columns=columns, filter=expression).to_pylist()
+
+
+def archived_trainings(user_id, start_date=None, end_date=None):
+    links = scan_archive(
+        "usertraininglinks",
+        (ds.field("user_id") == user_id) & period_filter(None, start_date, end_date),
+        columns=["season", "training_id"],
+    )
+    if not links:
+        return []
+
+    # les ids ne sont uniques qu'au sein d'une saison
+    ids_by_season = {}
+    for link in links:
+        ids_by_season.setdefault(link["season"], []).append(link["training_id"])
+    expression = None
+    for season, ids in ids_by_season.items():
+        season_expression = (ds.field("season") == season) & ds.field("id").isin(ids)
+        expression = season_expression if expression is None else expression | season_expression
+
+    trainings = scan_archive("trainingsession", expression & period_filter("date", start_date, end_date))
+    return sorted(trainings, key=lambda t: t["date"])
+
+
+def archived_health_checks(user_id, start_date=None, end_date=None):
+    checks = scan_archive(
+        "health_check",
+        (ds.field("athlete_id") == user_id) & period_filter("date", start_date, end_date),
+    )
+    return sorted(checks, key=lambda h: h["date"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive Parquet d'une saison terminée")
+    parser.add_argument("season", help="ex: 2425")
+    parser.add_argument("--remove", action="store_true", help="supprime la base SQLite de la saison une fois archivée")
+    args = parser.parse_args()
+
+    report = archive_season(args.season, args.remove)
+    for name, count in report.items():
+        print(f"{name}: {count} ligne(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -65,7 +65,40 @@ def compute_hungarian_score(event, sex, perf):
             # la perf est trop mauvaise pour valoir des points
             return 0
         return int(np.floor(a*(b-perf)**c))
-        
+
+# Tables de coefficients indexées par (sexe, épreuve), pour le calcul vectorisé
+coef_keys = {}
+coef_table = []
+for sex, table in (('M', men_ec), ('F', women_ec)):
+    for event, (a, b, c) in table.items():
+        # direction = +1 pour les concours (plus c'est loin mieux c'est), -1 pour les courses
+        direction = -1.0 if event in races else 1.0
+        divisor = 100.0 if event in throws else 1.0
+        coef_keys[(sex, event)] = len(coef_table)
+        coef_table.append((a, b, c, direction, divisor))
+coef_table = np.array(coef_table, dtype=float)
+
+def compute_hungarian_scores(events, sexes, perfs):
+    """Version vectorisée de compute_hungarian_score: un seul passage NumPy sur des tableaux (event, sex, perf)."""
+    if not (len(events) == len(sexes) == len(perfs)):
+        raise ValueError("events, sexes et perfs doivent avoir la même longueur")
+
+    perfs = np.asarray(perfs, dtype=float)
+    idx = np.empty(len(perfs), dtype=int)
+    for i, (event, sex) in enumerate(zip(events, sexes)):
+        # épreuve non calculable ou sans barème pour ce sexe: score 0 pour cette case seulement, pas d'échec du lot
+        idx[i] = coef_keys.get((sex, event), -1)
+
+    known = idx >= 0
+    a, b, c, direction, divisor = coef_table[np.where(known, idx, 0)].T
+
+    # écart à la performance de référence, > 0 si la perf vaut des points
+    diff = direction * (perfs / divisor - b)
+    valid = known & (diff > 0)
+    scores = np.zeros(len(perfs), dtype=int)
+    scores[valid] = np.floor(a[valid] * diff[valid] ** c[valid]).astype(int)
+    return scores
+
 
 
 if __name__ == "__main__":#
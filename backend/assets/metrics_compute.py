@@ -1,4 +1,8 @@
+import hashlib
+import json
+
 import numpy as np
+import pandas as pd
 
 daily_measurements = {
     "sleep_duration": 7.5,
@@ -92,46 +96,25 @@ metrics_data = {
 
 # === Score de récupération === #
 
-# Calcul du score global
-def recovery_score(measurements):
-    normalized_scores = []
-    metric_names = metrics_data.keys()
-    weight_sum = 0
-    for metric, value in measurements.items():
-        if metric in metric_names and value: # 'and value' pour skip les valeurs None (les 4 tests optionnels s'ils ne sont pas renseignés)
-            score, weight = normalize_metric(value, metric)
-            weight_sum += weight
-            normalized_scores.append(score)
-            
-    if weight_sum == 0:
-        return 0.0
-    
-    combined_score = np.sum(normalized_scores)/weight_sum
-    return round(combined_score * 10, 2)
+# Métrique du score -> colonne du HealthCheck
+health_check_fields = {
+    "sleep_duration": "sleep_duration",
+    "sleep_quality": "sleep_quality",
+    "resting_heart_rate": "resting_heart_rate",
+    "hand_grip_test": "hand_grip_test",
+    "longest_expiration_test": "longest_expiration_test",
+    "one_leg_proprio_test": "single_leg_proprio_test",
+}
 
+# Mesures du HealthCheck utilisées par le score de récupération (0 si pas de check ce jour-là)
+def health_check_metrics(health_check):
+    if health_check is None:
+        return {metric: 0 for metric in health_check_fields}
+    return {metric: getattr(health_check, field) for metric, field in health_check_fields.items()}
 
-# Calcul de la valeur normalisée par métrique
-def normalize_metric(value, metric_name):
-    weigth = metrics_data[metric_name]['weight']
-    direction = metrics_data[metric_name]['direction']
-    
-    lower_midpoint = metrics_data[metric_name]['parameters']['lower_midpoint']
-    upper_midpoint = metrics_data[metric_name]['parameters']['upper_midpoint']
-    steepness = metrics_data[metric_name]['parameters']['steepness']
-    floor = metrics_data[metric_name]['parameters']['floor']
-    ceil = metrics_data[metric_name]['parameters']['ceil']
-    alpha = metrics_data[metric_name]['parameters']['alpha']
-
-    if metrics_data[metric_name]['function'] == 'sigmoid':    
-        score = logistic_score(value, lower_midpoint, upper_midpoint, steepness, floor, ceil)
-        if direction == "low":
-            score = 1 - score
-    
-    else:
-        print(f"La fonction {metrics_data[metric_name]['function']} n'est pas encore écrite.")
-        return 0, 0 # placeholder for returning a score and a weight if fallback no with no associated function
-    
-    return score*weigth, weigth
+
+# === Fonctions de transfert (vectorisées) === #
+# x: valeurs brutes (n lignes x m métriques), p: paramètres compilés des m métriques, résultat dans [floor, ceil]
 
 # SIGMOID
 def logistic_score(x, lower_midpoint, upper_midpoint, steepness=1.0, floor=0.0, ceil=1.0):
@@ -140,6 +123,120 @@ def logistic_score(x, lower_midpoint, upper_midpoint, steepness=1.0, floor=0.0,
     
     return floor + (ceil - floor) * raw_score
 
+def sigmoid_transfer(x, p):
+    return logistic_score(x, p['lower_midpoint'], p['upper_midpoint'], p['steepness'], p['floor'], p['ceil'])
+
+# Rampe linéaire: floor sous lower_midpoint, ceil au-dessus de upper_midpoint
+def piecewise_linear_transfer(x, p):
+    raw_score = np.clip((x - p['lower_midpoint']) / (p['upper_midpoint'] - p['lower_midpoint']), 0, 1)
+    return p['floor'] + (p['ceil'] - p['floor']) * raw_score
+
+# Cloche centrée sur la zone optimale, écart-type = demi-largeur de la zone
+def gaussian_transfer(x, p):
+    center = (p['lower_midpoint'] + p['upper_midpoint']) / 2
+    width = (p['upper_midpoint'] - p['lower_midpoint']) / 2
+    raw_score = np.exp(-0.5 * ((x - center) / width) ** 2)
+    return p['floor'] + (p['ceil'] - p['floor']) * raw_score
+
+# Tout ou rien: ceil dans la zone [lower_midpoint, upper_midpoint], floor en dehors
+def banded_transfer(x, p):
+    inside = (x >= p['lower_midpoint']) & (x <= p['upper_midpoint'])
+    return np.where(inside, p['ceil'], p['floor'])
+
+transfer_functions = {
+    'sigmoid': sigmoid_transfer,
+    'piecewise_linear': piecewise_linear_transfer,
+    'gaussian': gaussian_transfer,
+    'banded': banded_transfer,
+}
+
+compiled_parameters = ['lower_midpoint', 'upper_midpoint', 'steepness', 'floor', 'ceil']
+
+
+# === Configuration compilée === #
+# metrics_data -> tableaux de paramètres (une case par métrique), construits une fois à l'import
+def compile_metrics(metrics):
+    unknown = {config['function'] for config in metrics.values()} - set(transfer_functions)
+    if unknown:
+        raise ValueError(f"Fonction(s) de transfert inconnue(s): {sorted(unknown)}")
+
+    names = list(metrics)
+    functions = np.array([metrics[m]['function'] for m in names])
+    compiled = {
+        'names': names,
+        'index': {m: i for i, m in enumerate(names)},
+        'weight': np.array([metrics[m]['weight'] for m in names], dtype=float),
+        'low': np.array([metrics[m]['direction'] == 'low' for m in names]),
+        # colonnes de chaque fonction de transfert et paramètres correspondants
+        'groups': [],
+    }
+    for name in dict.fromkeys(functions):
+        columns = np.flatnonzero(functions == name)
+        parameters = {
+            key: np.array([metrics[names[i]]['parameters'][key] for i in columns], dtype=float)
+            for key in compiled_parameters
+        }
+        compiled['groups'].append((transfer_functions[name], columns, parameters))
+    return compiled
+
+compiled_metrics = compile_metrics(metrics_data)
+
+# Version de la configuration: change dès qu'un poids, un sens ou un paramètre change (clé du cache des scores)
+metrics_version = hashlib.sha1(json.dumps(metrics_data, sort_keys=True).encode()).hexdigest()[:12]
+
+
+# Scores normalisés (n x m) dans [0, 1], sens de la métrique appliqué
+def transfer(values, compiled=compiled_metrics):
+    scores = np.empty_like(values)
+    for function, columns, parameters in compiled['groups']:
+        scores[:, columns] = function(values[:, columns], parameters)
+    return np.where(compiled['low'], 1 - scores, scores)
+
+
+# Calcul du score global
+def recovery_score(measurements):
+    return float(recovery_scores(pd.DataFrame([measurements])).iloc[0])
+
+
+# Calcul de la valeur normalisée par métrique
+def normalize_metric(value, metric_name):
+    i = compiled_metrics['index'][metric_name]
+    weight = float(compiled_metrics['weight'][i])
+    score = float(transfer(np.full((1, len(compiled_metrics['names'])), float(value)))[0, i])
+    return score*weight, weight
+
+
+# Calcul vectorisé: une ligne par HealthCheck, une colonne par métrique
+# 0 ou NaN = test non renseigné, son poids est retiré du dénominateur
+def recovery_scores(measurements, compiled=compiled_metrics):
+    values = measurements.reindex(columns=compiled['names']).to_numpy(dtype=float)
+    present = np.nan_to_num(values) != 0
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        scores = transfer(values, compiled)
+    weighted = np.where(present, scores * compiled['weight'], 0).sum(axis=1)
+    weight_sum = np.where(present, compiled['weight'], 0).sum(axis=1)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        combined = np.where(weight_sum > 0, weighted / weight_sum, 0.0)
+    return pd.Series(np.round(combined * 10, 2), index=measurements.index)
+
+
+# Matrice athlète x jour à partir des checks déjà notés (athlete_id, date, score), None les jours sans check
+def recovery_matrix(checks, athlete_ids, start_date, end_date):
+    days = pd.date_range(start_date, end_date, freq="D").date
+    matrix = (
+        checks.pivot(index="athlete_id", columns="date", values="score")
+        .reindex(index=athlete_ids, columns=days)
+    )
+    matrix = matrix.astype(object).where(matrix.notna(), None)
+    return {
+        "dates": list(days),
+        "athlete_ids": list(athlete_ids),
+        "scores": matrix.values.tolist(),
+    }
+
+
 if __name__ == '__main__':
     recovery = recovery_score(daily_measurements)
     print(f"Recovery score: {recovery}/10")
\ No newline at end of file
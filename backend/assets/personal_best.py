@@ -0,0 +1,162 @@
+import re
+
+from sqlmodel import Session, select, delete, func
+from sqlalchemy import Float, case, cast, column, literal_column
+
+from backend.models.performance import Performance, PersonalBest
+from backend.models.enumeration import AthlePerfNonMarked, MobilitePerf, VolleyPerf, MuscuPerf
+from backend.assets.hungarian import throws, jumps, races
+
+# --- Sens de comparaison des performances --- #
+# plus petit = meilleur (temps) / plus grand = meilleur (distances, charges, points)
+disciplines_to_min = races + [a.value for a in AthlePerfNonMarked] + [d.value for d in VolleyPerf]
+disciplines_to_max = jumps + throws + ["Décathlon", "Heptathlon"] + [c.value for c in MobilitePerf] + [b.value for b in MuscuPerf]
+
+
+# --- Lecture d'une perf chiffrée --- #
+# une seule grammaire, en Python (parse_mark) et en SQL (perf_quality_expression):
+# chiffres avec au plus une décimale pointée, espaces autour ignorés ("11.2", " 11.2 ")
+# tout le reste est non chiffré ("NM", "1.2.3", "11.", ".5", "1_1", "nan", "inf", ...)
+# max_mark borne les valeurs sous la valeur `unmarked` du tri SQL (et écarte l'infini)
+mark_pattern = re.compile(r"[0-9]+(\.[0-9]+)?")
+max_mark = 1e15
+
+
+def parse_mark(performance):
+    if performance is None:
+        return None
+    text = str(performance).strip(" ")
+    if not mark_pattern.fullmatch(text):
+        return None
+    value = float(text)
+    return value if value < max_mark else None
+
+
+def perf_key(discipline, performance, score=0):
+    # Valeur comparable où plus grand = meilleur, None si la perf n'est pas chiffrée (NM, DNF, ...)
+    if discipline in disciplines_to_min or discipline in disciplines_to_max:
+        value = parse_mark(performance)
+        if value is None:
+            return None
+        return -value if discipline in disciplines_to_min else value
+    # discipline sans sens connu: on garde le meilleur score
+    return score
+
+
+def perf_quality_expression(unmarked=1e18, columns=None):
+    # Équivalent SQL de perf_key, inversé: plus petit = meilleur
+    # les perfs non chiffrées (NM, DNF, ...) reçoivent la valeur `unmarked`
+    performance, discipline, score = columns or (Performance.performance, Performance.discipline, Performance.score)
+    text = func.trim(performance)
+    numeric = cast(text, Float)
+    # même grammaire que mark_pattern: chiffres et points seulement, un point au plus, ni en tête ni en fin
+    is_numeric = (
+        (text != "")
+        & (func.trim(text, "0123456789.") == "")
+        & (func.length(text) - func.length(func.replace(text, ".", "")) <= 1)
+        & (func.substr(text, 1, 1) != ".")
+        & (func.substr(text, -1, 1) != ".")
+        & (numeric < max_mark)
+    )
+    return case(
+        (discipline.in_(disciplines_to_min) & is_numeric, numeric),
+        (discipline.in_(disciplines_to_max) & is_numeric, -numeric),
+        (discipline.in_(disciplines_to_min + disciplines_to_max), unmarked),
+        else_=-score,
+    )
+
+
+# --- Clés de tri "meilleure" / "pire" perf, calculées par SQLite et indexées par athlète --- #
+# colonnes générées virtuelles (rien à écrire côté API, ajoutables par ALTER TABLE sur une base existante)
+quality_sort_columns = {"quality_best": 1e18, "quality_worst": -1e18}
+
+
+def quality_sort_column(name):
+    return literal_column(f"performance.{name}", Float)
+
+
+def create_performance_sort_columns(engine):
+    # expression sans nom de table: une colonne générée ne référence que les colonnes de sa ligne
+    # une colonne dont l'expression a changé (grammaire des perfs) est supprimée puis recréée avec son index
+    row_columns = (column("performance"), column("discipline"), column("score"))
+    with engine.begin() as conn:
+        existing = {row[1] for row in conn.exec_driver_sql("PRAGMA table_xinfo(performance)")}
+        table_sql = conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'performance'").scalar()
+        for name, unmarked in quality_sort_columns.items():
+            expression = perf_quality_expression(unmarked, row_columns).compile(
+                dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+            )
+            definition = f"{name} FLOAT GENERATED ALWAYS AS ({expression}) VIRTUAL"
+            if name in existing and definition not in table_sql:
+                conn.exec_driver_sql(f"DROP INDEX IF EXISTS ix_performance_user_{name}")
+                conn.exec_driver_sql(f"ALTER TABLE performance DROP COLUMN {name}")
+                existing.discard(name)
+            if name not in existing:
+                conn.exec_driver_sql(f"ALTER TABLE performance ADD COLUMN {definition}")
+            conn.exec_driver_sql(f"CREATE INDEX IF NOT EXISTS ix_performance_user_{name} ON performance (user_id, {name}, id)")
+
+
+def best_performance(perfs):
+    candidates = [p for p in perfs if perf_key(p.discipline, p.performance, p.score) is not None]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: perf_key(p.discipline, p.performance, p.score))
+
+
+def update_personal_best(session: Session, perf: Performance):
+    # À appeler après l'ajout (flush) d'une perf, dans la même transaction
+    key = perf_key(perf.discipline, perf.performance, perf.score)
+    if key is None:
+        return
+
+    pb = session.get(PersonalBest, (perf.user_id, perf.discipline))
+    if pb is not None and key <= perf_key(pb.discipline, pb.performance, pb.score):
+        return
+
+    if pb is None:
+        pb = PersonalBest(user_id=perf.user_id, discipline=perf.discipline, performance_id=perf.id,
+                          performance=perf.performance, unit=perf.unit, score=perf.score, date=perf.date)
+    else:
+        pb.performance_id = perf.id
+        pb.performance = perf.performance
+        pb.unit = perf.unit
+        pb.score = perf.score
+        pb.date = perf.date
+    session.add(pb)
+
+
+def refresh_personal_best(session: Session, user_id: int, discipline: str):
+    # Recalcul complet d'un PB (après suppression de la perf qui le détenait)
+    perfs = session.exec(
+        select(Performance)
+        .where(Performance.user_id == user_id)
+        .where(Performance.discipline == discipline)
+    ).all()
+    best = best_performance(perfs)
+
+    pb = session.get(PersonalBest, (user_id, discipline))
+    if pb is not None:
+        session.delete(pb)
+        session.flush()
+    if best is not None:
+        update_personal_best(session, best)
+
+
+def rebuild_personal_bests(session: Session):
+    session.exec(delete(PersonalBest))
+    groups = {}
+    for perf in session.exec(select(Performance)).all():
+        groups.setdefault((perf.user_id, perf.discipline), []).append(perf)
+    for perfs in groups.values():
+        best = best_performance(perfs)
+        if best is not None:
+            update_personal_best(session, best)
+    session.commit()
+
+
+def init_personal_bests(session: Session):
+    # Remplissage initial de la table pour une base existante
+    has_pb = session.exec(select(PersonalBest).limit(1)).first()
+    has_perf = session.exec(select(Performance).limit(1)).first()
+    if has_perf is not None and has_pb is None:
+        rebuild_personal_bests(session)
@@ -0,0 +1,93 @@
+import numpy as np
+import argparse
+
+from backend.assets.hungarian import coef_keys, coef_table, compute_hungarian_score, compute_hungarian_scores, races
+
+# Résolution de chronométrage/mesure: 0.01 s pour les courses, 1 cm pour les concours
+race_step = 0.01
+field_step = 1
+
+# Bornes des tables (s pour les courses, cm pour les concours)
+# Courses: de la perf à 0 point jusqu'à 40% de ce temps (bien en dessous des records du monde)
+race_min_ratio = 0.4
+# Concours: de la perf à 0 point jusqu'à une marque maximale par épreuve
+field_max_marks = {
+    "Longueur": 1000,
+    "Hauteur": 300,
+    "Perche": 700,
+    "Poids": 2500,
+    "Disque": 8000,
+    "Javelot": 10000,
+}
+
+# (sexe, épreuve) -> {"marks": [...], "points": [...]}, triés par qualité de perf croissante
+# (temps décroissants pour les courses, distances croissantes pour les concours)
+# donc les points sont croissants et searchsorted s'applique directement
+points_tables = {}
+
+
+def build_points_tables():
+    points_tables.clear()
+    for (sex, event), idx in coef_keys.items():
+        a, b, c, direction, divisor = coef_table[idx]
+        zero_mark = b * divisor # marque qui vaut 0 point, dans l'unité de saisie
+        if event in races:
+            ticks = np.arange(int(np.ceil(zero_mark / race_step)), int(np.floor(zero_mark * race_min_ratio / race_step)) - 1, -1)
+            marks = np.round(ticks * race_step, 2)
+        else:
+            ticks = np.arange(int(np.floor(zero_mark / field_step)), field_max_marks[event] + 1)
+            marks = ticks * float(field_step)
+        points = compute_hungarian_scores([event] * len(marks), [sex] * len(marks), marks)
+        points_tables[(sex, event)] = {
+            "marks": marks,
+            "points": points,
+            "step": -race_step if event in races else float(field_step),
+        }
+    return points_tables
+
+
+def lookup_points(event, sex, mark):
+    # Lecture directe dans la table en O(1), calcul par la formule si la marque est hors table
+    table = _get_table(event, sex)
+    if table is None:
+        return compute_hungarian_score(event, sex, mark)
+
+    position = (mark - table["marks"][0]) / table["step"]
+    index = int(round(position))
+    if abs(position - index) < 1e-6 and 0 <= index < len(table["marks"]):
+        return int(table["points"][index])
+    return compute_hungarian_score(event, sex, mark)
+
+
+def mark_for_points(event, sex, points):
+    # Marque minimale à réaliser pour obtenir au moins `points` points, None si inatteignable
+    table = _get_table(event, sex)
+    if table is None:
+        raise ValueError(f"Pas de barème pour l'épreuve {event} (sexe {sex})")
+
+    index = int(np.searchsorted(table["points"], points, side="left"))
+    if index >= len(table["points"]):
+        return None
+    return float(table["marks"][index]), int(table["points"][index])
+
+
+def _get_table(event, sex):
+    if not points_tables:
+        build_points_tables()
+    return points_tables.get((sex, event))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument('sex', type=str, help="Sexe de l'athlète")
+    parser.add_argument('event', type=str, help="Discipline concernée")
+    parser.add_argument('points', type=int, help="Nombre de points visé")
+
+    args = parser.parse_args()
+
+    result = mark_for_points(args.event, args.sex, args.points)
+    if result is None:
+        print(f'{args.points} points: inatteignable')
+    else:
+        print(f'{args.points} points: {result[0]} ({result[1]} pts)')
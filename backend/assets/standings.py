@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# --- Épreuves du décathlon, dans l'ordre --- #
+decaH = ["100m", "Longueur", "Poids", "Hauteur", "400m", "110mH", "Disque", "Perche", "Javelot", "1500m"]
+decaF = ["100m", "Longueur", "Poids", "Hauteur", "400m", "100mH", "Disque", "Perche", "Javelot", "1500m"]
+decaHM = ["100m", "Longueur", "Poids", "Hauteur", "400m", "100mH", "Disque", "Perche", "Javelot", "1500m"]
+all_events_deca = ["100m", "Longueur", "Poids", "Hauteur", "400m", "110mH/100mH", "Disque", "Perche", "Javelot", "1500m"]
+
+event_aliases = {
+    "110mH": "110mH/100mH",
+    "100mH": "110mH/100mH"
+}
+
+failed_marks = ['NM', 'DNS', 'DNF']
+
+
+def athlete_events(sexe, age):
+    if sexe == "M":
+        return decaHM if age < 16 else decaH
+    return decaF
+
+
+def compute_standings(rows, sexes=("M", "F")):
+    """
+    Classement d'une compétition à partir des lignes (user_id, name, sexe, age, best_total, event, performance, score).
+    Renvoie les athlètes triés par total décroissant, avec pour chaque épreuve le cumul, le rang intermédiaire,
+    la meilleure perf de l'épreuve et le flag de record personnel sur le total.
+    """
+    df = pd.DataFrame(rows, columns=["user_id", "name", "sexe", "age", "best_total", "event", "performance", "score"])
+    df = df[df["sexe"].isin(sexes)]
+    if df.empty:
+        return []
+
+    # Athlètes dans l'ordre d'apparition de leur première perf
+    athletes = df.drop_duplicates("user_id")[["user_id", "name", "sexe", "age", "best_total"]].reset_index(drop=True)
+    athletes["order"] = np.arange(len(athletes))
+
+    # Grille athlète x épreuve, avec l'épreuve réellement courue (110mH ou 100mH selon sexe/âge)
+    grid = athletes.merge(pd.DataFrame({"slot": all_events_deca, "slot_index": np.arange(len(all_events_deca))}), how="cross")
+    grid["event"] = [
+        athlete_events(sexe, age)[slot_index]
+        for sexe, age, slot_index in zip(grid["sexe"], grid["age"], grid["slot_index"])
+    ]
+    grid = grid.merge(df[["user_id", "event", "performance", "score"]], on=["user_id", "event"], how="left")
+
+    grid["has_result"] = grid["performance"].notna()
+    grid["score"] = grid["score"].fillna(0).astype(int)
+    grid.loc[grid["performance"].isin(failed_marks), "score"] = 0
+    grid["missing"] = grid["score"] == 0
+
+    grid = grid.sort_values(["order", "slot_index"])
+    grid["cumulative"] = grid.groupby("user_id")["score"].cumsum()
+
+    # Rang intermédiaire: cumul décroissant par épreuve, égalités départagées par ordre d'apparition
+    grid = grid.sort_values(["slot_index", "cumulative", "order"], ascending=[True, False, True])
+    grid["rank"] = grid.groupby("slot_index").cumcount() + 1
+
+    # Meilleure perf de chaque épreuve parmi les résultats saisis
+    best_by_slot = grid[grid["has_result"]].groupby("slot_index")["score"].max()
+    grid["is_event_best"] = grid["has_result"] & (grid["score"] == grid["slot_index"].map(best_by_slot))
+
+    totals = grid.groupby("user_id")["score"].sum()
+    athletes["total"] = athletes["user_id"].map(totals).astype(int)
+    athletes["best_total"] = athletes["best_total"].fillna(0)
+    athletes["is_pb"] = athletes["total"] > athletes["best_total"]
+    athletes = athletes.sort_values(["total", "order"], ascending=[False, True])
+    athletes["rank"] = np.arange(1, len(athletes) + 1)
+
+    grid = grid.sort_values(["order", "slot_index"])
+    results_by_athlete = {
+        user_id: [
+            {
+                "slot": r.slot,
+                "event": r.event,
+                "performance": r.performance if r.has_result else None,
+                "score": int(r.score),
+                "cumulative": int(r.cumulative),
+                "rank": int(r.rank),
+                "is_event_best": bool(r.is_event_best),
+                "missing": bool(r.missing),
+            }
+            for r in group.itertuples()
+        ]
+        for user_id, group in grid.groupby("user_id", sort=False)
+    }
+
+    return [
+        {
+            "user_id": int(a.user_id),
+            "name": a.name,
+            "sexe": a.sexe,
+            "age": int(a.age),
+            "rank": int(a.rank),
+            "total": int(a.total),
+            "best_total": float(a.best_total),
+            "is_pb": bool(a.is_pb),
+            "results": results_by_athlete[a.user_id],
+        }
+        for a in athletes.itertuples()
+    ]
@@ -0,0 +1,92 @@
+from collections import Counter
+
+# --- Type d'entraînement -> discipline ("sport") et nature ("type") travaillées, pour le radar du dashboard --- #
+training_type_to_event_mapping = {
+    "Sprint - Départ": {"sport": "Sprint", "type": "Technique"}, 
+    "Sprint - Lactique": {"sport": "", "type": "Lactique"}, 
+    "Sprint - Technique": {"sport": "Sprint", "type": "Technique"},
+    "Sprint - Gammes": {"sport": "Sprint", "type": "Gammes"},
+    
+    "Haies - Technique": {"sport": "Haies", "type": "Technique"}, 
+    "Haies - Passages": {"sport": "Haies", "type": "Recherche repères"},
+    "Haies - Gammes": {"sport": "Haies", "type": "Gammes"},
+    
+    "Course - Aérobie Haute": {"sport": "Aérobie", "type": "Intervalles"}, 
+    "Course - Aérobie Basse": {"sport": "Aérobie", "type": "EF"}, 
+    
+    "Longueur - Technique": {"sport": "Longueur", "type": "Technique"},
+    "Longueur - Élan réduit": {"sport": "Longueur", "type": "Technique"}, 
+    "Longueur - Élan complet": {"sport": "Longueur", "type": "Recherche repères"}, 
+    "Longueur - Gammes": {"sport": "Longueur", "type": "Gammes"},
+    
+    "Hauteur - Technique": {"sport": "Hauteur", "type": "Technique"},
+    "Hauteur - Élan réduit": {"sport": "Hauteur", "type": "Technique"}, 
+    "Hauteur - Élan complet": {"sport": "Hauteur", "type": "Recherche repères"}, 
+    "Hauteur - Gammes": {"sport": "Hauteur", "type": "Gammes"},
+    
+    "Perche - Technique": {"sport": "Perche", "type": "Technique"},
+    "Perche - Élan réduit": {"sport": "Perche", "type": "Technique"},
+    "Perche - Élan complet": {"sport": "Perche", "type": "Recherche repères"},
+    "Perche - Gammes": {"sport": "Perche", "type": "Gammes"},
+    
+    "Poids - Technique": {"sport": "Poids", "type": "Technique"},
+    "Poids - Élan réduit": {"sport": "Poids", "type": "Technique"},
+    "Poids - Élan complet": {"sport": "Poids", "type": "Recherche repères"},
+    "Poids - Gammes": {"sport": "Poids", "type": "Gammes"},
+    
+    "Disque - Technique": {"sport": "Disque", "type": "Technique"},
+    "Disque - Élan réduit": {"sport": "Disque", "type": "Technique"},
+    "Disque - Élan complet": {"sport": "Disque", "type": "Recherche repères"},
+    "Disque - Gammes": {"sport": "Disque", "type": "Gammes"},
+    
+    "Javelot - Technique": {"sport": "Javelot", "type": "Technique"},
+    "Javelot - Élan réduit": {"sport": "Javelot", "type": "Technique"},
+    "Javelot - Élan complet": {"sport": "Javelot", "type": "Recherche repères"}, 
+    "Javelot - Gammes": {"sport": "Javelot", "type": "Gammes"},
+    
+    "Muscu - Force": {"sport": "Muscu", "type": "Force"},
+    "Muscu - Puissance": {"sport": "Muscu", "type": "Puissance"},
+    "Muscu - Explosivité": {"sport": "Muscu", "type": "Explosivité"},
+    "PPG": {"sport": "Muscu", "type": "PPG"},
+    "Bondissements": {"sport": "Muscu", "type": "Bondissement"},
+    
+    "Compétition - Décathlon": {"sport": "Décathlon", "type": "Compétition"},
+    "Compétition - 100m": {"sport": "100m", "type": "Compétition"},
+    "Compétition - Longueur": {"sport": "Longueur", "type": "Compétition"},
+    "Compétition - Poids": {"sport": "Poids", "type": "Compétition"},
+    "Compétition - Hauteur": {"sport": "Hauteur", "type": "Compétition"},
+    "Compétition - 400m": {"sport": "400m", "type": "Compétition"},
+    "Compétition - 110mH": {"sport": "110mH", "type": "Compétition"},
+    "Compétition - Disque": {"sport": "Disque", "type": "Compétition"},
+    "Compétition - Perche": {"sport": "Perche", "type": "Compétition"},
+    "Compétition - Javelot": {"sport": "Javelot", "type": "Compétition"},
+    "Compétition - 1500m": {"sport": "1500m", "type": "Compétition"},
+    
+    "Général": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Épaules": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Hanches": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Dos": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Jambes": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Bas du corps": {"sport": "Mobilité", "type": "Mobilité"},
+    "Spécifique - Haut du corps": {"sport": "Mobilité", "type": "Mobilité"},
+    
+    "Prévention Blessure": {"sport": "Muscu", "type": "Prévention/Réhab"},
+}
+
+
+radar_axes = ("sport", "type")
+
+
+def radar_breakdown(training_types):
+    """
+    Nombre de séances par discipline et par nature d'entraînement, à partir des types des séances.
+    Les types absents du mapping sont ignorés.
+    """
+    breakdown = {}
+    for axis in radar_axes:
+        counts = Counter(
+            training_type_to_event_mapping.get(name, {}).get(axis) for name in training_types
+        )
+        counts.pop(None, None)
+        breakdown[axis] = [{"name": name, "value": value} for name, value in counts.most_common()]
+    return breakdown
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+# --- Fenêtres par défaut (jours) --- #
+acute_window = 7
+chronic_window = 28
+week = 7
+
+
+def history_days(chronic=chronic_window):
+    # jours de charge à lire avant le début de la période pour que la fenêtre chronique soit pleine
+    return chronic - 1
+
+
+def compute_workload(daily_load, start_date, end_date, acute=acute_window, chronic=chronic_window):
+    """
+    Séries quotidiennes de charge sur [start_date, end_date] à partir des lignes (date, srpe) de daily_training_load,
+    historique compris. Les jours sans séance comptent pour 0.
+    - ACWR "rolling": moyenne aiguë / moyenne chronique sur fenêtres glissantes
+    - ACWR "ewma": idem avec des moyennes exponentielles (lambda = 2 / (N + 1))
+    - monotonie de Foster: moyenne / écart-type de la charge sur 7 jours, contrainte (strain): charge hebdo x monotonie
+    Une valeur non définie (fenêtre incomplète, division par 0) vaut None.
+    """
+    days = pd.date_range(pd.Timestamp(start_date) - pd.Timedelta(days=history_days(chronic)), pd.Timestamp(end_date), freq="D")
+    df = pd.DataFrame(daily_load, columns=["date", "srpe"])
+    df["date"] = pd.to_datetime(df["date"])
+    srpe = df.groupby("date")["srpe"].sum().reindex(days, fill_value=0).astype(float)
+
+    acute_mean = srpe.rolling(acute, min_periods=acute).mean()
+    chronic_mean = srpe.rolling(chronic, min_periods=chronic).mean()
+    acute_ewma = srpe.ewm(alpha=2 / (acute + 1), adjust=False).mean()
+    chronic_ewma = srpe.ewm(alpha=2 / (chronic + 1), adjust=False).mean()
+
+    weekly_load = srpe.rolling(week, min_periods=week).sum()
+    weekly_std = srpe.rolling(week, min_periods=week).std(ddof=0)
+    monotony = (weekly_load / week) / weekly_std.replace(0, np.nan)
+
+    result = pd.DataFrame({
+        "srpe": srpe,
+        "acute_load": acute_mean,
+        "chronic_load": chronic_mean,
+        "acwr": acute_mean / chronic_mean.replace(0, np.nan),
+        "acute_ewma": acute_ewma,
+        "chronic_ewma": chronic_ewma,
+        "acwr_ewma": acute_ewma / chronic_ewma.replace(0, np.nan),
+        "weekly_load": weekly_load,
+        "monotony": monotony,
+        "strain": weekly_load * monotony,
+    }).loc[pd.Timestamp(start_date):]
+
+    result = result.round(3).astype(object).where(result.notna(), None)
+    result.insert(0, "date", result.index.date)
+    return result.to_dict(orient="records")
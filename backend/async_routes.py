@@ -0,0 +1,127 @@
+# backend/async_routes.py
+# Versions async des lectures sollicitées par les dashboards (OPENAMS_DB_MODE=async)
+from datetime import date
+from typing import List
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.models import TrainingSession, UserTrainingLinks, PersonalBest, HealthCheck
+from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp
+from backend.models.decathlon import DecathlonPerformance
+from backend.database import get_async_session_permanent, get_async_session_season, selected_season
+from backend.table_versions import not_modified
+from backend.assets.metrics_compute import health_check_metrics
+
+router = APIRouter()
+
+
+# === TRAINING === #
+@router.get("/users/{user_id}/trainings", response_model=List[TrainingSession])
+async def get_user_trainings(user_id: int, session: AsyncSession = Depends(get_async_session_season)):
+    result = await session.exec(
+        select(TrainingSession)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
+    )
+    return result.all()
+
+@router.get("/training_data")
+async def get_training_data(
+    request: Request,
+    response: Response,
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    season_id: str = Depends(selected_season),
+    session: AsyncSession = Depends(get_async_session_season),
+):
+    cached = not_modified(request, response, season_id, ["trainingsession", "usertraininglinks"])
+    if cached:
+        return cached
+    result = await session.exec(
+        select(TrainingSession)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
+        .where(TrainingSession.date >= start_date)
+        .where(TrainingSession.date <= end_date)
+    )
+    return [
+        {
+            "date": t.date,
+            "duration": t.duration_minutes,
+            "intensity": t.intensity,
+            "sport": t.sport,
+            "type": t.type,
+        }
+        for t in result.all()
+    ]
+
+
+# === PERFORMANCE === #
+@router.get("/users/{user_id}/pbs", response_model=List[PersonalBest])
+async def get_user_pbs(user_id: int, session: AsyncSession = Depends(get_async_session_permanent)):
+    result = await session.exec(
+        select(PersonalBest)
+        .where(PersonalBest.user_id == user_id)
+        .order_by(PersonalBest.discipline)
+    )
+    return result.all()
+
+
+# === DECATHLON === #
+@router.get("/decathlon_performances")
+async def get_decathlon_performances(decathlon_id: int, session: AsyncSession = Depends(get_async_session_permanent)):
+    result = await session.exec(select(DecathlonPerformance).where(DecathlonPerformance.decathlon_id == decathlon_id))
+    return result.all()
+
+
+# === HEALTH === #
+@router.get("/health-checks/by-athlete/{athlete_id}", response_model=list[HealthCheck])
+async def get_health_checks_by_athlete(
+    request: Request,
+    response: Response,
+    athlete_id: int,
+    season_id: str = Depends(selected_season),
+    session: AsyncSession = Depends(get_async_session_season),
+):
+    cached = not_modified(request, response, season_id, ["health_check"])
+    if cached:
+        return cached
+    result = await session.exec(select(HealthCheck).where(HealthCheck.athlete_id == athlete_id))
+    return result.all()
+
+@router.get("/health-checks/by-athlete/{athlete_id}/{end_date}", response_model=HealthCheck)
+async def get_today_health_check(
+    request: Request,
+    response: Response,
+    athlete_id: int,
+    end_date: date = date.today(),
+    season_id: str = Depends(selected_season),
+    session: AsyncSession = Depends(get_async_session_season),
+):
+    cached = not_modified(request, response, season_id, ["health_check"])
+    if cached:
+        return cached
+    result = await session.exec(
+        select(HealthCheck).where(
+            (HealthCheck.athlete_id == athlete_id) &
+            (HealthCheck.date == end_date)
+        )
+    )
+    return health_check_metrics(result.first())
+
+@router.get("/athletes/{athlete_id}/issues/", response_model=list[PhysicalIssueTicket])
+async def get_athlete_issues(athlete_id: int, session: AsyncSession = Depends(get_async_session_season)):
+    result = await session.exec(select(PhysicalIssueTicket).where(PhysicalIssueTicket.athlete_id == athlete_id))
+    return result.all()
+
+@router.get("/issues/{ticket_id}/followups/", response_model=list[PhysicalIssueFollowUp])
+async def get_issue_followups(ticket_id: int, session: AsyncSession = Depends(get_async_session_season)):
+    result = await session.exec(
+        select(PhysicalIssueFollowUp)
+        .where(PhysicalIssueFollowUp.ticket_id == ticket_id)
+        .order_by(PhysicalIssueFollowUp.date)
+    )
+    return result.all()
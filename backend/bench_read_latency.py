@@ -0,0 +1,125 @@
+# backend/bench_read_latency.py
+# Latence des lectures du dashboard pendant des écritures concurrentes, par profil d'engine
+#   python -m backend.bench_read_latency --readers 8 --duration 10
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy.exc import OperationalError
+from sqlmodel import SQLModel, Session, select
+
+from backend.database import make_engine, season_tables
+from backend.models import TrainingSession, UserTrainingLinks
+
+# profils comparés: nom -> (profil d'écriture, profil de lecture)
+bench_profiles = {
+    "bare": ("bare", "bare"),
+    "tuned": ("write", "read"),
+}
+
+first_day = date(2025, 9, 1)
+
+
+def add_training(session, day, athlete_ids):
+    training = TrainingSession(sport="Athlétisme", type="PPG", duration_minutes=random.randint(20, 120),
+                               date=day, intensity=random.randint(1, 10))
+    session.add(training)
+    session.flush()
+    for user_id in athlete_ids:
+        session.add(UserTrainingLinks(user_id=user_id, training_id=training.id))
+    session.commit()
+
+
+def seed(engine, athletes, trainings):
+    SQLModel.metadata.create_all(engine, tables=season_tables)
+    with Session(engine) as session:
+        for i in range(trainings):
+            add_training(session, first_day + timedelta(days=i % 300), random.sample(range(1, athletes + 1), 3))
+
+
+def read_training_data(session, user_id):
+    # même requête que GET /training_data sur 28 jours
+    start = first_day + timedelta(days=random.randint(0, 270))
+    return session.exec(
+        select(TrainingSession)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
+        .where(TrainingSession.date >= start)
+        .where(TrainingSession.date <= start + timedelta(days=28))
+    ).all()
+
+
+def run(profile, args, directory):
+    write_profile, read_profile = bench_profiles[profile]
+    url = f"sqlite:///{os.path.join(directory, f'{profile}.db')}"
+    write_engine = make_engine(url, write_profile)
+    read_engine = make_engine(url, read_profile)
+    seed(write_engine, args.athletes, args.trainings)
+
+    latencies, errors = [], {"read": 0, "write": 0}
+    writes = [0]
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def writer():
+        with Session(write_engine) as session:
+            while not stop.is_set():
+                try:
+                    add_training(session, first_day + timedelta(days=random.randint(0, 300)), random.sample(range(1, args.athletes + 1), 3))
+                    writes[0] += 1
+                except OperationalError:
+                    session.rollback()
+                    errors["write"] += 1
+
+    def reader():
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with Session(read_engine) as session:
+                    read_training_data(session, random.randint(1, args.athletes))
+            except OperationalError:
+                with lock:
+                    errors["read"] += 1
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    write_engine.dispose()
+    read_engine.dispose()
+
+    ms = np.array(latencies) * 1000
+    print(f"{profile:>6} | lectures {len(ms):>7} | p50 {np.percentile(ms, 50):7.2f} ms | p95 {np.percentile(ms, 95):7.2f} ms"
+          f" | p99 {np.percentile(ms, 99):7.2f} ms | max {ms.max():8.2f} ms | écritures {writes[0]:>6}"
+          f" | erreurs lecture/écriture {errors['read']}/{errors['write']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latence de lecture sous écritures concurrentes, par profil d'engine")
+    parser.add_argument("--profiles", nargs="+", default=list(bench_profiles), choices=list(bench_profiles))
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10, help="secondes par profil")
+    parser.add_argument("--athletes", type=int, default=30)
+    parser.add_argument("--trainings", type=int, default=5000, help="séances créées avant la mesure")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in args.profiles:
+            run(profile, args, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+# backend/bulk_import.py
+# Import en masse de l'historique (CSV / JSON / NDJSON)
+#   python -m backend.bulk_import trainings data/trainings.csv
+import argparse
+import csv
+import io
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, select
+
+from backend.database import engine_permanent, engine_permanent_read, season_registry, create_permanent_tables, create_season_tables
+from backend.models import User, TrainingSession, UserTrainingLinks, CoachTrainingLinks, Performance
+from backend.models.health_check import HealthCheck
+from backend.models.decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
+from backend.assets.personal_best import refresh_personal_best
+
+# Nombre de lignes validées puis écrites par transaction
+import_chunk_size = 500
+
+# --- Jeux de données importables: nom -> (modèle de validation, champ de l'athlète) ---
+# validation sur les modèles de table: une ligne qui passe la validation respecte les NOT NULL
+import_datasets = {
+    "trainings": (TrainingSession, None),
+    "health_checks": (HealthCheck, "athlete_id"),
+    "performances": (Performance, "user_id"),
+    "decathlon_performances": (DecathlonPerformance, "user_id"),
+}
+
+
+# --- Lecture des fichiers ---
+def parse_rows(content, filename=""):
+    # JSON (liste d'objets) ou NDJSON selon le contenu, CSV selon l'extension
+    if filename.endswith(".csv"):
+        reader = csv.DictReader(io.StringIO(content))
+        # cellule vide = valeur absente
+        return [{k: (v if v != "" else None) for k, v in row.items()} for row in reader]
+    content = content.strip()
+    if content.startswith("["):
+        return json.loads(content)
+    return [json.loads(line) for line in content.splitlines() if line.strip()]
+
+
+def parse_ids(value):
+    # liste d'ids: [1, 2] en JSON, "1;2" en CSV
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [int(v) for v in value]
+    return [int(v) for v in str(value).replace(",", ";").split(";") if v.strip()]
+
+
+def chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield start, rows[start:start + size]
+
+
+# --- Validation d'un paquet ---
+def validate_chunk(dataset, rows, start, known_users, known_decathlons=frozenset()):
+    model, athlete_field = import_datasets[dataset]
+    valid, errors = [], []
+    for i, raw in enumerate(rows, start=start + 1):
+        raw = dict(raw)
+        try:
+            links = {}
+            if dataset == "trainings":
+                links = {"athlete_ids": parse_ids(raw.pop("athlete_ids", None)),
+                         "coach_ids": parse_ids(raw.pop("coach_ids", None))}
+            item = model.model_validate(raw)
+        except (ValidationError, ValueError) as e:
+            errors.append({"row": i, "error": str(e)})
+            continue
+
+        user_ids = links.get("athlete_ids", []) + links.get("coach_ids", [])
+        if athlete_field:
+            user_ids = [getattr(item, athlete_field)]
+        unknown = [u for u in user_ids if u not in known_users]
+        if unknown:
+            errors.append({"row": i, "error": f"Utilisateur(s) introuvable(s): {unknown}"})
+            continue
+        if dataset == "decathlon_performances" and item.decathlon_id not in known_decathlons:
+            errors.append({"row": i, "error": f"Décathlon introuvable: {item.decathlon_id}"})
+            continue
+
+        values = item.model_dump()
+        if values.get("id") is None:
+            values.pop("id", None)
+        valid.append((i, values, links))
+    return valid, errors
+
+
+# --- Écriture d'un paquet (une transaction, executemany) ---
+def insert_ignore(session, table, rows):
+    # INSERT ... ON CONFLICT DO NOTHING: une ligne dont la clé (primaire ou unique) existe déjà est ignorée
+    if not rows:
+        return 0
+    return session.execute(sqlite_insert(table).on_conflict_do_nothing(), rows).rowcount
+
+
+def write_trainings(session, valid):
+    table = TrainingSession.__table__
+    with_id = [(values, links) for _, values, links in valid if "id" in values]
+    without_id = [(values, links) for _, values, links in valid if "id" not in values]
+
+    # un id déjà en base est ignoré avec ses liens: seuls les ids réellement insérés (RETURNING) sont liés
+    training_ids, links = [], []
+    if with_id:
+        result = session.execute(
+            sqlite_insert(table).on_conflict_do_nothing().returning(table.c.id),
+            [values for values, _ in with_id]
+        )
+        created = set(result.scalars().all())
+        for values, l in with_id:
+            if values["id"] in created:
+                training_ids.append(values["id"])
+                links.append(l)
+    inserted = len(training_ids)
+
+    # ids générés par la base, dans l'ordre des lignes
+    if without_id:
+        result = session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [values for values, _ in without_id]
+        )
+        training_ids += result.scalars().all()
+        links += [l for _, l in without_id]
+        inserted += len(without_id)
+
+    insert_ignore(session, UserTrainingLinks.__table__, [
+        {"user_id": user_id, "training_id": training_id}
+        for training_id, l in zip(training_ids, links) for user_id in l["athlete_ids"]
+    ])
+    insert_ignore(session, CoachTrainingLinks.__table__, [
+        {"coach_id": coach_id, "training_id": training_id}
+        for training_id, l in zip(training_ids, links) for coach_id in l["coach_ids"]
+    ])
+    return inserted, []
+
+
+def new_rows(session, table, rows, key_columns, scope_column):
+    # clé naturelle (une perf par athlète et épreuve d'un décathlon): on écarte les lignes dont la clé existe déjà
+    columns = [table.c[c] for c in key_columns]
+    scope = {r[scope_column] for r in rows}
+    seen = set(session.execute(select(*columns).where(table.c[scope_column].in_(scope))).all()) if scope else set()
+    kept = []
+    for r in rows:
+        key = tuple(r[c] for c in key_columns)
+        if key not in seen:
+            seen.add(key)
+            kept.append(r)
+    return kept
+
+
+def possible_duplicates(session, table, valid, scope_column):
+    # lignes identiques (toutes colonnes sauf id) à une ligne en base ou plus haut dans le fichier:
+    # importées quand même (deux marques égales le même jour sont possibles), signalées dans le rapport
+    columns = [c for c in table.columns if c.name != "id"]
+    scope = {values[scope_column] for _, values, _ in valid}
+    seen = set(session.execute(select(*columns).where(table.c[scope_column].in_(scope))).all()) if scope else set()
+    warnings = []
+    for row, values, _ in valid:
+        key = tuple(values.get(c.name) for c in columns)
+        if key in seen:
+            warnings.append({"row": row, "warning": "Doublon possible: ligne identique déjà présente"})
+        seen.add(key)
+    return warnings
+
+
+def write_performances(session, valid):
+    # pas de clé naturelle: seul un id déjà en base est ignoré, comme pour les séances
+    table = Performance.__table__
+    warnings = possible_duplicates(session, table, valid, "user_id")
+
+    with_id = [values for _, values, _ in valid if "id" in values]
+    created = set()
+    if with_id:
+        created = set(session.execute(sqlite_insert(table).on_conflict_do_nothing().returning(table.c.id), with_id).scalars().all())
+    without_id = [values for _, values, _ in valid if "id" not in values]
+    if without_id:
+        session.execute(insert(table), without_id)
+
+    inserted = [(row, values) for row, values, _ in valid if "id" not in values or values["id"] in created]
+    inserted_rows = {row for row, _ in inserted}
+    # PB recalculés une fois par (athlète, discipline) touché.e
+    for user_id, discipline in {(values["user_id"], values["discipline"]) for _, values in inserted}:
+        refresh_personal_best(session, user_id, discipline)
+    return len(inserted), [w for w in warnings if w["row"] in inserted_rows]
+
+
+def write_decathlon_performances(session, valid):
+    rows = new_rows(session, DecathlonPerformance.__table__, [values for _, values, _ in valid],
+                    ("decathlon_id", "user_id", "event"), "decathlon_id")
+    inserted = insert_ignore(session, DecathlonPerformance.__table__, rows)
+    insert_ignore(session, DecathlonAthleteLink.__table__, [
+        {"decathlon_id": decathlon_id, "user_id": user_id}
+        for decathlon_id, user_id in {(r["decathlon_id"], r["user_id"]) for r in rows}
+    ])
+    return inserted, []
+
+
+def write_health_checks(session, valid):
+    # la contrainte unique (date, athlete_id) écarte les doublons
+    return insert_ignore(session, HealthCheck.__table__, [values for _, values, _ in valid]), []
+
+
+import_writers = {
+    "trainings": ("season", write_trainings),
+    "health_checks": ("season", write_health_checks),
+    "performances": ("permanent", write_performances),
+    "decathlon_performances": ("permanent", write_decathlon_performances),
+}
+
+# Tables modifiées par chaque import (versions des GET conditionnels)
+import_tables = {
+    "trainings": ["trainingsession", "usertraininglinks", "coachtraininglinks", "daily_training_load"],
+    "health_checks": ["health_check"],
+    "performances": ["performance", "personal_best"],
+    "decathlon_performances": ["decathlonperformance", "decathlonathletelink"],
+}
+
+
+def import_rows(dataset, rows, chunk_size=import_chunk_size, season=None):
+    base, writer = import_writers[dataset]
+    engine = engine_permanent if base == "permanent" else season_registry.engines(season)[0]
+    with Session(engine_permanent_read) as session:
+        known_users = set(session.exec(select(User.id)).all())
+        known_decathlons = set(session.exec(select(Decathlon.id)).all())
+
+    report = {"received": len(rows), "inserted": 0, "skipped": 0, "errors": [], "warnings": []}
+    with Session(engine) as session:
+        for start, chunk in chunks(rows, chunk_size):
+            valid, errors = validate_chunk(dataset, chunk, start, known_users, known_decathlons)
+            report["errors"] += errors
+            inserted, warnings = writer(session, valid)
+            report["warnings"] += warnings
+            session.commit()
+            report["inserted"] += inserted
+            report["skipped"] += len(valid) - inserted
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import en masse de données historiques")
+    parser.add_argument("dataset", choices=list(import_datasets))
+    parser.add_argument("path", help="Fichier CSV, JSON ou NDJSON")
+    parser.add_argument("--chunk-size", type=int, default=import_chunk_size)
+    parser.add_argument("--season", default=None, help="Saison cible, ex: 2425 (saison courante par défaut)")
+    args = parser.parse_args()
+
+    create_permanent_tables()
+    create_season_tables(args.season)
+    with open(args.path, encoding="utf-8") as f:
+        rows = parse_rows(f.read(), args.path)
+
+    report = import_rows(args.dataset, rows, args.chunk_size, args.season)
+    print(f"{report['inserted']} ligne(s) importée(s), {report['skipped']} doublon(s) ignoré(s), {len(report['errors'])} erreur(s) sur {report['received']}")
+    for error in report["errors"]:
+        print(f"  ligne {error['row']}: {error['error']}")
+    for warning in report["warnings"]:
+        print(f"  ligne {warning['row']}: {warning['warning']}")
+
+
+if __name__ == "__main__":
+    main()
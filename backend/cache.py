@@ -0,0 +1,105 @@
+# backend/cache.py
+from collections import OrderedDict
+from threading import Lock
+
+from sqlmodel import Session, select
+from backend.models.user import User
+from backend.models.enumeration import Role
+
+
+class LRUCache:
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# --- Cache des users (lecture à travers le cache, invalidé par les écritures) ---
+class UserCache:
+    def __init__(self, maxsize=512):
+        self.rows = LRUCache(maxsize)
+        self.lists = LRUCache(8) # listes complètes: tous les users, tou.te.s les athlètes
+        # incrémentée à chaque invalidation: une lecture en base commencée avant n'est pas mise en cache
+        self.generation = 0
+        self._lock = Lock()
+
+    def _store(self, generation, store):
+        with self._lock:
+            if generation == self.generation:
+                store()
+
+    def get_many(self, session: Session, user_ids):
+        found = {}
+        missing = []
+        for user_id in user_ids:
+            row = self.rows.get(user_id)
+            if row is None:
+                missing.append(user_id)
+            else:
+                found[user_id] = row
+
+        # un seul SELECT ... IN (...) pour tout ce qui manque
+        if missing:
+            generation = self.generation
+            loaded = {user.id: user.dict() for user in session.exec(select(User).where(User.id.in_(missing))).all()}
+            found.update(loaded)
+
+            def store():
+                for user_id, row in loaded.items():
+                    self.rows.set(user_id, row)
+            self._store(generation, store)
+
+        return [found[user_id] for user_id in user_ids if user_id in found]
+
+    def get(self, session: Session, user_id):
+        rows = self.get_many(session, [user_id])
+        return rows[0] if rows else None
+
+    def get_list(self, session: Session, role: Role = None):
+        key = role.value if role else "all"
+        rows = self.lists.get(key)
+        if rows is None:
+            generation = self.generation
+            statement = select(User)
+            if role:
+                statement = statement.where(User.role == role)
+            rows = [user.dict() for user in session.exec(statement).all()]
+
+            def store():
+                self.lists.set(key, rows)
+                for row in rows:
+                    self.rows.set(row["id"], row)
+            self._store(generation, store)
+        return rows
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            self.generation += 1
+            if user_id is not None:
+                self.rows.pop(user_id)
+            self.lists.clear()
+
+
+user_cache = UserCache()
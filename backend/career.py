@@ -0,0 +1,158 @@
+# backend/career.py
+# Requêtes multi-saisons: les bases de saison sont ATTACHées à une connexion et réunies
+# dans des vues TEMP (UNION ALL), une seule requête SQL couvre toute la carrière
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from backend.database import make_engine, discover_seasons, PERMANENT_DB_URL
+from backend.models import TrainingSession, UserTrainingLinks, HealthCheck
+from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp, BodyArea, InjuryType
+
+# SQLite attache 10 bases au plus par connexion: on en garde 2 de marge
+max_attached = 8
+
+# Vues TEMP exposées: nom -> table des bases de saison (avec une colonne "season" en plus)
+career_views = {
+    "all_trainingsession": TrainingSession.__table__,
+    "all_usertraininglinks": UserTrainingLinks.__table__,
+    "all_health_check": HealthCheck.__table__,
+    "all_physicalissueticket": PhysicalIssueTicket.__table__,
+    "all_physicalissuefollowup": PhysicalIssueFollowUp.__table__,
+}
+
+# Base permanente en lecture seule (mode=ro): les saisons y sont attachées, les users restent joignables
+engine_career = make_engine(
+    PERMANENT_DB_URL.replace("sqlite:///", "sqlite:///file:", 1) + "?mode=ro&uri=true",
+    "attach",
+    name="career",
+)
+
+
+def resolve_seasons(seasons=None):
+    available = discover_seasons()
+    if seasons is None:
+        # par défaut: les saisons les plus récentes dans la limite des attachements
+        return sorted(available)[-max_attached:]
+    unknown = [s for s in seasons if s not in available]
+    if unknown:
+        raise ValueError(f"Saison(s) inconnue(s): {unknown}")
+    if len(seasons) > max_attached:
+        raise ValueError(f"{max_attached} saisons au plus par requête")
+    return sorted(set(seasons))
+
+
+def create_views(conn, seasons):
+    for view, table in career_views.items():
+        conn.exec_driver_sql(f"DROP VIEW IF EXISTS temp.{view}")
+        columns = ", ".join(table.columns.keys())
+        parts = []
+        for season in seasons:
+            exists = conn.exec_driver_sql(
+                f"SELECT 1 FROM s_{season}.sqlite_master WHERE type = 'table' AND name = ?", (table.name,)
+            ).first()
+            if exists:
+                parts.append(f"SELECT '{season}' AS season, {columns} FROM s_{season}.{table.name}")
+        if not parts:
+            # aucune saison n'a cette table: vue vide avec les bonnes colonnes
+            parts.append("SELECT NULL AS season, " + ", ".join(f"NULL AS {c}" for c in table.columns.keys()) + " WHERE 0")
+        conn.exec_driver_sql(f"CREATE TEMP VIEW {view} AS " + " UNION ALL ".join(parts))
+
+
+def attach_seasons(conn, seasons):
+    # Attachements propres à chaque connexion du pool, gardés entre deux requêtes (LRU)
+    state = conn.info.setdefault("career", {"attached": OrderedDict(), "views": None})
+    attached = state["attached"]
+    files = discover_seasons()
+
+    for season in seasons:
+        if season in attached:
+            attached.move_to_end(season)
+            continue
+        while len(attached) >= max_attached:
+            evicted = next(s for s in attached if s not in seasons)
+            for view in career_views:
+                conn.exec_driver_sql(f"DROP VIEW IF EXISTS temp.{view}")
+            state["views"] = None
+            conn.exec_driver_sql(f"DETACH DATABASE s_{evicted}")
+            attached.pop(evicted)
+        conn.exec_driver_sql(f"ATTACH DATABASE ? AS s_{season}", (f"file:{files[season]}?mode=ro",))
+        attached[season] = files[season]
+
+    if state["views"] != tuple(seasons):
+        create_views(conn, seasons)
+        state["views"] = tuple(seasons)
+
+
+@contextmanager
+def career_connection(seasons=None):
+    seasons = resolve_seasons(seasons)
+    with engine_career.connect() as conn:
+        attach_seasons(conn, seasons)
+        yield conn
+
+
+# --- Requêtes carrière ---
+def career_training_load(user_id, seasons=None):
+    # volume et charge (durée x intensité) par mois, toutes saisons confondues
+    with career_connection(seasons) as conn:
+        rows = conn.execute(text("""
+            SELECT t.season, strftime('%Y-%m', t.date) AS month,
+                   COUNT(*) AS sessions,
+                   SUM(COALESCE(t.duration_minutes, 0)) AS duration,
+                   SUM(COALESCE(t.duration_minutes, 0) * t.intensity) AS load,
+                   AVG(t.intensity) AS intensity
+            FROM all_trainingsession t
+            JOIN all_usertraininglinks l ON l.season = t.season AND l.training_id = t.id
+            WHERE l.user_id = :user_id
+            GROUP BY t.season, month
+            ORDER BY month
+        """), {"user_id": user_id}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def career_health(user_id, seasons=None):
+    # moyennes mensuelles des HealthCheck
+    with career_connection(seasons) as conn:
+        rows = conn.execute(text("""
+            SELECT season, strftime('%Y-%m', date) AS month,
+                   COUNT(*) AS checks,
+                   AVG(sleep_quality) AS sleep_quality,
+                   AVG(sleep_duration) AS sleep_duration,
+                   AVG(muscle_soreness) AS muscle_soreness,
+                   AVG(energy_level) AS energy_level,
+                   AVG(stress_level) AS stress_level,
+                   AVG(resting_heart_rate) AS resting_heart_rate
+            FROM all_health_check
+            WHERE athlete_id = :user_id
+            GROUP BY season, month
+            ORDER BY month
+        """), {"user_id": user_id}).mappings().all()
+    return [dict(r) for r in rows]
+
+
+def career_issues(user_id, seasons=None):
+    # tickets de blessure avec le nombre de suivis et la douleur maximale
+    with career_connection(seasons) as conn:
+        rows = conn.execute(text("""
+            SELECT i.season, i.id, i.title, i.date_opened, i.area_concerned, i.injury_type, i.is_closed,
+                   COUNT(f.id) AS followups,
+                   MAX(f.pain_intensity) AS max_pain
+            FROM all_physicalissueticket i
+            LEFT JOIN all_physicalissuefollowup f ON f.season = i.season AND f.ticket_id = i.id
+            WHERE i.athlete_id = :user_id
+            GROUP BY i.season, i.id
+            ORDER BY i.date_opened
+        """), {"user_id": user_id}).mappings().all()
+
+    # les enums sont stockés par nom
+    return [
+        {
+            **r,
+            "area_concerned": BodyArea[r["area_concerned"]].value,
+            "injury_type": InjuryType[r["injury_type"]].value,
+            "is_closed": bool(r["is_closed"]),
+        }
+        for r in rows
+    ]
@@ -0,0 +1,90 @@
+# backend/daily_load.py
+# Charge quotidienne par athlète (table daily_training_load), tenue à jour par des triggers SQLite:
+# toutes les écritures sont couvertes, y compris celles faites directement par le frontend ou l'import
+from sqlalchemy import text
+
+# Ajoute (sign = 1) ou retire (sign = -1) la contribution des séances sélectionnées par {source}
+# source doit exposer user_id, date, duration_minutes et intensity
+def apply_contribution(source, sign):
+    return f"""
+        INSERT INTO daily_training_load (user_id, date, sessions, duration, intensity_sum, srpe)
+        SELECT user_id, date, {sign}, {sign} * COALESCE(duration_minutes, 0), {sign} * intensity,
+               {sign} * COALESCE(duration_minutes, 0) * intensity
+        FROM ({source}) WHERE true
+        ON CONFLICT (user_id, date) DO UPDATE SET
+            sessions = sessions + excluded.sessions,
+            duration = duration + excluded.duration,
+            intensity_sum = intensity_sum + excluded.intensity_sum,
+            srpe = srpe + excluded.srpe;
+    """
+
+def linked_training(link):
+    return f"""
+        SELECT {link}.user_id AS user_id, t.date, t.duration_minutes, t.intensity
+        FROM trainingsession t WHERE t.id = {link}.training_id
+    """
+
+def training_users(row):
+    return f"""
+        SELECT l.user_id AS user_id, {row}.date AS date, {row}.duration_minutes AS duration_minutes, {row}.intensity AS intensity
+        FROM usertraininglinks l WHERE l.training_id = {row}.id
+    """
+
+prune_empty_days = "DELETE FROM daily_training_load WHERE sessions <= 0;"
+
+# Une séance supprimée avant ses liens est retirée par le trigger de la séance,
+# des liens supprimés avant leur séance par celui des liens: jamais les deux
+daily_load_triggers = {
+    "daily_load_link_insert": f"""
+        AFTER INSERT ON usertraininglinks BEGIN
+            {apply_contribution(linked_training("NEW"), 1)}
+        END
+    """,
+    "daily_load_link_delete": f"""
+        AFTER DELETE ON usertraininglinks BEGIN
+            {apply_contribution(linked_training("OLD"), -1)}
+            {prune_empty_days}
+        END
+    """,
+    "daily_load_link_update": f"""
+        AFTER UPDATE OF user_id, training_id ON usertraininglinks BEGIN
+            {apply_contribution(linked_training("OLD"), -1)}
+            {apply_contribution(linked_training("NEW"), 1)}
+            {prune_empty_days}
+        END
+    """,
+    "daily_load_training_update": f"""
+        AFTER UPDATE OF date, duration_minutes, intensity ON trainingsession BEGIN
+            {apply_contribution(training_users("OLD"), -1)}
+            {apply_contribution(training_users("NEW"), 1)}
+            {prune_empty_days}
+        END
+    """,
+    "daily_load_training_delete": f"""
+        BEFORE DELETE ON trainingsession BEGIN
+            {apply_contribution(training_users("OLD"), -1)}
+            {prune_empty_days}
+        END
+    """,
+}
+
+
+def create_daily_load_triggers(engine):
+    with engine.begin() as conn:
+        for name, body in daily_load_triggers.items():
+            conn.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+        # table vide alors que des séances existent: remplissage initial
+        empty = conn.execute(text("SELECT NOT EXISTS (SELECT 1 FROM daily_training_load)")).scalar()
+        linked = conn.execute(text("SELECT EXISTS (SELECT 1 FROM usertraininglinks)")).scalar()
+        if empty and linked:
+            rebuild(conn)
+
+
+# Recalcul complet, pour une base créée avant la table
+def rebuild(conn):
+    conn.exec_driver_sql("DELETE FROM daily_training_load")
+    conn.exec_driver_sql(apply_contribution("""
+        SELECT l.user_id AS user_id, t.date, t.duration_minutes, t.intensity
+        FROM usertraininglinks l JOIN trainingsession t ON t.id = l.training_id
+    """, 1))
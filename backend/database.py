@@ -1,44 +1,365 @@
 # backend/database.py
+import asyncio
+import os
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Query
+from sqlalchemy import event
 from sqlmodel import create_engine, SQLModel, Session
 from backend.models.user import User, UserCreate
-from backend.models.performance import Performance
-from backend.models.training import TrainingSession, UserTrainingLinks, CoachTrainingLinks
-from backend.models.health_check import HealthCheck
+from backend.models.performance import Performance, PersonalBest
+from backend.models.training import TrainingSession, UserTrainingLinks, CoachTrainingLinks, DailyTrainingLoad
+from backend.models.health_check import HealthCheck, RecoveryScoreCache
 from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp
 from backend.models.decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
+from backend.models.season_summary import SeasonSummary
+from backend.db_stats import db_stats, InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
+from backend.daily_load import create_daily_load_triggers
+from backend.recovery_cache import create_recovery_cache_triggers
+from backend.assets.personal_best import create_performance_sort_columns
 
 #engine = create_engine(DATABASE_URL, echo=True, echo_pool=True)
 
+# --- Profils d'engine SQLite ---
+# pragmas: appliqués à chaque nouvelle connexion du pool / pool: paramètres du pool SQLAlchemy
+engine_profiles = {
+    "write": {
+        "pragmas": {
+            "journal_mode": "WAL",      # une écriture ne bloque plus les lectures
+            "synchronous": "NORMAL",    # fsync aux checkpoints seulement, sûr en WAL
+            "mmap_size": 268435456,     # 256 Mo lus via mmap
+            "cache_size": -65536,       # 64 Mo de cache de pages (négatif = en Ko)
+            "busy_timeout": 5000,       # attend un verrou 5 s au lieu d'échouer
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 5, "max_overflow": 10},
+    },
+    "read": {
+        "pragmas": {
+            "mmap_size": 268435456,
+            "cache_size": -65536,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+            "query_only": 1,            # toute écriture par erreur sur ce pool échoue
+        },
+        "pool": {"pool_size": 10, "max_overflow": 20},
+    },
+    # lecture multi-saisons: fichiers ouverts en mode=ro, mais tables TEMP autorisées (vues UNION)
+    "attach": {
+        "pragmas": {
+            "mmap_size": 268435456,
+            "cache_size": -65536,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 2, "max_overflow": 4},
+    },
+    # réglages par défaut de SQLite / SQLAlchemy (référence du benchmark)
+    "bare": {
+        "pragmas": {},
+        "pool": {},
+    },
+}
+
+DATA_DIR = "backend/data"
+
 # DB Permanent
 PERMANENT_DB_URL = "sqlite:///backend/data/database.db"
-engine_permanent = create_engine(PERMANENT_DB_URL, echo=False)
 
-# DB Annuelle de saison
-SEASON_DB_URL = "sqlite:///backend/data/season2526.db"
-engine_season = create_engine(SEASON_DB_URL, echo=False)
+# DB Annuelle de saison: une base par saison, ex: "2526" -> season2526.db
+# la saison courante se change par OPENAMS_SEASON (ou PUT /seasons/current) sans toucher au code
+CURRENT_SEASON = os.getenv("OPENAMS_SEASON", "2526")
+season_id_pattern = re.compile(r"\d{4}")
+
+def season_path(season_id):
+    return os.path.join(DATA_DIR, f"season{season_id}.db")
+
+def season_url(season_id):
+    return f"sqlite:///{season_path(season_id)}"
+
+SEASON_DB_URL = season_url(CURRENT_SEASON)
+
+# Profils de chaque base (pragmas: surcharges propres à la base)
+engine_config = {
+    "permanent": {
+        "url": PERMANENT_DB_URL,
+        "write": "write",
+        "read": "read",
+        "pragmas": {},
+    },
+    "season": {
+        "url": SEASON_DB_URL,   # saison courante, les autres passent leur url à make_engines
+        "write": "write",
+        "read": "read",
+        "pragmas": {},
+    },
+}
+
+
+def apply_pragmas(engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def make_engine(url, profile="write", pragmas=None, name=None):
+    config = engine_profiles[profile]
+    engine = create_engine(url, echo=False, poolclass=InstrumentedQueuePool, **config["pool"])
+    apply_pragmas(engine, {**config["pragmas"], **(pragmas or {})})
+    if name is not None:
+        db_stats.register(name, engine)
+    return engine
+
+
+# Les engines async ne sont créés qu'au premier usage: aiosqlite n'est requis qu'en mode async
+def make_async_engine(url, profile="read", pragmas=None, name=None):
+    from sqlalchemy.ext.asyncio import create_async_engine
+    config = engine_profiles[profile]
+    engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://", 1), echo=False,
+                                 poolclass=InstrumentedAsyncAdaptedQueuePool, **config["pool"])
+    apply_pragmas(engine.sync_engine, {**config["pragmas"], **(pragmas or {})})
+    if name is not None:
+        db_stats.register(name, engine.sync_engine)
+    return engine
+
+
+_dispose_tasks = set()
+
+def dispose_async_engine(engine):
+    # AsyncEngine.dispose est une coroutine: planifiée sur la boucle en cours (route async),
+    # exécutée sur place sinon (route def, threadpool)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(engine.dispose())
+        return
+    task = loop.create_task(engine.dispose())
+    _dispose_tasks.add(task)
+    task.add_done_callback(_dispose_tasks.discard)
+
+
+def make_engines(name, url=None, stats_name=None):
+    # (engine d'écriture, engine de lecture seule) d'une base
+    config = engine_config[name]
+    url = url or config["url"]
+    stats_name = stats_name or name
+    return (
+        make_engine(url, config["write"], config["pragmas"], name=stats_name),
+        make_engine(url, config["read"], config["pragmas"], name=f"{stats_name}_read"),
+    )
+
+
+def discover_seasons(directory=DATA_DIR):
+    # id de saison -> fichier, ex: "2526" -> backend/data/season2526.db
+    seasons = {}
+    if os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory)):
+            match = re.fullmatch(r"season(\d{4})\.db", filename)
+            if match:
+                seasons[match.group(1)] = os.path.join(directory, filename)
+    return seasons
+
+
+# --- Registre des engines de saison ---
+# ouverts au premier usage, les moins récemment utilisés sont fermés au-delà de max_open
+# (descripteurs de fichiers, cache de pages), la saison courante reste toujours ouverte
+class SeasonRegistry:
+    def __init__(self, current, max_open=4):
+        self.current = current
+        self.max_open = max_open
+        self._engines = OrderedDict()
+        self._async_engines = {}   # mode async: engine aiosqlite de lecture, fermé avec la paire sync
+        self._lock = Lock()
+
+    def validate(self, season_id):
+        if not season_id_pattern.fullmatch(season_id):
+            raise ValueError(f"Saison invalide: {season_id}")
+        # ne pas créer un fichier vide pour une saison qui n'existe pas
+        if season_id != self.current and not os.path.exists(season_path(season_id)):
+            raise ValueError(f"Saison inconnue: {season_id}")
+
+    def engines(self, season_id=None):
+        season_id = season_id or self.current
+        with self._lock:
+            if season_id in self._engines:
+                self._engines.move_to_end(season_id)
+                return self._engines[season_id]
+            self.validate(season_id)
+            engines = make_engines("season", season_url(season_id), f"season{season_id}")
+            self._engines[season_id] = engines
+            self._evict()
+            return engines
 
+    def async_engine(self, season_id=None):
+        season_id = season_id or self.current
+        self.engines(season_id)   # validation + place dans le LRU
+        with self._lock:
+            if season_id not in self._async_engines:
+                self._async_engines[season_id] = make_async_engine(
+                    season_url(season_id), engine_config["season"]["read"], engine_config["season"]["pragmas"],
+                    name=f"season{season_id}_async")
+            return self._async_engines[season_id]
+
+    def _in_use(self, season_id):
+        write_engine, read_engine = self._engines[season_id]
+        async_engine = self._async_engines.get(season_id)
+        return (write_engine.pool.checkedout() or read_engine.pool.checkedout()
+                or (async_engine is not None and async_engine.sync_engine.pool.checkedout()))
+
+    def _evict(self):
+        for season_id in list(self._engines):
+            if len(self._engines) <= self.max_open:
+                break
+            # saison courante ou connexions encore utilisées: on garde
+            if season_id == self.current or self._in_use(season_id):
+                continue
+            write_engine, read_engine = self._engines.pop(season_id)
+            self._dispose(season_id, write_engine, read_engine, self._async_engines.pop(season_id, None))
+
+    def _dispose(self, season_id, write_engine, read_engine, async_engine=None):
+        for engine, name in ((write_engine, f"season{season_id}"), (read_engine, f"season{season_id}_read")):
+            engine.dispose()
+            db_stats.unregister(name)
+        if async_engine is not None:
+            dispose_async_engine(async_engine)
+            db_stats.unregister(f"season{season_id}_async")
+
+    def close(self, season_id):
+        # fermeture explicite (avant archivage / suppression du fichier)
+        with self._lock:
+            engines = self._engines.pop(season_id, None)
+            async_engine = self._async_engines.pop(season_id, None)
+        if engines is not None:
+            self._dispose(season_id, *engines, async_engine)
+
+    def set_current(self, season_id):
+        if not season_id_pattern.fullmatch(season_id):
+            raise ValueError(f"Saison invalide: {season_id}")
+        with self._lock:
+            self.current = season_id
+
+    def open_seasons(self):
+        with self._lock:
+            return list(self._engines)
+
+
+season_registry = SeasonRegistry(CURRENT_SEASON)
+
+engine_permanent, engine_permanent_read = make_engines("permanent")
+# saison courante au démarrage (utilisée directement par le frontend)
+engine_season, engine_season_read = season_registry.engines()
+
+# --- Mode d'accès: "sync" (routes def sur le threadpool) ou "async" (aiosqlite) ---
+DB_MODE = os.getenv("OPENAMS_DB_MODE", "sync")
+
+engine_permanent_async = None
+
+def get_async_engine_permanent():
+    global engine_permanent_async
+    if engine_permanent_async is None:
+        config = engine_config["permanent"]
+        engine_permanent_async = make_async_engine(config["url"], config["read"], config["pragmas"], name="permanent_async")
+    return engine_permanent_async
+
+permanent_tables = [
+    User.__table__,
+    Performance.__table__,
+    PersonalBest.__table__,
+    Decathlon.__table__,
+    DecathlonPerformance.__table__,
+    DecathlonAthleteLink.__table__,
+    SeasonSummary.__table__,
+]
+
+season_tables = [
+    TrainingSession.__table__,
+    UserTrainingLinks.__table__,
+    CoachTrainingLinks.__table__,
+    HealthCheck.__table__,
+    PhysicalIssueTicket.__table__,
+    PhysicalIssueFollowUp.__table__,
+    DailyTrainingLoad.__table__,
+    RecoveryScoreCache.__table__,
+]
+
+def create_indexes(engine, tables):
+    # create_all ignore les index des tables déjà existantes: on les ajoute à part
+    for table in tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
 
 def create_permanent_tables():
-    SQLModel.metadata.create_all(engine_permanent, tables=[
-        User.__table__,
-        Performance.__table__,
-        Decathlon.__table__,
-        DecathlonPerformance.__table__,
-        DecathlonAthleteLink.__table__,
-    ])
-
-def create_season_tables():
-    SQLModel.metadata.create_all(engine_season, tables=[
-        TrainingSession.__table__,
-        UserTrainingLinks.__table__,
-        CoachTrainingLinks.__table__,
-        HealthCheck.__table__,
-        PhysicalIssueTicket.__table__,
-        PhysicalIssueFollowUp.__table__,
-    ])
+    SQLModel.metadata.create_all(engine_permanent, tables=permanent_tables)
+    create_indexes(engine_permanent, permanent_tables)
+    create_performance_sort_columns(engine_permanent)
+
+def create_season_tables(season_id=None):
+    engine = season_registry.engines(season_id)[0]
+    SQLModel.metadata.create_all(engine, tables=season_tables)
+    create_indexes(engine, season_tables)
+    create_daily_load_triggers(engine)
+    create_recovery_cache_triggers(engine)
     
+# --- Sessions des routes: toujours fermées en fin de requête, durée et taille mesurées ---
+def session_scope(engine, name):
+    session = Session(engine)
+    db_stats.record_session_open(name)
+    start = time.perf_counter()
+    try:
+        yield session
+    finally:
+        db_stats.record_session_close(name, time.perf_counter() - start, len(session.identity_map))
+        session.close()
+
 def get_session_permanent():
-    return Session(engine_permanent)
+    yield from session_scope(engine_permanent, "permanent")
+
+# Saison de la requête: ?season=2425 ou en-tête X-Season, saison courante par défaut
+def selected_season(season: Optional[str] = Query(None), x_season: Optional[str] = Header(None)):
+    return season or x_season or season_registry.current
+
+def season_engines(season_id):
+    try:
+        return season_registry.engines(season_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_session_season(season_id: str = Depends(selected_season)):
+    yield from session_scope(season_engines(season_id)[0], f"season{season_id}")
+
+# Sessions des routes GET: pool de connexions en lecture seule
+def get_session_permanent_read():
+    yield from session_scope(engine_permanent_read, "permanent_read")
+
+def get_session_season_read(season_id: str = Depends(selected_season)):
+    yield from session_scope(season_engines(season_id)[1], f"season{season_id}_read")
+
+async def async_session_scope(engine, name):
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    session = AsyncSession(engine)
+    db_stats.record_session_open(name)
+    start = time.perf_counter()
+    try:
+        yield session
+    finally:
+        db_stats.record_session_close(name, time.perf_counter() - start, len(session.identity_map))
+        await session.close()
+
+async def get_async_session_permanent():
+    async for session in async_session_scope(get_async_engine_permanent(), "permanent_async"):
+        yield session
 
-def get_session_season():
-    return Session(engine_season)
\ No newline at end of file
+async def get_async_session_season(season_id: str = Depends(selected_season)):
+    try:
+        engine = season_registry.async_engine(season_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    async for session in async_session_scope(engine, f"season{season_id}_async"):
+        yield session
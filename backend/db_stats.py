@@ -0,0 +1,102 @@
+# backend/db_stats.py
+import time
+from threading import Lock
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+# --- Compteurs d'usage des pools et des sessions, par base ---
+class DBStats:
+    def __init__(self):
+        self._lock = Lock()
+        self.engines = {}   # nom -> engine, enregistré à la création
+        self.pools = {}
+        self.sessions = {}
+
+    def register(self, name, engine):
+        with self._lock:
+            self.engines[name] = engine
+        engine.pool.stats_name = name
+
+    def unregister(self, name):
+        with self._lock:
+            self.engines.pop(name, None)
+
+    def _pool(self, name):
+        return self.pools.setdefault(name, {"checkouts": 0, "peak_checked_out": 0, "wait_total": 0.0, "wait_max": 0.0})
+
+    def _session(self, name):
+        return self.sessions.setdefault(name, {"opened": 0, "closed": 0, "lifetime_total": 0.0, "lifetime_max": 0.0, "identity_map_max": 0})
+
+    def record_checkout(self, name, wait, checked_out):
+        with self._lock:
+            stats = self._pool(name)
+            stats["checkouts"] += 1
+            stats["wait_total"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            stats["peak_checked_out"] = max(stats["peak_checked_out"], checked_out)
+
+    def record_session_open(self, name):
+        with self._lock:
+            self._session(name)["opened"] += 1
+
+    def record_session_close(self, name, lifetime, identity_map_size):
+        with self._lock:
+            stats = self._session(name)
+            stats["closed"] += 1
+            stats["lifetime_total"] += lifetime
+            stats["lifetime_max"] = max(stats["lifetime_max"], lifetime)
+            stats["identity_map_max"] = max(stats["identity_map_max"], identity_map_size)
+
+    def snapshot(self):
+        with self._lock:
+            result = {}
+            for name, engine in self.engines.items():
+                pool = engine.pool
+                pool_stats = self._pool(name)
+                session_stats = self._session(name)
+                result[name] = {
+                    "pool": {
+                        "size": pool.size(),
+                        "checked_out": pool.checkedout(),
+                        "checked_in": pool.checkedin(),
+                        "overflow": pool.overflow(),
+                        "peak_checked_out": pool_stats["peak_checked_out"],
+                        "checkouts": pool_stats["checkouts"],
+                        "wait_avg_ms": 1000 * pool_stats["wait_total"] / pool_stats["checkouts"] if pool_stats["checkouts"] else 0.0,
+                        "wait_max_ms": 1000 * pool_stats["wait_max"],
+                    },
+                    "sessions": {
+                        "open": session_stats["opened"] - session_stats["closed"],
+                        "closed": session_stats["closed"],
+                        "lifetime_avg_ms": 1000 * session_stats["lifetime_total"] / session_stats["closed"] if session_stats["closed"] else 0.0,
+                        "lifetime_max_ms": 1000 * session_stats["lifetime_max"],
+                        "identity_map_max": session_stats["identity_map_max"],
+                    },
+                }
+            return result
+
+
+db_stats = DBStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    # QueuePool qui mesure l'attente d'une connexion libre
+    def _do_get(self):
+        start = time.perf_counter()
+        connection = super()._do_get()
+        name = getattr(self, "stats_name", None)
+        if name is not None:
+            db_stats.record_checkout(name, time.perf_counter() - start, self.checkedout())
+        return connection
+
+    def recreate(self):
+        # engine.dispose() recrée le pool: on garde le nom pour les stats
+        pool = super().recreate()
+        pool.stats_name = getattr(self, "stats_name", None)
+        return pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    # même mesure pour les engines async (aiosqlite)
+    pass
@@ -0,0 +1,88 @@
+# backend/export.py
+import csv
+import io
+import json
+from datetime import date, time
+from enum import Enum
+
+from sqlmodel import Session, select
+
+from backend.database import engine_permanent_read, season_registry
+from backend.models import User, TrainingSession, UserTrainingLinks, CoachTrainingLinks, Performance, HealthCheck
+from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp
+from backend.models.decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
+
+# Nombre de lignes lues par aller-retour avec la base pendant un export
+export_batch_size = 1000
+
+# --- Jeux de données exportables: nom -> (base, table) ---
+export_datasets = {
+    "users": ("permanent", User.__table__),
+    "performances": ("permanent", Performance.__table__),
+    "decathlons": ("permanent", Decathlon.__table__),
+    "decathlon_performances": ("permanent", DecathlonPerformance.__table__),
+    "decathlon_athletes": ("permanent", DecathlonAthleteLink.__table__),
+    "trainings": ("season", TrainingSession.__table__),
+    "training_athletes": ("season", UserTrainingLinks.__table__),
+    "training_coaches": ("season", CoachTrainingLinks.__table__),
+    "health_checks": ("season", HealthCheck.__table__),
+    "issues": ("season", PhysicalIssueTicket.__table__),
+    "issue_followups": ("season", PhysicalIssueFollowUp.__table__),
+}
+
+export_formats = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def serialize_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+def export_engine(base, season=None):
+    if base == "permanent":
+        return engine_permanent_read
+    return season_registry.engines(season)[1]
+
+
+def iter_rows(dataset, season=None):
+    # Curseur côté serveur: les lignes arrivent par paquets de export_batch_size,
+    # la mémoire ne dépend pas de la taille de la table
+    base, table = export_datasets[dataset]
+    engine = export_engine(base, season)
+    statement = select(table).order_by(*table.primary_key.columns).execution_options(yield_per=export_batch_size)
+    with Session(engine) as session:
+        for row in session.execute(statement):
+            yield {key: serialize_value(value) for key, value in row._mapping.items()}
+
+
+def iter_ndjson(dataset, season=None):
+    for row in iter_rows(dataset, season):
+        yield json.dumps(row, ensure_ascii=False) + "\n"
+
+
+def iter_csv(dataset, season=None):
+    _, table = export_datasets[dataset]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.columns.keys())
+
+    for i, row in enumerate(iter_rows(dataset, season), start=1):
+        writer.writerow(row.values())
+        # on vide le buffer à chaque paquet pour ne garder qu'un morceau en mémoire
+        if i % export_batch_size == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue()
+
+
+def iter_export(dataset, format="ndjson", season=None):
+    if format == "csv":
+        return iter_csv(dataset, season)
+    return iter_ndjson(dataset, season)
@@ -1,23 +1,39 @@
-from fastapi import FastAPI, Depends, HTTPException, Request, Form#, APIRouter, Query
+from fastapi import FastAPI, Body, Depends, HTTPException, Request, Response, Form, Query, UploadFile, File, BackgroundTasks#, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.responses import RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 #from typing import Optional
 
-from sqlmodel import select, Session
-from backend.models import User, UserCreate, TrainingSession, UserTrainingLinks, Performance, HealthCheck, HealthCheckCreate, CoachTrainingLinks
+from sqlmodel import select, Session, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
+from backend.models import User, UserCreate, TrainingSession, UserTrainingLinks, Performance, PersonalBest, HealthCheck, HealthCheckCreate, CoachTrainingLinks, SeasonSummary, DailyTrainingLoad
 from backend.models.injury_ticket import PhysicalIssueTicket, PhysicalIssueFollowUp, InjuryType, BodyArea
 from backend.models.decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
-from backend.models.enumeration import Role
+from backend.models.enumeration import Role, Sport
 #from backend.database import init_db, get_session
-from backend.database import create_permanent_tables, create_season_tables, get_session_permanent, get_session_season
+from backend.database import create_permanent_tables, create_season_tables, get_session_permanent, get_session_season, get_session_permanent_read, get_session_season_read, engine_permanent, DB_MODE, discover_seasons, season_registry, selected_season, season_engines
+from backend.cache import user_cache
+from backend.db_stats import db_stats
+from backend.pagination import encode_cursor, decode_cursor, keyset_after, keyset_order
+from backend.export import export_datasets, export_formats, iter_export
+from backend.bulk_import import import_datasets, import_rows, parse_rows, import_writers, import_tables
+from backend.career import career_training_load, career_health, career_issues
+from backend.archive import archived_seasons, archived_trainings, archived_health_checks
+from backend.recovery_cache import cached_recovery_scores, store_recovery_scores, health_check_cache_row
+from backend.table_versions import table_versions, not_modified, PERMANENT
 from typing import List, Optional
 
-from datetime import date, time
+from datetime import date, time, timedelta
 from pydantic import BaseModel
-from backend.assets.hungarian import compute_hungarian_score
-from backend.assets.metrics_compute import recovery_score
+from backend.assets.hungarian import compute_hungarian_score, compute_hungarian_scores
+from backend.assets.metrics_compute import recovery_score, recovery_matrix, health_check_metrics
+from backend.assets.points_table import build_points_tables, lookup_points, mark_for_points
+from backend.assets.standings import compute_standings
+from backend.assets.personal_best import update_personal_best, refresh_personal_best, init_personal_bests, quality_sort_column
+from backend.assets.workload import compute_workload, history_days, acute_window, chronic_window
+from backend.assets.training_events import radar_breakdown
 
 app = FastAPI()
 
@@ -33,11 +49,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Mode async: les lectures les plus sollicitées passent par des routes async def,
+# déclarées avant les routes sync pour être prioritaires sur les mêmes chemins
+if DB_MODE == "async":
+    from backend.async_routes import router as async_router
+    app.include_router(async_router)
+
 # Initialize the database when app starts
 @app.on_event("startup")
 def on_startup():
     create_permanent_tables()
     create_season_tables()
+    build_points_tables()
+    with Session(engine_permanent) as session:
+        init_personal_bests(session)
 
 # @app.on_event("startup")
 # def on_startup():
@@ -56,29 +81,39 @@ def create_user(user: UserCreate, session: Session = Depends(get_session_permane
     session.add(new_user)
     session.commit()
     session.refresh(new_user)
+    user_cache.invalidate(new_user.id)
+    table_versions.bump(PERMANENT, "user")
     return new_user
 
-# --- Récup tous les users ---
+# --- Récup tous les users (ou plusieurs users précis: /users?ids=1,2,3) ---
 @app.get("/users/", response_model=List[User])
-def read_users(session: Session = Depends(get_session_permanent)):
-    statement = select(User)
-    return session.exec(statement).all()
+def read_users(request: Request, response: Response, ids: Optional[str] = None, session: Session = Depends(get_session_permanent_read)):
+    cached = not_modified(request, response, PERMANENT, ["user"])
+    if cached:
+        return cached
+    if ids is None:
+        return user_cache.get_list(session)
+    try:
+        user_ids = [int(user_id) for user_id in ids.split(",") if user_id.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids doit être une liste d'entiers séparés par des virgules")
+    return user_cache.get_many(session, user_ids)
 
 # Récuperer un user précis
 @app.get("/users/{user_id}")
-def get_user(user_id: int, session: Session = Depends(get_session_permanent)):
-    user = session.get(User, user_id)
+def get_user(user_id: int, session: Session = Depends(get_session_permanent_read)):
+    user = user_cache.get(session, user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 # --- Récup tou.te.s les athlètes ---
 @app.get("/athletes", response_model=List[User])
-def read_athletes(session: Session = Depends(get_session_permanent)):
-    return session.exec(
-        select(User)
-        .where(User.role == Role.Athlete)
-    ).all()
+def read_athletes(request: Request, response: Response, session: Session = Depends(get_session_permanent_read)):
+    cached = not_modified(request, response, PERMANENT, ["user"])
+    if cached:
+        return cached
+    return user_cache.get_list(session, Role.Athlete)
 
 
 # --- Mettre à jour un.e user ---
@@ -94,6 +129,8 @@ def update_user(user_id: int, user: UserCreate, session: Session = Depends(get_s
     session.add(db_user)
     session.commit()
     session.refresh(db_user)
+    user_cache.invalidate(user_id)
+    table_versions.bump(PERMANENT, "user")
     return db_user
 
 
@@ -102,7 +139,8 @@ def update_user(user_id: int, user: UserCreate, session: Session = Depends(get_s
 def delete_user(
         user_id: int, 
         session_permanent: Session = Depends(get_session_permanent), 
-        session_season: Session = Depends(get_session_season)
+        session_season: Session = Depends(get_session_season),
+        season_id: str = Depends(selected_season),
     ):
     db_user = session_permanent.get(User, user_id)
     if not db_user:
@@ -118,8 +156,16 @@ def delete_user(
         UserTrainingLinks.user_id == user_id
     ).delete()
 
+    session_season.commit()
+
+    # liens supprimés ci-dessus dans la base de saison: rien à charger depuis la base permanente (tables absentes)
+    set_committed_value(db_user, "training_sessions", [])
+    set_committed_value(db_user, "coaches_supervising", [])
     session_permanent.delete(db_user)
     session_permanent.commit()
+    user_cache.invalidate(user_id)
+    table_versions.bump(PERMANENT, "user")
+    table_versions.bump(season_id, "coachtraininglinks", "usertraininglinks", "daily_training_load")
     return {"message": "User deleted"}
 
 # === TRAINING === #
@@ -128,60 +174,64 @@ def delete_user(
 def create_training(
     athlete_ids: List[int],  # IDs des athlètes à assigner
     training: TrainingSession,
+    coach_ids: List[int] = Body(default=[]),  # IDs des coachs à lier (optionnel)
     session_permanent: Session = Depends(get_session_permanent),
-    session_season: Session = Depends(get_session_season)
+    session_season: Session = Depends(get_session_season),
+    season_id: str = Depends(selected_season),
 ):
     # Vérifier que tous les athlètes existent
     athletes = session_permanent.exec(select(User).where(User.id.in_(athlete_ids))).all()
     if len(athletes) != len(athlete_ids):
         raise HTTPException(status_code=400, detail="Un ou plusieurs athlètes sont introuvables")
 
-    # Ajouter la session
+    # Vérifier que les coachs existent
+    coach_ids = list(set(coach_ids))
+    if coach_ids and len(session_permanent.exec(select(User.id).where(User.id.in_(coach_ids))).all()) != len(coach_ids):
+        raise HTTPException(status_code=400, detail="Un ou plusieurs coachs sont introuvables")
+
+    # Ajouter la session et ses liens dans une seule transaction
+    training = TrainingSession.model_validate(training.model_dump())
     session_season.add(training)
-    session_season.commit()
-    session_season.refresh(training)
+    session_season.flush()
 
-    # Créer les liens
+    # chaque lien ajoute la séance à daily_training_load (trigger SQLite), dans la même transaction
     for athlete in athletes:
-        link = UserTrainingLinks(user_id=athlete.id, training_session_id=training.id)
-        session_season.add(link)
+        session_season.add(UserTrainingLinks(user_id=athlete.id, training_id=training.id))
+    for coach_id in coach_ids:
+        session_season.add(CoachTrainingLinks(coach_id=coach_id, training_id=training.id))
 
     session_season.commit()
+    table_versions.bump(season_id, "trainingsession", "usertraininglinks", "coachtraininglinks", "daily_training_load")
+    session_season.refresh(training)
     return training
 
 # --- Lister les sessions d’un.e athlète ---
 @app.get("/users/{user_id}/trainings", response_model=List[TrainingSession])
-def get_user_trainings(user_id: int, session: Session = Depends(get_session_season)):
-    training_links = session.exec(
-        select(UserTrainingLinks).where(UserTrainingLinks.user_id == user_id)
-    ).all()
-    
-    training_ids = [link.training_id for link in training_links]
-    
-    if not training_ids:
-        return []
-    
-    trainings = session.exec(
-        select(TrainingSession).where(TrainingSession.id.in_(training_ids))
+def get_user_trainings(user_id: int, session: Session = Depends(get_session_season_read)):
+    return session.exec(
+        select(TrainingSession)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
     ).all()
-    
-    return trainings
 
 # --- Lister les séances d'un.e athlète entre 2 dates spécifiques ---
 @app.get("/training_data")
-def get_training_data(user_id: int, start_date: date, end_date: date, session: Session = Depends(get_session_season)):
-    training_links = session.exec(
-        select(UserTrainingLinks).where(UserTrainingLinks.user_id == user_id)
-    ).all()
-
-    training_ids = [link.training_id for link in training_links]
-    
-    if not training_ids:
-        return []
-    
+def get_training_data(
+    request: Request,
+    response: Response,
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    season_id: str = Depends(selected_season),
+    session: Session = Depends(get_session_season_read),
+):
+    cached = not_modified(request, response, season_id, ["trainingsession", "usertraininglinks"])
+    if cached:
+        return cached
     trainings = session.exec(
         select(TrainingSession)
-        .where(TrainingSession.id.in_(training_ids))
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
         .where(TrainingSession.date >= start_date)
         .where(TrainingSession.date <= end_date)
     ).all()
@@ -198,18 +248,246 @@ def get_training_data(user_id: int, start_date: date, end_date: date, session: S
     ]
 
 
+# --- Charge quotidienne agrégée (une ligne par jour entraîné) ---
+@app.get("/users/{user_id}/daily_load")
+def get_daily_load(user_id: int, start_date: date, end_date: date, session: Session = Depends(get_session_season_read)):
+    days = session.exec(
+        select(DailyTrainingLoad)
+        .where(DailyTrainingLoad.user_id == user_id)
+        .where(DailyTrainingLoad.date >= start_date)
+        .where(DailyTrainingLoad.date <= end_date)
+        .order_by(DailyTrainingLoad.date)
+    ).all()
+
+    return [
+        {
+            "date": d.date,
+            "sessions": d.sessions,
+            "duration": d.duration,
+            "intensity_sum": d.intensity_sum,
+            "mean_intensity": d.intensity_sum / d.sessions,
+            "srpe": d.srpe,
+        }
+        for d in days
+    ]
+
+
+# --- Charge de travail: ACWR (glissant et EWMA), monotonie et contrainte, jour par jour ---
+@app.get("/users/{user_id}/workload")
+def get_workload(
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    acute: int = Query(acute_window, ge=1),
+    chronic: int = Query(chronic_window, ge=2),
+    session: Session = Depends(get_session_season_read),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date doit être postérieure à start_date")
+    if acute >= chronic:
+        raise HTTPException(status_code=400, detail="La fenêtre aiguë doit être plus courte que la fenêtre chronique")
+
+    # historique lu en plus pour remplir la fenêtre chronique dès le premier jour
+    history_start = start_date - timedelta(days=history_days(chronic))
+    daily_load = session.exec(
+        select(DailyTrainingLoad.date, DailyTrainingLoad.srpe)
+        .where(DailyTrainingLoad.user_id == user_id)
+        .where(DailyTrainingLoad.date >= history_start)
+        .where(DailyTrainingLoad.date <= end_date)
+    ).all()
+
+    return {
+        "acute": acute,
+        "chronic": chronic,
+        "series": compute_workload(daily_load, start_date, end_date, acute, chronic),
+    }
+
+
+# --- Recherche filtrée, triée et paginée dans l'historique d'un.e athlète ---
+training_sort_keys = {
+    "date": TrainingSession.date,
+    "intensity": TrainingSession.intensity,
+    "duration": func.coalesce(TrainingSession.duration_minutes, 0),
+}
+
+@app.get("/trainings/search")
+def search_trainings(
+    user_id: int,
+    sport: Optional[Sport] = None,
+    type: Optional[str] = None,
+    min_intensity: Optional[int] = None,
+    max_intensity: Optional[int] = None,
+    min_duration: Optional[int] = None,
+    max_duration: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    sort: str = "date",
+    limit: int = Query(6, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session_season_read)
+):
+    if sort not in training_sort_keys:
+        raise HTTPException(status_code=400, detail=f"Tri inconnu: {sort}")
+    sort_key = training_sort_keys[sort]
+
+    athlete_trainings = (
+        select(TrainingSession)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == user_id)
+    )
+
+    # Filtres
+    filtered = athlete_trainings
+    if sport is not None:
+        filtered = filtered.where(TrainingSession.sport == sport)
+    if type is not None:
+        filtered = filtered.where(TrainingSession.type == type)
+    if min_intensity is not None:
+        filtered = filtered.where(TrainingSession.intensity >= min_intensity)
+    if max_intensity is not None:
+        filtered = filtered.where(TrainingSession.intensity <= max_intensity)
+    if min_duration is not None:
+        filtered = filtered.where(TrainingSession.duration_minutes >= min_duration)
+    if max_duration is not None:
+        filtered = filtered.where(TrainingSession.duration_minutes <= max_duration)
+    if start_date is not None:
+        filtered = filtered.where(TrainingSession.date >= start_date)
+    if end_date is not None:
+        filtered = filtered.where(TrainingSession.date <= end_date)
+
+    total = session.exec(select(func.count()).select_from(filtered.subquery())).one()
+
+    # Page demandée: tri décroissant + curseur, une ligne de plus pour savoir s'il reste une page
+    page = filtered
+    if cursor:
+        try:
+            value, row_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if sort == "date":
+            value = date.fromisoformat(value)
+        page = page.where(keyset_after(sort_key, TrainingSession.id, value, row_id))
+    rows = session.exec(page.order_by(*keyset_order(sort_key, TrainingSession.id)).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        last_value = {"date": last.date, "intensity": last.intensity, "duration": last.duration_minutes or 0}[sort]
+        next_cursor = encode_cursor(last_value, last.id)
+
+    # Facettes sur tout l'historique de l'athlète: types disponibles par sport, bornes de dates
+    athlete_subquery = athlete_trainings.subquery()
+    facets = {}
+    for facet_sport, facet_type in session.exec(
+        select(athlete_subquery.c.sport, athlete_subquery.c.type).distinct().order_by(athlete_subquery.c.type)
+    ).all():
+        facets.setdefault(Sport(facet_sport).value, []).append(facet_type)
+    date_min, date_max = session.exec(
+        select(func.min(athlete_subquery.c.date), func.max(athlete_subquery.c.date))
+    ).one()
+
+    return {
+        "total": total,
+        "items": rows,
+        "next_cursor": next_cursor,
+        "facets": facets,
+        "date_min": date_min,
+        "date_max": date_max,
+    }
+
+
 # === PERFORMANCE === #
 @app.post("/performances/")
 def create_performance(perf: Performance, session: Session = Depends(get_session_permanent)):
     session.add(perf)
+    session.flush()
+    # mise à jour du record perso dans la même transaction
+    update_personal_best(session, perf)
     session.commit()
+    table_versions.bump(PERMANENT, "performance", "personal_best")
     session.refresh(perf)
     return perf
 
 @app.get("/performances/")
-def get_performances(session: Session = Depends(get_session_permanent)):
+def get_performances(session: Session = Depends(get_session_permanent_read)):
     return session.exec(select(Performance)).all()
 
+# --- Historique filtré, trié (sens de la discipline respecté) et paginé d'un.e athlète ---
+performance_sorts = {
+    # nom: (clé de tri, ordre décroissant)
+    "recent": (Performance.date, True),
+    "oldest": (Performance.date, False),
+    # colonnes générées et indexées (user_id, clé, id): une page lit seulement ses lignes dans l'index
+    "best": (quality_sort_column("quality_best"), False),
+    "worst": (quality_sort_column("quality_worst"), True),
+}
+
+@app.get("/users/{user_id}/performances")
+def get_user_performances(
+    user_id: int,
+    sport: Optional[Sport] = None,
+    discipline: Optional[str] = None,
+    sort: str = "recent",
+    limit: int = Query(6, ge=1, le=100),
+    cursor: Optional[str] = None,
+    summary: bool = True,  # total et facettes: utiles à la première page seulement
+    session: Session = Depends(get_session_permanent_read)
+):
+    if sort not in performance_sorts:
+        raise HTTPException(status_code=400, detail=f"Tri inconnu: {sort}")
+    sort_key, descending = performance_sorts[sort]
+    sort_key = sort_key.label("sort_key")
+
+    filters = [Performance.user_id == user_id]
+    if sport is not None:
+        filters.append(Performance.sport == sport)
+    if discipline is not None:
+        filters.append(Performance.discipline == discipline)
+
+    # PB: la perf a la même valeur que le record de sa discipline
+    page = (
+        select(Performance, sort_key, PersonalBest.performance)
+        .outerjoin(PersonalBest, (PersonalBest.user_id == Performance.user_id) & (PersonalBest.discipline == Performance.discipline))
+        .where(*filters)
+    )
+    if cursor:
+        try:
+            value, row_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        page = page.where(keyset_after(sort_key.element, Performance.id, value, row_id, descending))
+    rows = session.exec(page.order_by(*keyset_order(sort_key.element, Performance.id, descending)).limit(limit + 1)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_perf, last_value, _ = rows[-1]
+        next_cursor = encode_cursor(last_value, last_perf.id)
+
+    # Total et facettes (disciplines disponibles par sport): index (user_id, sport, discipline), pas la table
+    total, facets = None, None
+    if summary:
+        total = session.exec(select(func.count()).select_from(Performance).where(*filters)).one()
+        facets = {}
+        for facet_sport, facet_discipline in session.exec(
+            select(Performance.sport, Performance.discipline)
+            .where(Performance.user_id == user_id)
+            .distinct()
+            .order_by(Performance.discipline)
+        ).all():
+            facets.setdefault(facet_sport.value, []).append(facet_discipline)
+
+    return {
+        "total": total,
+        "items": [
+            {**perf.dict(), "is_pb": pb_value is not None and perf.performance == pb_value}
+            for perf, _, pb_value in rows
+        ],
+        "next_cursor": next_cursor,
+        "facets": facets,
+    }
+
 @app.post("/performances/delete")
 def delete_performance(
     performance_id: int = Form(...),
@@ -219,8 +497,15 @@ def delete_performance(
     if not perf:
         return JSONResponse({"detail": "Performance not found."}, status_code=404)
     
+    user_id, discipline = perf.user_id, perf.discipline
+    pb = session.get(PersonalBest, (user_id, discipline))
     session.delete(perf)
+    session.flush()
+    # la perf supprimée détenait le record: on le recalcule avant de valider
+    if pb is not None and pb.performance_id == performance_id:
+        refresh_personal_best(session, user_id, discipline)
     session.commit()
+    table_versions.bump(PERMANENT, "performance", "personal_best")
     return JSONResponse({"detail": "Performance deleted."}, status_code=200)
 
 class ScoreRequest(BaseModel):
@@ -242,18 +527,57 @@ def compute_score_api(data: ScoreRequest):
         return ScoreResponse(score=score)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+# Calcul groupé: un seul appel pour toute une table de décathlon
+class BatchScoreRequest(BaseModel):
+    events: List[str]
+    sexes: List[str]
+    perfs: List[float]
+class BatchScoreResponse(BaseModel):
+    scores: List[int]
+
+@app.post("/compute_hungarian_scores", response_model=BatchScoreResponse)
+def compute_scores_batch_api(data: BatchScoreRequest):
+    try:
+        scores = compute_hungarian_scores(
+            events=data.events,
+            sexes=data.sexes,
+            perfs=data.perfs
+        )
+        return BatchScoreResponse(scores=scores.tolist())
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-@app.get("/get_pb")
-def get_pb(user_id: int, discipline: str, session: Session = Depends(get_session_permanent)):
-    query = (
-        select(Performance)
-        .where(Performance.user_id == user_id)
-        .where(Performance.discipline == discipline)
-    )
+# Tables de points précalculées: points d'une marque, et marque minimale pour un nombre de points
+@app.get("/points_table/points", response_model=ScoreResponse)
+def get_points_for_mark(event: str, sex: str, mark: float):
+    try:
+        return ScoreResponse(score=lookup_points(event, sex, mark))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    perfs = session.exec(query).all()
+@app.get("/points_table/mark")
+def get_mark_for_points(event: str, sex: str, points: int):
+    try:
+        result = mark_for_points(event, sex, points)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Nombre de points inatteignable pour cette épreuve")
+    mark, mark_points = result
+    return {
+        "event": event,
+        "sex": sex,
+        "points": points,
+        "mark": mark,
+        "mark_points": mark_points,
+    }
 
-    if not perfs:
+@app.get("/get_pb")
+def get_pb(user_id: int, discipline: str, session: Session = Depends(get_session_permanent_read)):
+    pb = session.get(PersonalBest, (user_id, discipline))
+
+    if pb is None:
         return {
             "performance": 0,
             "score": 0,
@@ -261,73 +585,199 @@ def get_pb(user_id: int, discipline: str, session: Session = Depends(get_session
             "date": None
         }
 
-    best_perf = max(perfs, key=lambda p: p.score)
-
     return {
-        "performance": best_perf.performance,
-        "score": best_perf.score,
-        "unit": getattr(best_perf, "unit", None),
-        "date": best_perf.date if hasattr(best_perf, "date") else None,
+        "performance": pb.performance,
+        "score": pb.score,
+        "unit": pb.unit,
+        "date": pb.date,
     }
 
+# Tous les records perso d'un.e athlète, toutes disciplines
+@app.get("/users/{user_id}/pbs", response_model=List[PersonalBest])
+def get_user_pbs(user_id: int, session: Session = Depends(get_session_permanent_read)):
+    return session.exec(
+        select(PersonalBest)
+        .where(PersonalBest.user_id == user_id)
+        .order_by(PersonalBest.discipline)
+    ).all()
+
 # === DECATHLON === #
 # Récupérer les Compétitions
 @app.get("/decathlons")
-def get_all_decathlons(session: Session = Depends(get_session_permanent)):
+def get_all_decathlons(request: Request, response: Response, session: Session = Depends(get_session_permanent_read)):
+    cached = not_modified(request, response, PERMANENT, ["decathlon"])
+    if cached:
+        return cached
     return session.query(Decathlon).all()
 
 # Récupérer les performances d'une certaine compétition
 @app.get("/decathlon_performances")
-def get_decathlon_performances(decathlon_id: int, session: Session = Depends(get_session_permanent)):
+def get_decathlon_performances(decathlon_id: int, session: Session = Depends(get_session_permanent_read)):
     return session.query(DecathlonPerformance).filter(
         DecathlonPerformance.decathlon_id == decathlon_id
     ).all()
     
 # Récupérer les id d'athlètes qui sont notés dans un certain décathlon
 @app.get("/athletes_in_decathlon")
-def get_decathlon_athletes(decathlon_id: int, session: Session = Depends(get_session_permanent)):
+def get_decathlon_athletes(decathlon_id: int, session: Session = Depends(get_session_permanent_read)):
     return session.query(DecathlonAthleteLink).filter(
         DecathlonAthleteLink.decathlon_id == decathlon_id
     ).all()
 
+# Classement complet d'une compétition (cumuls, rangs, meilleures perfs, PB) en une requête
+@app.get("/decathlons/{decathlon_id}/standings")
+def get_decathlon_standings(
+    decathlon_id: int,
+    sexes: List[str] = Query(["M", "F"]),
+    session: Session = Depends(get_session_permanent_read)
+):
+    decathlon = session.get(Decathlon, decathlon_id)
+    if decathlon is None:
+        raise HTTPException(status_code=404, detail="Decathlon not found")
+
+    statement = (
+        select(
+            User.id, User.name, User.sexe, User.age, PersonalBest.score,
+            DecathlonPerformance.event, DecathlonPerformance.performance, DecathlonPerformance.score,
+        )
+        .join(User, User.id == DecathlonPerformance.user_id)
+        .outerjoin(PersonalBest, (PersonalBest.user_id == DecathlonPerformance.user_id) & (PersonalBest.discipline == "Décathlon"))
+        .where(DecathlonPerformance.decathlon_id == decathlon_id)
+        .order_by(DecathlonPerformance.id)
+    )
+    rows = [
+        (user_id, name, sexe.value, age, best_total, event, performance, score)
+        for user_id, name, sexe, age, best_total, event, performance, score in session.exec(statement).all()
+    ]
+
+    return {
+        "decathlon_id": decathlon_id,
+        "name": decathlon.name,
+        "date": decathlon.date,
+        "athletes": compute_standings(rows, sexes),
+    }
+
+# Écritures d'une compétition: performances saisies dans la table de décathlon (scores déjà calculés)
+class DecathlonPerformanceInput(BaseModel):
+    user_id: int
+    event: str
+    performance: str
+    score: int = 0
+class DecathlonCreate(BaseModel):
+    name: str
+    date: date
+    athlete_ids: List[int] = []
+    performances: List[DecathlonPerformanceInput] = []
+
+def check_decathlon_athletes(session, user_ids):
+    user_ids = set(user_ids)
+    if user_ids and len(session.exec(select(User.id).where(User.id.in_(user_ids))).all()) != len(user_ids):
+        raise HTTPException(status_code=400, detail="Un ou plusieurs athlètes sont introuvables")
+    return user_ids
+
+def link_decathlon_athletes(session, decathlon_id, user_ids):
+    linked = set(session.exec(
+        select(DecathlonAthleteLink.user_id).where(DecathlonAthleteLink.decathlon_id == decathlon_id)
+    ).all())
+    for user_id in user_ids - linked:
+        session.add(DecathlonAthleteLink(decathlon_id=decathlon_id, user_id=user_id))
+
+# Créer une compétition, ses athlètes et ses premières performances (une transaction)
+@app.post("/decathlons")
+def create_decathlon(data: DecathlonCreate, session: Session = Depends(get_session_permanent)):
+    user_ids = check_decathlon_athletes(session, data.athlete_ids + [p.user_id for p in data.performances])
+    decathlon = Decathlon(name=data.name, date=data.date)
+    session.add(decathlon)
+    session.flush()
+
+    link_decathlon_athletes(session, decathlon.id, user_ids)
+    for p in data.performances:
+        session.add(DecathlonPerformance(decathlon_id=decathlon.id, date=data.date, **p.model_dump()))
+
+    session.commit()
+    table_versions.bump(PERMANENT, "decathlon", "decathlonathletelink", "decathlonperformance")
+    session.refresh(decathlon)
+    return decathlon
+
+# Enregistrer les performances d'une compétition: mise à jour si (athlète, épreuve) existe, ajout sinon
+@app.put("/decathlons/{decathlon_id}/performances")
+def save_decathlon_performances(
+    decathlon_id: int,
+    performances: List[DecathlonPerformanceInput],
+    session: Session = Depends(get_session_permanent)
+):
+    decathlon = session.get(Decathlon, decathlon_id)
+    if decathlon is None:
+        raise HTTPException(status_code=404, detail="Decathlon not found")
+    user_ids = check_decathlon_athletes(session, [p.user_id for p in performances])
+
+    existing = {
+        (p.user_id, p.event): p
+        for p in session.exec(select(DecathlonPerformance).where(DecathlonPerformance.decathlon_id == decathlon_id)).all()
+    }
+    updated, created = 0, 0
+    for p in performances:
+        row = existing.get((p.user_id, p.event))
+        if row is not None:
+            row.performance, row.score, row.date = p.performance, p.score, decathlon.date
+            updated += 1
+        else:
+            session.add(DecathlonPerformance(decathlon_id=decathlon_id, date=decathlon.date, **p.model_dump()))
+            created += 1
+    link_decathlon_athletes(session, decathlon_id, user_ids)
+
+    session.commit()
+    table_versions.bump(PERMANENT, "decathlonathletelink", "decathlonperformance")
+    return {"updated": updated, "created": created}
+
 # === HEALTH === #
 # Créer un HealthCheck
 @app.post("/health-checks/", response_model=HealthCheck)
 def create_health_check(
-    daily_check: HealthCheckCreate, session: Session = Depends(get_session_season)
+    daily_check: HealthCheckCreate,
+    session: Session = Depends(get_session_season),
+    season_id: str = Depends(selected_season),
 ):
-    # Check for duplicate
-    statement = select(HealthCheck).where(
-        (HealthCheck.date == daily_check.date) &
-        (HealthCheck.athlete_id == daily_check.athlete_id)
-    )
-    existing = session.exec(statement).first()
-    if existing:
-        raise HTTPException(
-            status_code=400,
-            detail="A health check already exists for this athlete on this date."
-        )
-
     # Convert input schema to DB model
     health_check = HealthCheck(**daily_check.dict())
 
+    # Duplicates are rejected by the unique (date, athlete_id) constraint
     session.add(health_check)
-    session.commit()
-    session.flush()
+    try:
+        session.flush()
+        # score de récupération mis en cache dans la même transaction
+        session.add(health_check_cache_row(health_check))
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="A health check already exists for this athlete on this date."
+        )
+    table_versions.bump(season_id, "health_check")
     session.refresh(health_check)
 
     return health_check
 
 # Récupérer les HealthCheck
 @app.get("/health-checks/", response_model=list[HealthCheck])
-def get_all_health_checks(session: Session = Depends(get_session_season)):
+def get_all_health_checks(session: Session = Depends(get_session_season_read)):
     statement = select(HealthCheck)
     results = session.exec(statement).all()
     return results
 
 # Récupérer les HealthCheck d'un athlète précis
 @app.get("/health-checks/by-athlete/{athlete_id}", response_model=list[HealthCheck])
-def get_health_checks_by_athlete(athlete_id: int, session: Session = Depends(get_session_season)):
+def get_health_checks_by_athlete(
+    request: Request,
+    response: Response,
+    athlete_id: int,
+    season_id: str = Depends(selected_season),
+    session: Session = Depends(get_session_season_read),
+):
+    cached = not_modified(request, response, season_id, ["health_check"])
+    if cached:
+        return cached
     statement = select(HealthCheck).where(HealthCheck.athlete_id == athlete_id)
     results = session.exec(statement).all()
     results = [r for r in results if r is not None]
@@ -335,42 +785,35 @@ def get_health_checks_by_athlete(athlete_id: int, session: Session = Depends(get
 
 # Récupérer le HealthCheck quotidien d'un athlète
 @app.get("/health-checks/by-athlete/{athlete_id}/{end_date}", response_model=HealthCheck)
-def get_today_health_check(athlete_id: int, end_date: date = date.today(), session: Session = Depends(get_session_season)):
+def get_today_health_check(
+    request: Request,
+    response: Response,
+    athlete_id: int,
+    end_date: date = date.today(),
+    season_id: str = Depends(selected_season),
+    session: Session = Depends(get_session_season_read),
+):
+    cached = not_modified(request, response, season_id, ["health_check"])
+    if cached:
+        return cached
     statement = select(HealthCheck).where(
         (HealthCheck.athlete_id == athlete_id) &
         (HealthCheck.date == end_date)
     )
-    result = session.exec(statement).first()
-    if result:
-        return {
-            "sleep_duration": result.sleep_duration,
-            "sleep_quality": result.sleep_quality,
-            "resting_heart_rate": result.resting_heart_rate,
-            "hand_grip_test": result.hand_grip_test,
-            "longest_expiration_test": result.longest_expiration_test,
-            "one_leg_proprio_test": result.single_leg_proprio_test,
-        }
-    else:
-        return {
-            "sleep_duration": 0,
-            "sleep_quality": 0,
-            "resting_heart_rate": 0,
-            "hand_grip_test": 0,
-            "longest_expiration_test": 0,
-            "one_leg_proprio_test": 0,
-        }
+    return health_check_metrics(session.exec(statement).first())
 
 # Créer un nouveau ticket
 @app.post("/issues/", response_model=PhysicalIssueTicket)
-def create_issue(ticket: PhysicalIssueTicket, session: Session = Depends(get_session_season)):
+def create_issue(ticket: PhysicalIssueTicket, session: Session = Depends(get_session_season), season_id: str = Depends(selected_season)):
     session.add(ticket)
     session.commit()
+    table_versions.bump(season_id, "physicalissueticket")
     session.refresh(ticket)
     return ticket
 
 # Ajouter un suivi de ticket
 @app.post("/issues/{ticket_id}/followups/", response_model=PhysicalIssueFollowUp)
-def add_followup(ticket_id: int, followup: PhysicalIssueFollowUp, session: Session = Depends(get_session_season)):
+def add_followup(ticket_id: int, followup: PhysicalIssueFollowUp, session: Session = Depends(get_session_season), season_id: str = Depends(selected_season)):
     ticket = session.get(PhysicalIssueTicket, ticket_id)
     if not ticket:
         raise HTTPException(404, "Ticket not found")
@@ -382,17 +825,18 @@ def add_followup(ticket_id: int, followup: PhysicalIssueFollowUp, session: Sessi
         raise HTTPException(400, "Follow-up already exists for this date")
     session.add(followup)
     session.commit()
+    table_versions.bump(season_id, "physicalissuefollowup")
     session.refresh(followup)
     return followup
 
 # Récupérer les tickets d'un athlète
 @app.get("/athletes/{athlete_id}/issues/", response_model=list[PhysicalIssueTicket])
-def get_athlete_issues(athlete_id: int, session: Session = Depends(get_session_season)):
+def get_athlete_issues(athlete_id: int, session: Session = Depends(get_session_season_read)):
     return session.exec(select(PhysicalIssueTicket).where(PhysicalIssueTicket.athlete_id == athlete_id)).all()
 
 # Récupérer tous les suivis pour un ticket
 @app.get("/issues/{ticket_id}/followups/", response_model=list[PhysicalIssueFollowUp])
-def get_issue_followups(ticket_id: int, session: Session = Depends(get_session_season)):
+def get_issue_followups(ticket_id: int, session: Session = Depends(get_session_season_read)):
     return session.exec(select(PhysicalIssueFollowUp).where(PhysicalIssueFollowUp.ticket_id == ticket_id).order_by(PhysicalIssueFollowUp.date)).all()
 
 # Calculer le score de récupération et le renvoyer au frontend
@@ -407,4 +851,185 @@ class DailyMetrics(BaseModel):
 @app.post("/compute_recovery_score/")
 def compute_recovery_score(data: DailyMetrics):
     score = recovery_score(data.dict())
-    return JSONResponse({"recovery_score": score})
\ No newline at end of file
+    return JSONResponse({"recovery_score": score})
+
+# Matrice athlète x jour des scores de récupération, en une requête et un calcul vectorisé
+# None les jours sans HealthCheck
+@app.get("/recovery_scores")
+def get_recovery_scores(
+    start_date: date,
+    end_date: date,
+    background_tasks: BackgroundTasks,
+    athlete_ids: List[int] = Query(...),
+    season_id: str = Depends(selected_season),
+    session: Session = Depends(get_session_season_read),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date doit être postérieure à start_date")
+
+    # scores lus dans le cache, seuls les checks nouveaux ou modifiés sont recalculés (mis en cache après la réponse)
+    checks, computed = cached_recovery_scores(session, athlete_ids, start_date, end_date)
+    if computed:
+        background_tasks.add_task(store_recovery_scores, season_engines(season_id)[0], computed)
+    return recovery_matrix(checks, athlete_ids, start_date, end_date)
+
+
+# === DASHBOARD === #
+# Tout ce qu'affiche l'onglet Tableau de bord pour un.e athlète et une période, en un seul aller-retour
+@app.get("/dashboard/{athlete_id}")
+def get_dashboard(
+    athlete_id: int,
+    start_date: date,
+    end_date: date,
+    background_tasks: BackgroundTasks,
+    season_id: str = Depends(selected_season),
+    session_permanent: Session = Depends(get_session_permanent_read),
+    session: Session = Depends(get_session_season_read),
+):
+    if end_date < start_date:
+        raise HTTPException(status_code=400, detail="end_date doit être postérieure à start_date")
+    athlete = user_cache.get(session_permanent, athlete_id)
+    if athlete is None:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # bandeau et jauge de charge
+    daily_load = get_daily_load(athlete_id, start_date, end_date, session)
+
+    # radar: séances par discipline / nature d'entraînement
+    training_types = session.exec(
+        select(TrainingSession.type)
+        .join(UserTrainingLinks, UserTrainingLinks.training_id == TrainingSession.id)
+        .where(UserTrainingLinks.user_id == athlete_id)
+        .where(TrainingSession.date >= start_date)
+        .where(TrainingSession.date <= end_date)
+    ).all()
+
+    # check du dernier jour de la période et son score (cache)
+    health_check = session.exec(
+        select(HealthCheck)
+        .where(HealthCheck.athlete_id == athlete_id)
+        .where(HealthCheck.date == end_date)
+    ).first()
+    checks, computed = cached_recovery_scores(session, [athlete_id], end_date, end_date)
+    if computed:
+        background_tasks.add_task(store_recovery_scores, season_engines(season_id)[0], computed)
+
+    return {
+        "athlete": athlete,
+        "period": {"start_date": start_date, "end_date": end_date},
+        "daily_load": daily_load,
+        "radar": radar_breakdown(training_types),
+        "health_check": health_check,
+        "recovery_score": float(checks["score"].iloc[0]) if len(checks) else None,
+    }
+
+
+# === CARRIÈRE (toutes saisons) === #
+
+def parse_seasons(seasons: Optional[str]):
+    # "2425,2526" -> ["2425", "2526"], None = saisons les plus récentes
+    return [s.strip() for s in seasons.split(",") if s.strip()] if seasons else None
+
+@app.get("/seasons")
+def get_seasons():
+    return {
+        "current": season_registry.current,
+        "seasons": sorted(set(discover_seasons()) | {season_registry.current}),
+        "open": season_registry.open_seasons(),
+    }
+
+# Passage à une nouvelle saison sans redémarrer: la base est créée si besoin
+@app.put("/seasons/current")
+def set_current_season(season: str):
+    try:
+        season_registry.set_current(season)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    create_season_tables(season)
+    return {"current": season_registry.current}
+
+@app.get("/users/{user_id}/career/trainings")
+def get_career_trainings(user_id: int, seasons: Optional[str] = None):
+    try:
+        return career_training_load(user_id, parse_seasons(seasons))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/users/{user_id}/career/health")
+def get_career_health(user_id: int, seasons: Optional[str] = None):
+    try:
+        return career_health(user_id, parse_seasons(seasons))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/users/{user_id}/career/issues")
+def get_career_issues(user_id: int, seasons: Optional[str] = None):
+    try:
+        return career_issues(user_id, parse_seasons(seasons))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# === ARCHIVE (saisons terminées, Parquet) === #
+
+@app.get("/archive/seasons")
+def get_archived_seasons():
+    return archived_seasons()
+
+@app.get("/users/{user_id}/archive/trainings")
+def get_archived_trainings(user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return archived_trainings(user_id, start_date, end_date)
+
+@app.get("/users/{user_id}/archive/health-checks")
+def get_archived_health_checks(user_id: int, start_date: Optional[date] = None, end_date: Optional[date] = None):
+    return archived_health_checks(user_id, start_date, end_date)
+
+@app.get("/users/{user_id}/archive/summary", response_model=List[SeasonSummary])
+def get_archived_summary(user_id: int, season: Optional[str] = None, session: Session = Depends(get_session_permanent_read)):
+    statement = select(SeasonSummary).where(SeasonSummary.user_id == user_id)
+    if season is not None:
+        statement = statement.where(SeasonSummary.season == season)
+    return session.exec(statement.order_by(SeasonSummary.month)).all()
+
+
+# === EXPORT === #
+
+# Export complet d'une table en flux (NDJSON ou CSV), pour l'analyse des données hors de l'appli
+@app.get("/export/{dataset}")
+def export_dataset(dataset: str, format: str = "ndjson", season: str = Depends(selected_season)):
+    if dataset not in export_datasets:
+        raise HTTPException(status_code=404, detail=f"Jeu de données inconnu: {dataset}")
+    if format not in export_formats:
+        raise HTTPException(status_code=400, detail=f"Format inconnu: {format}")
+    season_engines(season)
+    return StreamingResponse(
+        iter_export(dataset, format, season),
+        media_type=export_formats[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'},
+    )
+
+
+# === IMPORT === #
+
+# Import en masse d'un fichier CSV / JSON / NDJSON (validation et écriture par paquets)
+@app.post("/import/{dataset}")
+def import_dataset(dataset: str, file: UploadFile = File(...), season: str = Depends(selected_season)):
+    if dataset not in import_datasets:
+        raise HTTPException(status_code=404, detail=f"Jeu de données inconnu: {dataset}")
+    try:
+        rows = parse_rows(file.file.read().decode("utf-8"), file.filename or "")
+    except (ValueError, UnicodeDecodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Fichier illisible: {e}")
+    season_engines(season)
+    report = import_rows(dataset, rows, season=season)
+    base = PERMANENT if import_writers[dataset][0] == "permanent" else season
+    table_versions.bump(base, *import_tables[dataset])
+    return report
+
+
+# === INTERNE === #
+
+# État des pools de connexions et des sessions, par base
+@app.get("/internal/stats/db")
+def get_db_stats():
+    return db_stats.snapshot()
@@ -1,8 +1,9 @@
 # app/models/__init__.py
 from .user import User, UserCreate
-from .training import TrainingSession, UserTrainingLinks, CoachTrainingLinks
-from .performance import Performance
-from .health_check import HealthCheck, HealthCheckCreate
+from .training import TrainingSession, UserTrainingLinks, CoachTrainingLinks, DailyTrainingLoad
+from .performance import Performance, PersonalBest
+from .health_check import HealthCheck, HealthCheckCreate, RecoveryScoreCache
 from .decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
+from .season_summary import SeasonSummary
 
-__all__ = ["User", "UserCreate", "TrainingSession", "UserTrainingLinks", "CoachTrainingLinks", "Performance", "HealthCheck", "HealthCheckCreate", "Decathlon", "DecathlonPerformance", "DecathlonAthleteLink"]
+__all__ = ["User", "UserCreate", "TrainingSession", "UserTrainingLinks", "CoachTrainingLinks", "DailyTrainingLoad", "Performance", "PersonalBest", "HealthCheck", "HealthCheckCreate", "RecoveryScoreCache", "Decathlon", "DecathlonPerformance", "DecathlonAthleteLink", "SeasonSummary"]
@@ -48,3 +48,12 @@ class HealthCheckCreate(SQLModel):
     single_leg_proprio_test: Optional[int] = None
     
     notes: Optional[str] = None
+
+
+# Scores de récupération déjà calculés, par HealthCheck et par version de la configuration des métriques
+class RecoveryScoreCache(SQLModel, table=True):
+    __tablename__ = "recovery_score_cache"
+
+    health_check_id: int = Field(primary_key=True)
+    config_version: str = Field(primary_key=True)
+    score: float
@@ -1,4 +1,4 @@
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
 from typing import Optional, TYPE_CHECKING
 from datetime import date
 #from .user import User
@@ -18,6 +18,12 @@ class ConditionMeteo(str, Enum):
     orageux = "Orageux"
 
 class Performance(SQLModel, table=True):
+    # historique paginé d'un.e athlète (tri par date) et facettes sport / discipline sans parcourir la table
+    __table_args__ = (
+        Index("ix_performance_user_date", "user_id", "date", "id"),
+        Index("ix_performance_user_discipline", "user_id", "sport", "discipline"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(foreign_key="user.id")
     date: str
@@ -33,3 +39,16 @@ class Performance(SQLModel, table=True):
     mental_cues: Optional[str]
     
     user: Optional["User"] = Relationship(back_populates="performances")
+
+
+# Record personnel par athlète et discipline, maintenu à chaque écriture de performance
+class PersonalBest(SQLModel, table=True):
+    __tablename__ = "personal_best"
+
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    discipline: str = Field(primary_key=True)
+    performance_id: int = Field(foreign_key="performance.id")
+    performance: str
+    unit: str
+    score: float = Field(default=0)
+    date: str
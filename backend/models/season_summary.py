@@ -0,0 +1,23 @@
+from sqlmodel import SQLModel, Field
+from typing import Optional
+
+
+# Résumé mensuel par athlète d'une saison archivée en Parquet (reste interrogeable en SQL)
+class SeasonSummary(SQLModel, table=True):
+    __tablename__ = "season_summary"
+
+    season: str = Field(primary_key=True)
+    user_id: int = Field(foreign_key="user.id", primary_key=True)
+    month: str = Field(primary_key=True)
+
+    sessions: int = 0
+    duration: int = 0
+    load: int = 0
+    avg_intensity: Optional[float] = None
+
+    health_checks: int = 0
+    avg_sleep_quality: Optional[float] = None
+    avg_energy_level: Optional[float] = None
+    avg_muscle_soreness: Optional[float] = None
+
+    issues_opened: int = 0
@@ -1,6 +1,7 @@
 # app/models/training.py
 from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Relationship, Index
+from sqlalchemy import PrimaryKeyConstraint
 from datetime import date
 from backend.models.enumeration import Sport
 
@@ -8,6 +9,8 @@ if TYPE_CHECKING:
     from backend.models.user import User
 
 class TrainingSession(SQLModel, table=True):
+    __table_args__ = (Index("ix_trainingsession_date", "date"),)
+
     id: Optional[int] = Field(default=None, primary_key=True)
     sport: Sport
     type: str
@@ -38,4 +41,18 @@ class CoachTrainingLinks(SQLModel, table=True):
     training: "TrainingSession" = Relationship(back_populates="coaches")
 
 
+
+# Charge quotidienne par athlète, tenue à jour par des triggers SQLite (voir backend/daily_load.py)
+class DailyTrainingLoad(SQLModel, table=True):
+    __tablename__ = "daily_training_load"
+    __table_args__ = (PrimaryKeyConstraint("user_id", "date"),)
+
+    user_id: int
+    date: date
+    sessions: int = 0
+    duration: int = 0          # somme des durées (min)
+    intensity_sum: int = 0     # somme des intensités, moyenne = intensity_sum / sessions
+    srpe: int = 0              # somme des intensité x durée
+
+
 #from backend.models.user import User  # Do this at the bottom
\ No newline at end of file
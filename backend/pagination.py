@@ -0,0 +1,35 @@
+# backend/pagination.py
+import base64
+import json
+
+from sqlalchemy import tuple_
+
+
+# --- Pagination par curseur (keyset) ---
+# Le curseur encode la clé de tri et l'id de la dernière ligne de la page précédente,
+# la page suivante se lit avec un WHERE sur l'index au lieu d'un OFFSET qui relit tout l'historique
+def encode_cursor(value, row_id):
+    payload = json.dumps([value, row_id], default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Curseur invalide")
+    return value, int(row_id)
+
+
+def keyset_after(sort_key, id_column, value, row_id, descending=True):
+    # lignes strictement après (value, row_id) dans l'ordre (sort_key, id)
+    # comparaison de row values: SQLite démarre la lecture de l'index au curseur au lieu de filtrer depuis le début
+    if descending:
+        return tuple_(sort_key, id_column) < tuple_(value, row_id)
+    return tuple_(sort_key, id_column) > tuple_(value, row_id)
+
+
+def keyset_order(sort_key, id_column, descending=True):
+    if descending:
+        return [sort_key.desc(), id_column.desc()]
+    return [sort_key.asc(), id_column.asc()]
@@ -0,0 +1,83 @@
+# backend/recovery_cache.py
+# Cache des scores de récupération: une ligne par (HealthCheck, version de la configuration des métriques)
+# - un HealthCheck créé, modifié ou supprimé efface son score (triggers SQLite, quelle que soit l'origine de l'écriture)
+# - une configuration modifiée change metrics_version: les anciens scores ne sont plus lus, puis purgés au démarrage
+# - rempli par les écritures (POST /health-checks/) et, pour les scores manquants, par une tâche de fond après les GET
+import logging
+
+import pandas as pd
+from sqlalchemy import and_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+from backend.models.health_check import HealthCheck, RecoveryScoreCache
+from backend.assets.metrics_compute import recovery_score, recovery_scores, health_check_fields, health_check_metrics, metrics_version
+
+logger = logging.getLogger(__name__)
+
+recovery_cache_triggers = {
+    "recovery_cache_check_insert": "AFTER INSERT ON health_check BEGIN DELETE FROM recovery_score_cache WHERE health_check_id = NEW.id; END",
+    "recovery_cache_check_update": "AFTER UPDATE ON health_check BEGIN DELETE FROM recovery_score_cache WHERE health_check_id = OLD.id; END",
+    "recovery_cache_check_delete": "AFTER DELETE ON health_check BEGIN DELETE FROM recovery_score_cache WHERE health_check_id = OLD.id; END",
+}
+
+
+def create_recovery_cache_triggers(engine):
+    with engine.begin() as conn:
+        for name, body in recovery_cache_triggers.items():
+            conn.exec_driver_sql(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+        conn.exec_driver_sql("DELETE FROM recovery_score_cache WHERE config_version != ?", (metrics_version,))
+
+
+def cached_recovery_scores(session, athlete_ids, start_date, end_date):
+    """
+    Scores des HealthCheck de la période: lus dans le cache, calculés pour les checks sans score.
+    Aucune écriture ici (session de lecture): renvoie aussi les scores calculés, à mettre en cache
+    par store_recovery_scores (tâche de fond des routes GET).
+    """
+    rows = session.exec(
+        select(
+            HealthCheck.id, HealthCheck.athlete_id, HealthCheck.date,
+            *[getattr(HealthCheck, f) for f in health_check_fields.values()],
+            RecoveryScoreCache.score,
+        )
+        .outerjoin(RecoveryScoreCache, and_(
+            RecoveryScoreCache.health_check_id == HealthCheck.id,
+            RecoveryScoreCache.config_version == metrics_version,
+        ))
+        .where(HealthCheck.athlete_id.in_(athlete_ids))
+        .where(HealthCheck.date >= start_date)
+        .where(HealthCheck.date <= end_date)
+    ).all()
+    checks = pd.DataFrame(rows, columns=["id", "athlete_id", "date"] + list(health_check_fields) + ["score"])
+
+    computed = []
+    missing = checks["score"].isna()
+    if missing.any():
+        scores = recovery_scores(checks[missing])
+        checks.loc[missing, "score"] = scores
+        computed = [
+            {"health_check_id": int(health_check_id), "config_version": metrics_version, "score": float(score)}
+            for health_check_id, score in zip(checks.loc[missing, "id"], scores)
+        ]
+
+    return checks[["athlete_id", "date", "score"]], computed
+
+
+def store_recovery_scores(write_engine, computed):
+    try:
+        with Session(write_engine) as session:
+            session.execute(sqlite_insert(RecoveryScoreCache.__table__).on_conflict_do_nothing(), computed)
+            session.commit()
+    except OperationalError as e:
+        # base occupée au-delà du busy_timeout: les scores seront mis en cache au prochain calcul
+        if "database is locked" not in str(e.orig):
+            raise
+        logger.warning("Cache des scores de récupération non écrit (%d scores): base verrouillée", len(computed))
+
+
+def health_check_cache_row(health_check):
+    # score d'un HealthCheck qui vient d'être écrit, à ajouter dans la même transaction (après le trigger d'invalidation)
+    score = recovery_score(health_check_metrics(health_check))
+    return RecoveryScoreCache(health_check_id=health_check.id, config_version=metrics_version, score=score)
@@ -0,0 +1,74 @@
+# backend/table_versions.py
+# Versions des tables pour les GET conditionnels (ETag / Last-Modified, 304 sur If-None-Match)
+# - chaque route d'écriture incrémente la version des tables touchées (en mémoire, sans accès à la base)
+# - l'état des fichiers SQLite (os.stat) est ajouté à l'ETag: les écritures faites hors de l'API
+#   (onglets Streamlit qui écrivent directement, imports en CLI) changent aussi l'ETag
+import hashlib
+import os
+import time
+from email.utils import formatdate
+from threading import Lock
+
+from fastapi import Response
+
+from backend.database import DATA_DIR, season_path
+
+PERMANENT = "permanent"
+
+
+def database_path(base):
+    # base: "permanent" ou un id de saison
+    return os.path.join(DATA_DIR, "database.db") if base == PERMANENT else season_path(base)
+
+
+def database_stamp(base):
+    # la base et son WAL: toute transaction validée modifie l'un des deux
+    stamp, modified = [], 0.0
+    for path in (database_path(base), database_path(base) + "-wal"):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        stamp.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        modified = max(modified, stat.st_mtime)
+    return "/".join(stamp), modified
+
+
+class TableVersions:
+    def __init__(self):
+        self._lock = Lock()
+        self.started = time.time()
+        self.versions = {}  # (base, table) -> (version, date de la dernière écriture)
+
+    def bump(self, base, *tables):
+        now = time.time()
+        with self._lock:
+            for table in tables:
+                version, _ = self.versions.get((base, table), (0, self.started))
+                self.versions[(base, table)] = (version + 1, now)
+
+    def validators(self, base, tables):
+        with self._lock:
+            entries = [self.versions.get((base, table), (0, self.started)) for table in tables]
+        stamp, file_modified = database_stamp(base)
+        versions = ".".join(str(version) for version, _ in entries)
+        digest = hashlib.sha1(f"{base}|{versions}|{stamp}".encode()).hexdigest()[:16]
+        last_modified = max([modified for _, modified in entries] + [file_modified])
+        return f'W/"{digest}"', formatdate(last_modified, usegmt=True)
+
+
+table_versions = TableVersions()
+
+
+def not_modified(request, response, base, tables):
+    """
+    Pose ETag et Last-Modified sur la réponse. Renvoie une réponse 304 (à renvoyer telle quelle, sans requête SQL)
+    si le client a déjà cette version, None sinon.
+    """
+    etag, last_modified = table_versions.validators(base, tables)
+    headers = {"ETag": etag, "Last-Modified": last_modified}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
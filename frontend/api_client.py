@@ -0,0 +1,185 @@
+# frontend/api_client.py
+# Client HTTP partagé par tous les onglets:
+# - une requests.Session (connexions keep-alive réutilisées entre les reruns et les utilisateurs)
+# - cache des GET avec une durée de vie par endpoint, revalidé par ETag (304) une fois expiré
+# - invalidation des GET concernés après chaque écriture (POST / PUT / DELETE)
+# - temps de réponse mesurés par endpoint (affichés dans Paramètres)
+import re
+import time
+from threading import Lock
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+
+API_URL = "http://localhost:8000"
+
+# Durée de vie (s) des GET en cache, premier préfixe qui correspond au chemin
+cache_ttls = [
+    ("/points_table/", 3600),
+    ("/athletes_in_decathlon", 300),
+    ("/decathlons", 120),
+    ("/athletes", 120),
+    ("/users/", 60),
+    ("/seasons", 60),
+]
+default_ttl = 30
+
+# POST de calcul, sans écriture: pas d'invalidation
+pure_posts = ("/compute_",)
+
+# Écriture -> préfixes des GET qui dépendent des données écrites (tout le cache si aucun préfixe ne correspond)
+# "/users/" couvre aussi les sous-ressources d'un.e athlète: séances, charge, perfs, PB, carrière, archives
+invalidations = [
+    # users: listes, fiches, tableau de bord, classements (noms), liens supprimés avec l'user
+    ("/users/", ["/users/", "/athletes", "/dashboard/", "/training_data", "/trainings/", "/recovery_scores", "/decathlons", "/athletes_in_decathlon"]),
+    # séances: historique, charge quotidienne / workload, recherche, carrière, tableau de bord
+    ("/trainings/", ["/trainings/", "/training_data", "/users/", "/dashboard/"]),
+    # performances: historique, PB, classements de décathlon (construits avec les PB)
+    ("/performances/", ["/performances/", "/users/", "/get_pb", "/decathlons"]),
+    # health checks: checks, scores de récupération, carrière santé, tableau de bord
+    ("/health-checks/", ["/health-checks/", "/recovery_scores", "/users/", "/dashboard/"]),
+    # blessures et suivis: tickets d'un.e athlète, carrière blessures
+    ("/issues/", ["/issues/", "/athletes/", "/users/"]),
+    # compétitions: liste, performances, athlètes inscrits, classements
+    ("/decathlons", ["/decathlons", "/decathlon_performances", "/athletes_in_decathlon"]),
+    ("/import/", None),
+    ("/seasons/", None),
+]
+
+# les ids dans les chemins sont regroupés pour les statistiques: /users/3/pbs -> /users/{id}/pbs
+id_pattern = re.compile(r"/\d+(?=/|$)")
+
+
+def ttl_for(path):
+    for prefix, ttl in cache_ttls:
+        if path.startswith(prefix):
+            return ttl
+    return default_ttl
+
+
+def cache_key(path, params):
+    if not params:
+        return (path, ())
+    items = []
+    for key, value in sorted(params.items()):
+        values = value if isinstance(value, (list, tuple)) else [value]
+        items.append((key, tuple(str(v) for v in values)))
+    return (path, tuple(items))
+
+
+class ApiClient:
+    def __init__(self, base_url=API_URL, pool_size=16, timeout=30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._lock = Lock()
+        self.cache = {}   # clé -> (expiration, etag, réponse)
+        self.timings = {} # "GET /users/{id}" -> compteurs
+
+    # --- Statistiques ---
+    def _record(self, method, path, elapsed, outcome):
+        name = f"{method} {id_pattern.sub('/{id}', path)}"
+        with self._lock:
+            stats = self.timings.setdefault(name, {"calls": 0, "cache_hits": 0, "not_modified": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["calls"] += 1
+            if outcome == "hit":
+                stats["cache_hits"] += 1
+                return
+            if outcome == "304":
+                stats["not_modified"] += 1
+            stats["total_ms"] += elapsed * 1000
+            stats["max_ms"] = max(stats["max_ms"], elapsed * 1000)
+
+    def stats(self):
+        with self._lock:
+            rows = []
+            for name, s in sorted(self.timings.items()):
+                network = s["calls"] - s["cache_hits"]
+                rows.append({
+                    "endpoint": name,
+                    "appels": s["calls"],
+                    "cache": s["cache_hits"],
+                    "304": s["not_modified"],
+                    "moyenne (ms)": round(s["total_ms"] / network, 1) if network else 0.0,
+                    "max (ms)": round(s["max_ms"], 1),
+                })
+            return rows
+
+    # --- Requêtes ---
+    def _send(self, method, path, **kwargs):
+        start = time.perf_counter()
+        response = self.session.request(method, self.base_url + path, timeout=self.timeout, **kwargs)
+        return response, time.perf_counter() - start
+
+    def get(self, path, params=None, cache=True):
+        key = cache_key(path, params)
+        headers = {}
+        entry = None
+        if cache:
+            with self._lock:
+                entry = self.cache.get(key)
+            if entry is not None:
+                expires, etag, cached = entry
+                if time.monotonic() < expires:
+                    self._record("GET", path, 0, "hit")
+                    return cached
+                if etag:
+                    headers["If-None-Match"] = etag
+
+        response, elapsed = self._send("GET", path, params=params, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            # données inchangées côté serveur: on reprend la réponse en cache pour une nouvelle durée
+            self._record("GET", path, elapsed, "304")
+            with self._lock:
+                self.cache[key] = (time.monotonic() + ttl_for(path), etag, cached)
+            return cached
+
+        self._record("GET", path, elapsed, "network")
+        if cache and response.status_code == 200:
+            with self._lock:
+                self.cache[key] = (time.monotonic() + ttl_for(path), response.headers.get("ETag"), response)
+        return response
+
+    def _write(self, method, path, **kwargs):
+        response, elapsed = self._send(method, path, **kwargs)
+        self._record(method, path, elapsed, "network")
+        if not path.startswith(pure_posts):
+            self.invalidate(path)
+        return response
+
+    def post(self, path, **kwargs):
+        return self._write("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self._write("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self._write("DELETE", path, **kwargs)
+
+    # --- Invalidation ---
+    def invalidate(self, path=None):
+        prefixes = None
+        if path is not None:
+            for prefix, targets in invalidations:
+                if path.startswith(prefix):
+                    prefixes = targets
+                    break
+        with self._lock:
+            if prefixes is None:
+                self.cache.clear()
+            else:
+                for key in [k for k in self.cache if k[0].startswith(tuple(prefixes))]:
+                    del self.cache[key]
+
+
+# Un seul client par processus Streamlit, partagé entre les reruns et les sessions
+@st.cache_resource
+def get_client():
+    return ApiClient()
+
+
+api = get_client()
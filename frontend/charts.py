@@ -0,0 +1,56 @@
+# frontend/charts.py
+# Rendu des graphes du tableau de bord, mis en cache entre les reruns et les sessions:
+# - donuts matplotlib rendus en SVG, mémoïsés par (valeur affichée, couleur, titre)
+# - jauge et radar plotly mis en cache sous forme de JSON par valeur d'entrée (fonctions *_json de dashboard_tab)
+# Les figures matplotlib sont créées sans pyplot (aucun registre global) et vidées dès le SVG produit,
+# la mémoire ne grossit donc pas avec le nombre de reruns (max_entries borne aussi les caches).
+import io
+import json
+
+import matplotlib
+from matplotlib.figure import Figure
+import streamlit as st
+
+# ids déterministes dans le SVG: même entrée -> même SVG
+svg_rc = {"svg.hashsalt": "openams", "svg.fonttype": "path"}
+
+
+# ----- Donuts (matplotlib -> SVG) ----- #
+@st.cache_data(max_entries=256, show_spinner=False)
+def donut_svg(label, percentage, color, title, suffix):
+    fig = Figure(figsize=(2, 2), facecolor='none')
+    try:
+        ax = fig.subplots()
+        ax.pie(
+            [percentage, 1 - percentage],
+            startangle=90,
+            colors=[color, "none"],
+            radius=1,
+            counterclock=False,
+            wedgeprops={'width': 0.25, 'edgecolor': 'none'}
+        )
+        ax.text(0, 0, f"{label}\n{suffix}", ha='center', va='center', fontsize=10, weight='bold', color="white")
+        fig.suptitle(title, fontsize=8, y=0.05, color="white")
+
+        ax.set(aspect="equal")
+        ax.set_frame_on(False)
+        fig.tight_layout()
+
+        buffer = io.StringIO()
+        with matplotlib.rc_context(svg_rc):
+            fig.savefig(buffer, format="svg", bbox_inches="tight", facecolor="none")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def donut(data, title, color, maxi, suffix):
+    # seules les entrées visibles font partie de la clé: la valeur arrondie à l'affichage et le remplissage
+    percentage = round(max(0, min(data / maxi, 1)), 3)
+    st.image(donut_svg(f"{data:.2f}", percentage, color, title, suffix), use_container_width=True)
+
+
+# ----- Plotly (figure -> JSON) ----- #
+def plotly_json(figure_json):
+    # figure mise en cache en JSON (fig.to_json()) par l'appelant, affichée sans refaire traces et mise en page
+    st.plotly_chart(json.loads(figure_json), use_container_width=True)
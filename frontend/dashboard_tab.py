@@ -1,87 +1,14 @@
 import streamlit as st
-import requests
+from api_client import api
+from charts import donut, plotly_json
 import streamlit.components.v1 as components
 
 from datetime import date, timedelta
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import matplotlib.pyplot as plt
 import numpy as np
 
-API_URL = "http://localhost:8000"
-
-training_type_to_event_mapping = {
-    "Sprint - Départ": {"sport": "Sprint", "type": "Technique"}, 
-    "Sprint - Lactique": {"sport": "", "type": "Lactique"}, 
-    "Sprint - Technique": {"sport": "Sprint", "type": "Technique"},
-    "Sprint - Gammes": {"sport": "Sprint", "type": "Gammes"},
-    
-    "Haies - Technique": {"sport": "Haies", "type": "Technique"}, 
-    "Haies - Passages": {"sport": "Haies", "type": "Recherche repères"},
-    "Haies - Gammes": {"sport": "Haies", "type": "Gammes"},
-    
-    "Course - Aérobie Haute": {"sport": "Aérobie", "type": "Intervalles"}, 
-    "Course - Aérobie Basse": {"sport": "Aérobie", "type": "EF"}, 
-    
-    "Longueur - Technique": {"sport": "Longueur", "type": "Technique"},
-    "Longueur - Élan réduit": {"sport": "Longueur", "type": "Technique"}, 
-    "Longueur - Élan complet": {"sport": "Longueur", "type": "Recherche repères"}, 
-    "Longueur - Gammes": {"sport": "Longueur", "type": "Gammes"},
-    
-    "Hauteur - Technique": {"sport": "Hauteur", "type": "Technique"},
-    "Hauteur - Élan réduit": {"sport": "Hauteur", "type": "Technique"}, 
-    "Hauteur - Élan complet": {"sport": "Hauteur", "type": "Recherche repères"}, 
-    "Hauteur - Gammes": {"sport": "Hauteur", "type": "Gammes"},
-    
-    "Perche - Technique": {"sport": "Perche", "type": "Technique"},
-    "Perche - Élan réduit": {"sport": "Perche", "type": "Technique"},
-    "Perche - Élan complet": {"sport": "Perche", "type": "Recherche repères"},
-    "Perche - Gammes": {"sport": "Perche", "type": "Gammes"},
-    
-    "Poids - Technique": {"sport": "Poids", "type": "Technique"},
-    "Poids - Élan réduit": {"sport": "Poids", "type": "Technique"},
-    "Poids - Élan complet": {"sport": "Poids", "type": "Recherche repères"},
-    "Poids - Gammes": {"sport": "Poids", "type": "Gammes"},
-    
-    "Disque - Technique": {"sport": "Disque", "type": "Technique"},
-    "Disque - Élan réduit": {"sport": "Disque", "type": "Technique"},
-    "Disque - Élan complet": {"sport": "Disque", "type": "Recherche repères"},
-    "Disque - Gammes": {"sport": "Disque", "type": "Gammes"},
-    
-    "Javelot - Technique": {"sport": "Javelot", "type": "Technique"},
-    "Javelot - Élan réduit": {"sport": "Javelot", "type": "Technique"},
-    "Javelot - Élan complet": {"sport": "Javelot", "type": "Recherche repères"}, 
-    "Javelot - Gammes": {"sport": "Javelot", "type": "Gammes"},
-    
-    "Muscu - Force": {"sport": "Muscu", "type": "Force"},
-    "Muscu - Puissance": {"sport": "Muscu", "type": "Puissance"},
-    "Muscu - Explosivité": {"sport": "Muscu", "type": "Explosivité"},
-    "PPG": {"sport": "Muscu", "type": "PPG"},
-    "Bondissements": {"sport": "Muscu", "type": "Bondissement"},
-    
-    "Compétition - Décathlon": {"sport": "Décathlon", "type": "Compétition"},
-    "Compétition - 100m": {"sport": "100m", "type": "Compétition"},
-    "Compétition - Longueur": {"sport": "Longueur", "type": "Compétition"},
-    "Compétition - Poids": {"sport": "Poids", "type": "Compétition"},
-    "Compétition - Hauteur": {"sport": "Hauteur", "type": "Compétition"},
-    "Compétition - 400m": {"sport": "400m", "type": "Compétition"},
-    "Compétition - 110mH": {"sport": "110mH", "type": "Compétition"},
-    "Compétition - Disque": {"sport": "Disque", "type": "Compétition"},
-    "Compétition - Perche": {"sport": "Perche", "type": "Compétition"},
-    "Compétition - Javelot": {"sport": "Javelot", "type": "Compétition"},
-    "Compétition - 1500m": {"sport": "1500m", "type": "Compétition"},
-    
-    "Général": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Épaules": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Hanches": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Dos": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Jambes": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Bas du corps": {"sport": "Mobilité", "type": "Mobilité"},
-    "Spécifique - Haut du corps": {"sport": "Mobilité", "type": "Mobilité"},
-    
-    "Prévention Blessure": {"sport": "Muscu", "type": "Prévention/Réhab"},
-}
 
 mode = 'day'
 color_map_intensity = {
@@ -127,8 +54,8 @@ def dashboard_tab():
     end_date = period[1]
     start_date = period[0]
 
-    response = requests.get(f"{API_URL}/training_data", params={
-        "user_id": user_id,
+    # toutes les données du tableau de bord en un appel (charge quotidienne, radar, check et score de récupération)
+    response = api.get(f"/dashboard/{user_id}", params={
         "start_date": start_date,
         "end_date": end_date
     })
@@ -143,15 +70,16 @@ def dashboard_tab():
         st.error("Erreur lors de la récupération des données.")
         return
 
-    training_data = response.json()
+    dashboard = response.json()
+    daily_load = dashboard["daily_load"]
     
-    bandeau(training_data, period, user_id)
+    bandeau(daily_load, period, dashboard["recovery_score"])
     
     col1, _, col2, _, col3 = st.columns([20, 1, 15, 1, 20])
     with col1:
         health_temporal_graph(athlete)
     with col2:
-        training_load(training_data, period)
+        training_load(daily_load, period)
     with col3:
         choice = st.radio(
         "Organiser par",
@@ -166,7 +94,7 @@ def dashboard_tab():
             tri = 'sport'
         else:
             tri = 'type'
-        radar_graph(athlete, tri)
+        radar_graph(dashboard["radar"], tri)
     
     col1, _, col2 = st.columns([20, 1, 20])
     with col1:
@@ -175,7 +103,7 @@ def dashboard_tab():
         injury_graph(athlete)
     
 def get_athletes():
-    resp = requests.get(f"{API_URL}/athletes")
+    resp = api.get("/athletes")
     if resp.status_code == 200:
         return resp.json()
     return None
@@ -213,7 +141,7 @@ def main_header():
     return athletes_options[selected_athlete]
 
 # ----- Bandeau ----- #
-def bandeau(training_data, period, athlete_id):
+def bandeau(daily_load, period, recovery):
     #st.info("Bandeau des 5 métriques (intensité moyenne des entraînements sur la durée,\
     #    durée d'entraînement moyenne sur la durée, score de récupération, santé globale calculée sur base des \
     #        infos du check quotidien et pénalisé/régularisé par les infos blessures, \
@@ -223,146 +151,85 @@ def bandeau(training_data, period, athlete_id):
     col1, _, col2, _, col3, _, col4, _, col5 = st.columns([10, 1, 10, 1, 10, 1, 10, 1, 10])
         
     with col1:
-        data = mean_intensity(training_data, period, mode)
+        data = mean_intensity(daily_load, period, mode)
 
-        fig = donut_chart(data, "Intensité moyenne d'entraînement", color_map=color_map_intensity, maxi=10, suffix='/10', bb=True)
-        st.pyplot(fig)
+        donut(data, "Intensité moyenne d'entraînement", get_color(data, color_map_intensity), maxi=10, suffix='/10')
     with col2:
-        data = mean_duration(training_data, period, mode)
+        data = mean_duration(daily_load, period, mode)
         
-        fig = donut_chart(data, "Durée moyenne d'entraînement", color_map=color_map_duration, maxi=200, suffix=' min', bb=True)
-        st.pyplot(fig)
+        donut(data, "Durée moyenne d'entraînement", get_color(data, color_map_duration), maxi=200, suffix=' min')
         
     with col3:
-        data = recovery_score(athlete_id)
+        data = recovery or 0
         
-        fig = donut_chart(data, "Score de Récupération", color_map=inverse_color_map_intensity, maxi=10, suffix='/10', bb=False)
-        st.pyplot(fig)
+        donut(data, "Score de Récupération", get_inverse_color(data, inverse_color_map_intensity), maxi=10, suffix='/10')
 
     with col4:
         data = physical_health_score()
         data = 3.2
         
-        fig = donut_chart(data, "Score Physique de Santé", color_map=inverse_color_map_intensity, maxi=10, suffix='/10', bb=False)
-        st.pyplot(fig)
+        donut(data, "Score Physique de Santé", get_inverse_color(data, inverse_color_map_intensity), maxi=10, suffix='/10')
 
     with col5:
         data = physiological_health_score()
         data = 8.9
         
-        fig = donut_chart(data, "Score Physiologique de Santé", color_map=inverse_color_map_intensity, maxi=10, suffix='/10', bb=False)
-        st.pyplot(fig)
+        donut(data, "Score Physiologique de Santé", get_inverse_color(data, inverse_color_map_intensity), maxi=10, suffix='/10')
 
-def mean_intensity(training_data, period, mode='session'):
+def mean_intensity(daily_load, period, mode='session'):
     # mode = 'day' fait la moyenne quotidienne de l'intensité, 'session' fait la moyenne de l'intensité par séance
-    df = pd.DataFrame(training_data)
+    df = pd.DataFrame(daily_load)
     horizon = (period[1]-period[0]).days
     
     if df.empty:
         return 0
     
     if mode == 'day':
-        grouped = df.groupby("date").agg({"intensity": 'mean', "duration": 'sum'})
-        res = grouped['intensity'].sum()/(horizon+1)
+        res = df['mean_intensity'].sum()/(horizon+1)
         return res
     elif mode == 'session':
-        res = df['intensity'].mean()
+        res = df['intensity_sum'].sum()/df['sessions'].sum()
         return res
         
     return 0.0
 
-def mean_duration(training_data, period, mode='day'):
-    df = pd.DataFrame(training_data)
+def mean_duration(daily_load, period, mode='day'):
+    df = pd.DataFrame(daily_load)
     horizon = (period[1]-period[0]).days
     
     if df.empty:
         return 0
     
     if mode == 'day':
-        grouped = df.groupby("date").agg({"intensity": 'mean', "duration": 'sum'})
-        res = grouped['duration'].sum()/(horizon+1)
+        res = df['duration'].sum()/(horizon+1)
         return res
     elif mode == 'session':
-        res = df['duration'].mean()
+        res = df['duration'].sum()/df['sessions'].sum()
         return res
         
     return 0.0
 
-def recovery_score(athlete_id):
-    end_date = st.session_state.get("period")[1]
-    daily_measurements = requests.get(f"{API_URL}/health-checks/by-athlete/{athlete_id}/{end_date}").json()
-    if daily_measurements is None:
-        return 0
-    else:
-        daily_measurements = {
-            'sleep_quality': daily_measurements["sleep_quality"], 
-            'sleep_duration': daily_measurements["sleep_duration"], 
-            'resting_heart_rate': daily_measurements["resting_heart_rate"], 
-            'hand_grip_test': daily_measurements["hand_grip_test"], 
-            'longest_expiration_test': daily_measurements["longest_expiration_test"], 
-            'single_leg_proprio_test': daily_measurements["single_leg_proprio_test"], 
-        }
-
-    response = requests.post(f"{API_URL}/compute_recovery_score/", json=daily_measurements)
-
-    if response.status_code == 200:
-        score = response.json().get("recovery_score")
-        return score
-    else:
-        return 0
-
 def physical_health_score():
     return
 
 def physiological_health_score():
     return
 
-def donut_chart(data, title, color_map, maxi, suffix, bb=True): # bb = bottom best, true if it's bad to have a too high score
-    fig, ax = plt.subplots(figsize=(2, 2), facecolor='none')
-
-    percentage = max(0, min(data / maxi, 1))
-
-    values = [percentage, 1 - percentage]
-    if bb:
-        colors = [get_color(data, color_map), "none"]
-    else:
-        colors = [get_inverse_color(data, color_map), "none"]
-        
-    wedges, _ = ax.pie(
-        values,
-        startangle=90,
-        colors=colors,
-        radius=1,
-        counterclock=False,
-        wedgeprops={'width': 0.25, 'edgecolor': 'none'}
-    )
-
-    ax.text(0, 0, f"{data:.2f}\n{suffix}", ha='center', va='center', fontsize=10, weight='bold', color="white")
-    #ax.set_title(title, fontsize=8, pad=6, color="white")
-    fig.suptitle(title, fontsize=8, y=0.05, color="white")
-
-    ax.set(aspect="equal")
-    plt.box(False)
-    plt.tight_layout()
-    return fig
-
 # ----- Charge d'entraînement ----- #
-def training_load(training_data, period):
-    load = compute_training_load(training_data=training_data, period=period)
+def training_load(daily_load, period):
+    load = compute_training_load(daily_load=daily_load, period=period)
 
-    fig = plot_training_load_gauge(load)
-    st.plotly_chart(fig, use_container_width=True)
+    plotly_json(training_load_gauge_json(load))
 
-def compute_training_load(training_data, period, I_max=8, D_max=180):
-    df = pd.DataFrame(training_data)
+def compute_training_load(daily_load, period, I_max=8, D_max=180):
+    df = pd.DataFrame(daily_load)
 
     if df.empty:
         return 0.0
 
     df["date"] = pd.to_datetime(df["date"])
-    df["intensity"] = df["intensity"].astype(float)
-    df["duration"] = df["duration"].astype(float)
-    df["training_product"] = df["duration"] * df["intensity"]
+    # srpe = somme des intensité x durée du jour
+    df["srpe"] = df["srpe"].astype(float)
 
     # double check de la période sur laquelle on filtre
     start, end = pd.Timestamp(period[0]), pd.Timestamp(period[1])
@@ -373,12 +240,15 @@ def compute_training_load(training_data, period, I_max=8, D_max=180):
     if df.empty:
         return 0.0
 
-    grouped = df.groupby("date").agg({"intensity": "sum", "duration": "sum", "training_product": "sum"})
-    grouped["load_per_day"] = grouped["training_product"] / (I_max*D_max)
+    load_per_day = df["srpe"] / (I_max*D_max)
 
-    load = (10 / delta) * grouped["load_per_day"].sum()
+    load = (10 / delta) * load_per_day.sum()
     return load
 
+@st.cache_data(max_entries=128, show_spinner=False)
+def training_load_gauge_json(load):
+    return plot_training_load_gauge(load).to_json()
+
 def plot_training_load_gauge(load):
     fig = go.Figure(go.Indicator(
         mode="gauge+number",
@@ -418,44 +288,20 @@ def plot_training_load_gauge(load):
     return fig
 
 # ----- Graphe CS ----- #
-def radar_graph(athlete, tri):
-    period = st.session_state.period
-    end_date = period[1]
-    start_date = period[0]
-    user_id = athlete["id"]
-
-    response = requests.get(f"{API_URL}/training_data", params={
-        "user_id": user_id,
-        "start_date": start_date,
-        "end_date": end_date
-    })
-    
-    try:
-        response.raise_for_status()
-    except Exception as e:
-        st.error(f"Erreur: {e}")
-        st.stop()
-
-    if response.status_code != 200:
-        st.error("Erreur lors de la récupération des données.")
-        return
-
-    training_data = response.json()
-    df = pd.DataFrame(training_data)
+def radar_graph(radar, tri):
+    # comptes par discipline / nature d'entraînement calculés côté backend
+    counts = pd.DataFrame(radar[tri], columns=['name', 'value'])
     
-    if df.empty:
+    if counts.empty:
         return []
-
-    #df['event'] = df['type'].map(training_type_to_event_mapping)
-    df['event'] = df['type'].map(lambda name: training_type_to_event_mapping.get(name, {}).get(tri, None))
-    df = df.dropna(subset=['event'])
-    counts = df['event'].value_counts().reset_index()
-    counts.columns = ['name', 'value']
-    
-    
-    fig = plot_radar(counts)
-    st.plotly_chart(fig, use_container_width=True)
     
+    plotly_json(radar_json(tuple(counts.itertuples(index=False, name=None))))
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def radar_json(counts):
+    # counts: ((nom, valeur), ...) hashable, même entrée -> même JSON
+    return plot_radar(pd.DataFrame(counts, columns=['name', 'value'])).to_json()
+
 def plot_radar(df):
     fig = go.Figure()
 
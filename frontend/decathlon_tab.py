@@ -1,30 +1,17 @@
 import streamlit as st
-from sqlmodel import Session, select
 
-#from backend.database import engine
-from backend.database import engine_permanent, engine_season
-import requests
+from api_client import api
 from datetime import date
 from backend.models.user import User
 from backend.models.enumeration import Role, Sport
-from backend.models.decathlon import Decathlon, DecathlonPerformance, DecathlonAthleteLink
 
 import pandas as pd
 from datetime import datetime
 import plotly.express as px
 
-API_URL = "http://localhost:8000"
 
 # --- Events --- #
-decaH = ["100m", "Longueur", "Poids", "Hauteur", "400m", "110mH", "Disque", "Perche", "Javelot", "1500m"]
-decaF = ["100m", "Longueur", "Poids", "Hauteur", "400m", "100mH", "Disque", "Perche", "Javelot", "1500m"]
-decaHM = ["100m", "Longueur", "Poids", "Hauteur", "400m", "100mH", "Disque", "Perche", "Javelot", "1500m"]
-all_events_deca = ["100m", "Longueur", "Poids", "Hauteur", "400m", "110mH/100mH", "Disque", "Perche", "Javelot", "1500m"]
-
-event_aliases = {
-    "110mH": "110mH/100mH",
-    "100mH": "110mH/100mH"
-}
+from backend.assets.standings import decaH, decaF, decaHM, all_events_deca, event_aliases
 
 unit_mapping = {
     "100m": "s",
@@ -68,44 +55,45 @@ def decathlon_tab():
 
 # ----------- Fetching database -----------
 def fetch_all_decathlons():
-    resp = requests.get(f"{API_URL}/decathlons")
+    resp = api.get("/decathlons")
     if resp.status_code == 200:
         return resp.json()
     return []
 
 def fetch_performances(decathlon_id: int):
-    resp = requests.get(f"{API_URL}/decathlon_performances?decathlon_id={decathlon_id}")
+    resp = api.get("/decathlon_performances", params={"decathlon_id": decathlon_id})
     if resp.status_code == 200:
         return resp.json()
     return []
 
 def fetch_user(user_id: int):
-    resp = requests.get(f"{API_URL}/users/{user_id}")
+    resp = api.get(f"/users/{user_id}")
     if resp.status_code == 200:
         return resp.json()
     return None
 
-def fetch_user_best_total_score(user_id: int, discipline: str):
-    resp = requests.get(f"{API_URL}/get_pb", params={"user_id": user_id, "discipline": discipline})
+def fetch_users(user_ids: list):
+    # objets User (attributs .id, .name, .sexe, .age) dans l'ordre des ids, en une requête
+    if not user_ids:
+        return []
+    resp = api.get("/users/", params={"ids": ",".join(str(i) for i in user_ids)})
+    if resp.status_code != 200:
+        return []
+    users = {u["id"]: User.model_validate(u) for u in resp.json()}
+    return [users[i] for i in user_ids if i in users]
+
+def fetch_standings(decathlon_id: int, sexes: list):
+    resp = api.get(f"/decathlons/{decathlon_id}/standings", params={"sexes": sexes})
     if resp.status_code == 200:
-        return resp.json()
-    return {
-            "performance": 0,
-            "score": 0,
-            "unit": None,
-            "date": None
-        }
+        return resp.json()["athletes"]
+    return []
 
 def fetch_athletes_in_deca(decathlon_id: int):
-    resp = requests.get(f"{API_URL}/athletes_in_decathlon?decathlon_id={decathlon_id}")
+    resp = api.get("/athletes_in_decathlon", params={"decathlon_id": decathlon_id})
     if resp.status_code == 200:
         return resp.json()
     return []
 
-@st.cache_data
-def fetch_user_cached(uid):
-    return fetch_user(uid)
-
 
 # ----------------- Displaying section -------------------
 def display_live_ranking(df_rank):
@@ -177,23 +165,6 @@ def display_competition():
     selected_comp = comp_options[selected_name]
     st.session_state["selected_competition"] = selected_comp
 
-    performances = fetch_performances(selected_comp["id"])
-    if not performances:
-        st.info("Aucune performance enregistrée pour cette compétition.")
-        return
-
-    # Group by athlete
-    athlete_map = {}
-    for perf in performances:
-        uid = perf["user_id"]
-        if uid not in athlete_map:
-            user_data = fetch_user_cached(uid)
-            athlete_map[uid] = {
-                "user": user_data,
-                "performances": {}
-            }
-        athlete_map[uid]["performances"][perf["event"]] = (perf["performance"], perf["score"])
-        
     # Filter by sexe
     col1, col2, _ = st.columns([1, 1, 4])
     with col1:
@@ -211,9 +182,13 @@ def display_competition():
     if show_m:
         selected_sexes.append("M")
 
+    # Classement calculé côté backend (cumuls, rangs, meilleures perfs, PB)
+    standings = fetch_standings(selected_comp["id"], selected_sexes)
+    if not standings:
+        st.info("Aucune performance enregistrée pour cette compétition.")
+        return
 
-    # Compute cumulative ranking
-    df_rank = compute_ranking(athlete_map, selected_sexes)
+    df_rank = compute_ranking(standings)
     display_live_ranking(df_rank)
     
     html = """
@@ -236,38 +211,8 @@ def display_competition():
             html += f"<th style='border: 1px solid black;'>{event}</th>"
     html += "<th style='border: 1px solid black;'>Total</th></tr>"
 
-
-    best_scores_by_event = {}
-    athlete_rows = []
-    for athlete_id, data in athlete_map.items():
-        user = data["user"]
-        if user["sexe"] not in selected_sexes:
-            continue
-        perf_dict = data["performances"]
-        total_score = 0
-
-        if user["sexe"] == "M":
-            events_athle = decaHM if user["age"] < 16 else decaH
-        else:
-            events_athle = decaF
-
-        for event in events_athle:
-            if event in perf_dict:
-                _, score = perf_dict[event]
-                total_score += score
-                norm_event = event_aliases.get(event, event)
-                best_scores_by_event[norm_event] = max(best_scores_by_event.get(norm_event, 0), score)
-
-        athlete_rows.append((athlete_id, user, perf_dict, total_score))
-
-    athlete_rows.sort(key=lambda x: x[3], reverse=True)
-
-    rank = 0
-    for athlete_id, user, perf_dict, total_score in athlete_rows:
-        if user["sexe"] not in selected_sexes:
-            continue
-        
-        rank += 1
+    for athlete in standings:
+        rank = athlete["rank"]
         if rank == 1:
             bg_color = "#FFD90088"
         elif rank == 2:
@@ -277,44 +222,18 @@ def display_competition():
         else:
             bg_color = ""
             
-        best_perf = fetch_user_best_total_score(user["id"], discipline="Décathlon")
-        best_score = best_perf['score']
-        pb_tag = " <span style='color:white;'>(PB)</span>" if total_score > best_score else ""
-        
-        if user["sexe"] == "M":
-            events_athle = decaHM if user["age"] < 16 else decaH
-        else:
-            events_athle = decaF
+        pb_tag = " <span style='color:white;'>(PB)</span>" if athlete["is_pb"] else ""
 
-        html += f"<tr><td style='border: 1px solid black; font-weight: bold; background-color:{bg_color};'>{user['name']}</td>"
+        html += f"<tr><td style='border: 1px solid black; font-weight: bold; background-color:{bg_color};'>{athlete['name']}</td>"
         cumulative = 0
 
-        for event in events_athle:
-            unit = unit_mapping.get(event, "")
-            if event in perf_dict:
-                perf, score = perf_dict[event]
+        for result in athlete["results"]:
+            if result["performance"] is not None:
+                score = result["score"]
                 cumulative += score
+                perf_str = format_performance(result["event"], result["performance"])
 
-                if perf in ['NM', 'DNS', 'DNF']:
-                    unit = 'fail' # trick to avoid next if statements and still execute rest of the loop lines
-                else:
-                    perf = float(perf)
-                    
-
-                if unit == "m":
-                    perf /= 100
-                    perf_str = f"{perf:.2f}m"
-                elif unit == "s":
-                    perf_str = f"{perf:.2f}s"
-                elif unit == "min":
-                    minutes = int(perf // 60)
-                    seconds = perf % 60
-                    perf_str = f"{minutes}min{seconds:.2f}s"
-                else:
-                    perf_str = str(perf)
-                    
-                norm_event = event_aliases.get(event, event)
-                if score == best_scores_by_event.get(norm_event):
+                if result["is_event_best"]:
                     event_color = "#56D956"
                 else:
                     event_color = "white"
@@ -326,7 +245,7 @@ def display_competition():
 
             html += f"<td style='border: 1px solid black; color: {event_color}; background-color:{bg_color};'>{cell}</td>"
 
-        html += f"<td style='border: 1px solid black; background-color:{bg_color};'><b>{total_score}</b><i>{pb_tag}</i></td></tr>"
+        html += f"<td style='border: 1px solid black; background-color:{bg_color};'><b>{athlete['total']}</b><i>{pb_tag}</i></td></tr>"
 
     html += "</table>"
     st.markdown(html, unsafe_allow_html=True)
@@ -361,11 +280,7 @@ def resume_competition():
     competition_data = {}
     if not performances:
         ids = fetch_athletes_in_deca(selected_comp["id"])
-        active_athletes = []
-        with Session(engine_permanent) as session:
-            for id in ids:
-                athlete = session.exec(select(User).where(User.id == id['user_id'])).all()
-                active_athletes.append(athlete[0])
+        active_athletes = fetch_users([id['user_id'] for id in ids])
         for athlete in ids:
             competition_data[athlete['user_id']] = {}
             
@@ -380,12 +295,7 @@ def resume_competition():
             p = perf['performance']
             competition_data[id][event] = p
         
-        active_athletes = []
-        with Session(engine_permanent) as session:
-            for id in ids:
-                athlete = session.exec(select(User).where(User.id == id)).all()
-                
-                active_athletes.append(athlete[0])
+        active_athletes = fetch_users(ids)
 
     st.session_state["competition_data"] = competition_data
     st.session_state["active_athletes"] = active_athletes
@@ -397,104 +307,52 @@ def resume_competition():
         st.rerun()
 
 def update_decathlon_in_db():
-    with Session(engine_permanent) as session:
-        comp = st.session_state.get("decathlon_object")
-        if not comp:
-            st.error("Aucune compétition sélectionnée.")
-            return
-
-        decathlon_id = comp["id"]
-        comp_date = datetime.strptime(comp["date"], "%Y-%m-%d").date()
-        updated, created = 0, 0
-
-        for athlete in st.session_state["active_athletes"]:
-            user_id = athlete.id
-            sexe = athlete.sexe.value
-            age = athlete.age
-
-            if sexe == "M":
-                events = decaHM if age < 16 else decaH
-            elif sexe == "F":
-                events = decaF
-
-            perf_data = st.session_state["competition_data"].get(user_id, {})
-
-            for event in events:
-                perf_str = perf_data.get(event)
-                if not perf_str:
-                    continue
-
-                try:
-                    perf_val = float(perf_str)
-                    score = compute_score_remote(event, sexe, perf_val)
-
-                    existing = session.exec(
-                        select(DecathlonPerformance)
-                        .where(DecathlonPerformance.decathlon_id == decathlon_id)
-                        .where(DecathlonPerformance.user_id == user_id)
-                        .where(DecathlonPerformance.event == event)
-                    ).first()
-
-                    if existing:
-                        existing.performance = perf_val
-                        existing.score = score
-                        existing.date = comp_date
-                        updated += 1
-                    else:
-                        new_perf = DecathlonPerformance(
-                            decathlon_id=decathlon_id,
-                            user_id=user_id,
-                            event=event,
-                            performance=perf_val,
-                            score=score,
-                            date=comp_date
-                        )
-                        session.add(new_perf)
-                        created += 1
-
-                # PAS TROUVÉ MIEUX POUR VÉRIFIER QUE LA PERF EST UN NM/DNS/DNF
-                except ValueError:
-                    if perf_str in ['NM', 'DNS', 'DNF']:
-                        perf_val = perf_str
-                        score = 0
-                        
-                        existing = session.exec(
-                            select(DecathlonPerformance)
-                            .where(DecathlonPerformance.decathlon_id == decathlon_id)
-                            .where(DecathlonPerformance.user_id == user_id)
-                            .where(DecathlonPerformance.event == event)
-                        ).first()
-                        
-                        if existing:
-                            existing.performance = perf_val
-                            existing.score = score
-                            existing.date = comp_date
-                            updated += 1
-                        else:
-                            new_perf = DecathlonPerformance(
-                                decathlon_id=decathlon_id,
-                                user_id=user_id,
-                                event=event,
-                                performance=perf_val,
-                                score=score,
-                                date=comp_date
-                            )
-                            session.add(new_perf)
-                            created += 1
-                    else:
-                        st.warning(f"Performance invalide: {perf_str} pour {athlete.name} ({event})")
-                except Exception as e:
-                    session.rollback()
-                    st.warning(f"Erreur pour {athlete.name} - {event}: {e}")
-
-        session.commit()
-        st.success(f"Performances mises à jour: {updated} – Ajouts: {created}")
+    comp = st.session_state.get("decathlon_object")
+    if not comp:
+        st.error("Aucune compétition sélectionnée.")
+        return
+
+    performances = []
+    scores_by_key = batch_scores(st.session_state["active_athletes"], st.session_state["competition_data"])
+    for athlete in st.session_state["active_athletes"]:
+        if athlete.sexe.value == "M":
+            events = decaHM if athlete.age < 16 else decaH
+        elif athlete.sexe.value == "F":
+            events = decaF
+
+        perf_data = st.session_state["competition_data"].get(athlete.id, {})
+        for event in events:
+            perf_str = perf_data.get(event)
+            if not perf_str:
+                continue
+            row = performance_row(athlete, event, perf_str, scores_by_key)
+            if row is None:
+                st.warning(f"Performance invalide: {perf_str} pour {athlete.name} ({event})")
+                continue
+            performances.append(row)
+
+    # mise à jour ou ajout de chaque (athlète, épreuve) côté API, en une transaction
+    response = api.put(f"/decathlons/{comp['id']}/performances", json=performances)
+    if response.status_code == 200:
+        result = response.json()
+        st.success(f"Performances mises à jour: {result['updated']} – Ajouts: {result['created']}")
+    else:
+        st.error(f"Erreur: {response.json().get('detail')}")
+
+def performance_row(athlete, event, perf_str, scores_by_key):
+    # perf chiffrée (score calculé) ou non marquée (NM/DNS/DNF, 0 point), None si invalide
+    try:
+        perf_val = float(perf_str)
+        return {"user_id": athlete.id, "event": event, "performance": str(perf_val), "score": scores_by_key[(athlete.id, event)]}
+    except ValueError:
+        if perf_str in ['NM', 'DNS', 'DNF']:
+            return {"user_id": athlete.id, "event": event, "performance": str(perf_str), "score": 0}
+    return None
 
 # ------------------ Competition Creation ------------------
 def create_competition():
     st.subheader("Créer une nouvelle compétition")
-    with Session(engine_permanent) as session:
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
+    athletes = [User.model_validate(a) for a in api.get("/athletes").json()]
 
     athlete_options = {f"{a.name}": a for a in athletes}
 
@@ -530,11 +388,13 @@ def render_decathlon_table(edit_mode):
     competition_data = st.session_state.get("competition_data", {})
     active_athletes = st.session_state.get("active_athletes", [])
 
+    # 1er passage: saisie des perfs, les scores sont affichés après un unique calcul groupé
+    pending = []  # (athlete_id, event, sexe, perf, emplacement du score)
+    total_slots = {}
     for athlete in active_athletes:
         with st.expander(f"{athlete.name} ({athlete.sexe.value})"):
             cols = st.columns(11)
             row_data = competition_data.get(athlete.id, {})
-            total_score = 0
             if athlete.sexe.value == "M":
                 if athlete.age < 16:
                     events_athle = decaHM
@@ -551,9 +411,7 @@ def render_decathlon_table(edit_mode):
                     if perf:
                         try:
                             perf_val = float(perf)
-                            score = compute_score_remote(event, athlete.sexe.value, perf_val)
-                            st.markdown(f"**Score**: {score}")
-                            total_score += score
+                            pending.append((athlete.id, event, athlete.sexe.value, perf_val, st.empty()))
                             row_data[event] = perf
                         except ValueError:
                             if perf in ['NM', 'DNS', 'DNF']:
@@ -564,9 +422,22 @@ def render_decathlon_table(edit_mode):
                             else:
                                 st.warning("Entrée invalide")
             with cols[10]:
-                st.markdown(f"**Total** {total_score}")
+                total_slots[athlete.id] = st.empty()
             competition_data[athlete.id] = row_data
 
+    # 2e passage: un seul aller-retour pour toute la table
+    scores = compute_scores_remote(
+        [p[1] for p in pending],
+        [p[2] for p in pending],
+        [p[3] for p in pending],
+    )
+    totals = {athlete_id: 0 for athlete_id in total_slots}
+    for (athlete_id, _, _, _, slot), score in zip(pending, scores):
+        slot.markdown(f"**Score**: {score}")
+        totals[athlete_id] += score
+    for athlete_id, slot in total_slots.items():
+        slot.markdown(f"**Total** {totals[athlete_id]}")
+
     st.session_state["competition_data"] = competition_data
 
     st.divider()
@@ -599,183 +470,100 @@ def render_decathlon_table(edit_mode):
                 st.rerun()
 
 # ------------------ Compute Score ------------------
-def compute_score_remote(event: str, sex: str, perf: float) -> int:
+def compute_scores_remote(events: list, sexes: list, perfs: list) -> list:
+    if not events:
+        return []
     score_payload = {
-        "event": event,
-        "sex": sex,
-        "perf": perf
+        "events": events,
+        "sexes": sexes,
+        "perfs": perfs
     }
     try:
-        score_response = requests.post(
-            f"{API_URL}/compute_hungarian_score",
+        score_response = api.post(
+            "/compute_hungarian_scores",
             json=score_payload
         )
         if score_response.status_code == 200:
-            return score_response.json().get("score", 0)
+            return score_response.json().get("scores", [0] * len(events))
         else:
-            st.error(f"Erreur calcul du score : {score_response.status_code} - {score_response.text}")
-            return 0
+            st.error(f"Erreur calcul des scores : {score_response.status_code} - {score_response.text}")
+            return [0] * len(events)
     except Exception as e:
-        st.error(f"Erreur lors de l'appel au calcul du score : {e}")
-        return 0
+        st.error(f"Erreur lors de l'appel au calcul des scores : {e}")
+        return [0] * len(events)
+
+def batch_scores(athletes, competition_data) -> dict:
+    # {(user_id, event): score} pour toutes les perfs chiffrées, calculés en un seul appel
+    keys, sexes, perfs = [], [], []
+    for athlete in athletes:
+        for event, perf_str in competition_data.get(athlete.id, {}).items():
+            try:
+                perf_val = float(perf_str)
+            except (TypeError, ValueError):
+                continue
+            keys.append((athlete.id, event))
+            sexes.append(athlete.sexe.value)
+            perfs.append(perf_val)
+    scores = compute_scores_remote([k[1] for k in keys], sexes, perfs)
+    return dict(zip(keys, scores))
 
 # ------------------ Save to Database ------------------
 def create_competition_in_db():
-    with Session(engine_permanent) as session:
-        
-        # 1. Create the competition
-        comp = Decathlon(
-            name=st.session_state['competition_name'],
-            date=date.today(),
-        )
-        session.add(comp)
-        session.commit()
-        session.refresh(comp)
-
-        # 2. Link athletes to this competition
-        for athlete in st.session_state["active_athletes"]:
-            if not getattr(athlete, "id", None):
-                st.error(f"L'athlète {athlete} n'a pas d'ID – skipping.")
-                continue
-            try:
-                link = DecathlonAthleteLink(
-                    decathlon_id=comp.id,
-                    user_id=athlete.id
-                )
-                session.add(link)
-            except Exception as e:
-                st.error(f"Erreur lors du lien: {e}")
+    performances = []
+    scores_by_key = batch_scores(st.session_state["active_athletes"], st.session_state["competition_data"])
+    for athlete in st.session_state["active_athletes"]:
+        for event, perf_str in st.session_state["competition_data"].get(athlete.id, {}).items():
+            row = performance_row(athlete, event, perf_str, scores_by_key)
+            if row is None:
+                st.warning(f"Erreur: performance invalide {perf_str} sur athlète {athlete.id} - Skipping")
                 continue
-            
-        session.commit()
-
-        # 3. Add performances for each athlete
-        for athlete in st.session_state["active_athletes"]:
-            user_id = athlete.id
-            perf_data = st.session_state["competition_data"].get(user_id, {})
-
-            for event, perf_str in perf_data.items():
-                try:
-                    perf_val = float(perf_str)
-                    score = compute_score_remote(event, athlete.sexe.value, perf_val)
-
-                    performance = DecathlonPerformance(
-                        decathlon_id=comp.id,
-                        user_id=user_id,
-                        event=event,
-                        performance=perf_val,
-                        score=score,
-                        date=date.today()
-                    )
-                    session.add(performance)
-
-                except Exception as e:
-                    if perf_str in ['NM', 'DNS', 'DNF']:
-                        perf_val = str(perf_str)
-                        score = 0
-
-                        performance = DecathlonPerformance(
-                            decathlon_id=comp.id,
-                            user_id=user_id,
-                            event=event,
-                            performance=perf_val,
-                            score=score,
-                            date=date.today()
-                        )
-                        session.add(performance)
-                    else:
-                        st.warning(f"Erreur: {e} sur athlète {athlete.id} - Skipping")
-                    continue
-                
-        # 4. Final commit
-        session.commit()
+            performances.append(row)
+
+    # compétition, liens athlètes et performances créés par l'API (une transaction)
+    response = api.post("/decathlons", json={
+        "name": st.session_state['competition_name'],
+        "date": str(date.today()),
+        "athlete_ids": [athlete.id for athlete in st.session_state["active_athletes"]],
+        "performances": performances,
+    })
+    if response.status_code == 200:
         st.success("Compétition sauvegardée")
+    else:
+        st.error(f"Erreur: {response.json().get('detail')}")
 
 # ---------- HELPERS ----------- #
-def compute_ranking(athlete_map, selected_sexes):
+def format_performance(event, raw_perf):
+    # traiter les perfs non marquées (NM/DNS/DNF)
+    if raw_perf in ['NM', 'DNS', 'DNF']:
+        return str(raw_perf)
+
+    raw_perf = float(raw_perf)
+    unit = unit_mapping.get(event, "")
+    if unit == "m":
+        return f"{raw_perf / 100:.2f}m"
+    elif unit == "s":
+        return f"{raw_perf:.2f}s"
+    elif unit == "min":
+        minutes = int(raw_perf // 60)
+        seconds = raw_perf % 60
+        return f"{minutes}min{seconds:.2f}s"
+    return str(raw_perf)
+
+def compute_ranking(standings):
+    # Mise en forme du classement backend pour le graphe d'évolution
     ranking_data = []
-    cumulative_by_athlete = {}
-    event_scores_map = {event: [] for event in all_events_deca}
-
-    for athlete_id, data in athlete_map.items():
-        user = data["user"]
-        perf_dict = data["performances"]
-        name = user["name"]
-        sexe = user["sexe"]
-        age = user["age"]
-
-        if sexe not in selected_sexes:
-            continue
-
-        if sexe == "M":
-            events = decaHM if age < 16 else decaH
-        elif sexe == "F":
-            events = decaF
-
-        cumulative_score = 0
-        for event in events:
-            event_score = 0
-            raw_perf = None
-            formatted_perf = ""
-
-            if event in perf_dict:
-                raw_perf = perf_dict[event][0]
-                event_score = perf_dict[event][1]
-
-                unit = unit_mapping.get(event, "")
-                
-                # traiter les perfs non marquées (NM/DNS/DNF)
-                if raw_perf in ['NM', 'DNS', 'DNF']:
-                    formatted_perf = str(raw_perf)
-                    event_score = 0
-                    unit = 'fail' # in order to skip next if statements and still add the performance to the df
-                else:
-                    raw_perf = float(raw_perf)
-                    
-                    
-                if unit == "m":
-                    raw_perf /= 100
-                    formatted_perf = f"{raw_perf:.2f}m"
-                elif unit == "s":
-                    formatted_perf = f"{raw_perf:.2f}s"
-                elif unit == "min":
-                    minutes = int(raw_perf // 60)
-                    seconds = raw_perf % 60
-                    formatted_perf = f"{minutes}min{seconds:.2f}s"
-                else:
-                    formatted_perf = str(raw_perf)
-            else:
-                event_score = 0
-
-            cumulative_score += event_score
-            cumulative_by_athlete[name] = cumulative_score
-
-            if event == "110mH" or event == "100mH":
-                event = "110mH/100mH"
-            
-            event_scores_map[event].append(
-                (name, cumulative_score, event_score, formatted_perf, sexe)
-            )
-
-    for event in all_events_deca:
-        scores_this_event = event_scores_map.get(event, [])
-        if not scores_this_event:
-            continue
-
-        scores_this_event.sort(key=lambda x: -x[1])
-        
-        display_event = "110mH/100mH" if event == "110mH" else event
-
-        for rank, (name, cumulative_score, event_score, formatted_perf, sexe) in enumerate(scores_this_event, start=1):
+    for athlete in standings:
+        for result in athlete["results"]:
+            raw_perf = result["performance"]
             ranking_data.append({
-                "Event": display_event,
-                "Athlete": name,
-                "Rank": rank,
-                "Intermédiaire": cumulative_score,
-                "Score": event_score,
-                "Performance": formatted_perf,
-                "Sexe": sexe,
-                "Missing": event_score == 0,
+                "Event": result["slot"],
+                "Athlete": athlete["name"],
+                "Rank": result["rank"],
+                "Intermédiaire": result["cumulative"],
+                "Score": result["score"],
+                "Performance": format_performance(result["event"], raw_perf) if raw_perf is not None else "",
+                "Sexe": athlete["sexe"],
+                "Missing": result["missing"],
             })
 
-    return pd.DataFrame(ranking_data)
\ No newline at end of file
+    return pd.DataFrame(ranking_data)
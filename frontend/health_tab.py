@@ -1,18 +1,13 @@
 import streamlit as st
-from sqlmodel import Session, select
-import requests
+from api_client import api
 import pandas as pd
 from datetime import date, datetime, timedelta, time
-from backend.models.enumeration import Role
-from backend.models.user import User
 from backend.models.injury_ticket import InjuryType, BodyArea
 #from backend.database import engine
-from backend.database import engine_permanent, engine_season
 
 import locale
 locale.setlocale(locale.LC_TIME, 'fr_FR.UTF-8')
 
-API_URL = "http://localhost:8000"
 
 def health_tab():
     st.title("Santé")
@@ -35,7 +30,7 @@ def fetch_athletes():
     Fetch list of athletes from backend.
     """
     try:
-        response = requests.get(f"{API_URL}/athletes")
+        response = api.get("/athletes")
         if response.status_code == 200:
             return response.json()
         else:
@@ -65,7 +60,7 @@ def display_health_check():
     athlete_id = athlete_options[athlete_name]
 
     try:
-        response = requests.get(f"{API_URL}/health-checks/by-athlete/{athlete_id}")
+        response = api.get(f"/health-checks/by-athlete/{athlete_id}")
         if response.status_code == 200:
             data = response.json()
             df = pd.DataFrame(data)
@@ -234,8 +229,8 @@ def add_daily_health_check():
                 payload = {k: v for k, v in payload.items() if v is not None}
 
                 try:
-                    response = requests.post(
-                        f"{API_URL}/health-checks/",
+                    response = api.post(
+                        "/health-checks/",
                         json=payload
                     )
                     if response.status_code == 200:
@@ -251,9 +246,7 @@ def add_daily_health_check():
 # Physical issue + Followup
 def create_physical_issue():
     st.subheader("Créer un ticket de blessure")
-    with Session(engine_permanent) as session:
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
-    athlete_map = {a.name: a.id for a in athletes}
+    athlete_map = {a["name"]: a["id"] for a in fetch_athletes()}
     
     with st.form("new_issue_form", clear_on_submit=True):
         athlete_name = st.selectbox("Athlète", options=list(athlete_map.keys()))
@@ -274,7 +267,7 @@ def create_physical_issue():
                 "notes": notes or None,
                 "is_closed": False
             }
-            resp = requests.post(f"{API_URL}/issues/", json=payload)
+            resp = api.post("/issues/", json=payload)
             if resp.status_code == 200:
                 st.success("Ticket créé avec succès!")
             else:
@@ -282,16 +275,14 @@ def create_physical_issue():
 
 def add_followup():
     st.subheader("Ajouter un suivi de blessure")
-    with Session(engine_permanent) as session:
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
-    athlete_map = {a.name: a.id for a in athletes}
+    athlete_map = {a["name"]: a["id"] for a in fetch_athletes()}
     
     athlete_name = st.selectbox("Athlète", options=[""] + list(athlete_map.keys()))
     if not athlete_name:
         return
     
     athlete_id = athlete_map[athlete_name]
-    issues = requests.get(f"{API_URL}/athletes/{athlete_id}/issues/").json()
+    issues = api.get(f"/athletes/{athlete_id}/issues/").json()
     
     if not issues:
         st.info("Aucune blessure enregistrée pour cet.te athlète.")
@@ -304,7 +295,7 @@ def add_followup():
         return
     
     ticket_id = issue_map[issue_label]
-    followups = requests.get(f"{API_URL}/issues/{ticket_id}/followups/").json()
+    followups = api.get(f"/issues/{ticket_id}/followups/").json()
     used_dates = {f["date"] for f in followups}
     
     selected_issue = next(i for i in issues if i["id"] == ticket_id)
@@ -349,7 +340,7 @@ def add_followup():
                     "status_notes": notes or None,
                     "treatments_applied": treatments or None
                 }
-                resp = requests.post(f"{API_URL}/issues/{ticket_id}/followups/", json=payload)
+                resp = api.post(f"/issues/{ticket_id}/followups/", json=payload)
                 if resp.status_code == 200:
                     st.success("Suivi enregistré.")
                 else:
@@ -368,7 +359,7 @@ def display_issues():
         return
     
     athlete_id = athlete_map[athlete_name]
-    tickets = requests.get(f"{API_URL}/athletes/{athlete_id}/issues/").json()
+    tickets = api.get(f"/athletes/{athlete_id}/issues/").json()
     if not tickets:
         st.info("Aucune blessure enregistrée pour cet.te athlète.")
         return
@@ -390,7 +381,7 @@ def display_issues():
         **Informations générales:** {ticket.get('notes', '—')}
     """)
     
-    followups = requests.get(f"{API_URL}/issues/{ticket_id}/followups/").json()
+    followups = api.get(f"/issues/{ticket_id}/followups/").json()
     if not followups:
         st.info("Aucun suivi enregistré.")
         return
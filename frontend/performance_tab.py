@@ -1,16 +1,12 @@
 import streamlit as st
-from sqlmodel import Session, select
-import requests
+from api_client import api
 from datetime import date, datetime
-from backend.models.enumeration import Role, AthlePerf, AthlePerfNonMarked, MobilitePerf, VolleyPerf, MuscuPerf
-from backend.models.user import User
-from backend.models.performance import Performance, ConditionMeteo
+from backend.models.enumeration import AthlePerf, AthlePerfNonMarked, MobilitePerf, VolleyPerf, MuscuPerf
+from backend.models.performance import ConditionMeteo
 # from backend.database import engine
-from backend.database import engine_permanent, engine_season
 from helpers import *
 
 
-API_URL = "http://localhost:8000"
 
 # --- Mapping ---
 sport_disciplines = {
@@ -27,9 +23,8 @@ jumps = ['Longueur', 'Hauteur', 'Perche']
 races = ['60m', '60mH', '100m', '100mH', '110mH', '200m', '400m', '800m', '1000m', '1500m']
 events_athle = throws + jumps + races
 
-# --- Lists for performance sorting --- #
-disciplines_to_min = races + [a.value for a in AthlePerfNonMarked] + sport_disciplines['Volley-ball'] 
-disciplines_to_max = jumps + throws + ["Décathlon", "Heptathlon"] + sport_disciplines['Mobilité'] + muscu
+# --- Pagination --- #
+performances_per_page = 6
 
 # --- Units --- #
 unites = ["centimètres", "secondes", "points", "kg"]
@@ -49,238 +44,202 @@ def performance_tab():
     
 def display_performances():    
     st.subheader("Historique des performances")
-    with Session(engine_permanent) as session:
-        # --- Athlete selector --- 
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
-        
-        if not athletes:
-            st.warning("Aucun athlète trouvé. Veuillez d'abord créer un athlète.")
-            return
+    # --- Athlete selector --- 
+    athletes = api.get("/athletes").json()
+    
+    if not athletes:
+        st.warning("Aucun athlète trouvé. Veuillez d'abord créer un athlète.")
+        return
     
-        athlete_options = {f"{a.name}": a.id for a in athletes}
-        selected_athlete_label = st.selectbox("Sélectionnez un·e athlète", [""] + list(athlete_options.keys()), key="athlete_selectbox")
-        selected_athlete_id = athlete_options.get(selected_athlete_label)
+    athlete_options = {f"{a['name']}": a['id'] for a in athletes}
+    selected_athlete_label = st.selectbox("Sélectionnez un·e athlète", [""] + list(athlete_options.keys()), key="athlete_selectbox")
+    selected_athlete_id = athlete_options.get(selected_athlete_label)
+
+    if not selected_athlete_id:
+        st.info("Veuillez sélectionner un·e athlète pour afficher les performances.")
+        return
+
+    # --- Filtres courants (valeurs des widgets au rerun précédent) ---
+    sport_filter = st.session_state.get("sport_filter_selectbox", "Tous")
+    discipline_filter = st.session_state.get("discipline_filter_selectbox", "Toutes")
+    sort_options = {
+        "Plus Récent": "recent",
+        "Plus Ancien": "oldest",
+        "Meilleure Performance": "best",
+        "Pire Performance": "worst",
+    }
+    sort_by = st.session_state.get("sort_selectbox", "Plus Récent")
+
+    # Reset pagination if any filter changed
+    filters = (selected_athlete_id, sport_filter, discipline_filter, sort_by)
+    if st.session_state.get("performances_filters") != filters:
+        st.session_state["performances_filters"] = filters
+        st.session_state["performances_cursors"] = [None]
+    cursors = st.session_state["performances_cursors"]
+
+    # --- Filtrage, tri et pagination côté backend: seule la page affichée est transférée ---
+    params = {
+        "sport": None if sport_filter == "Tous" else sport_filter,
+        "discipline": None if discipline_filter == "Toutes" else discipline_filter,
+        "sort": sort_options[sort_by],
+        "limit": performances_per_page,
+        "cursor": cursors[-1],
+    }
+    # total et facettes ne changent pas d'une page à l'autre: demandés à la première page puis gardés
+    summary = st.session_state.get("performances_summary")
+    if cursors[-1] is not None and summary and summary[0] == filters:
+        params["summary"] = "false"
+    response = api.get(
+        f"/users/{selected_athlete_id}/performances",
+        params={k: v for k, v in params.items() if v is not None}
+    )
+    if response.status_code != 200:
+        st.error(f"Erreur lors de la récupération des performances: {response.text}")
+        return
+    result = response.json()
+    if result["total"] is None:
+        result.update(summary[1])
+    else:
+        st.session_state["performances_summary"] = (filters, {"total": result["total"], "facets": result["facets"]})
 
-        if not selected_athlete_id:
-            st.info("Veuillez sélectionner un·e athlète pour afficher les performances.")
-            return
+    if not result["facets"]:
+        st.info("Aucune performance n'a été trouvée pour cet athlète.")
+        return
 
-        # --- Get performances of the selected athlete ---
-        query = select(Performance).where(Performance.user_id == selected_athlete_id)
-        performances_ids = [r.id for r in session.exec(query).all()]
-        
-        if not performances_ids:
-            st.info("Aucune performance n'a été trouvée pour cet athlète.")
-            return
+    with st.expander("Filtres", expanded=True):
+        col1, col2 = st.columns(2)
         
-        base_query = select(Performance).where(Performance.id.in_(performances_ids))
-        all_perfs = session.exec(base_query).all()
-
-        with st.expander("Filtres", expanded=True):
-            col1, col2 = st.columns(2)
-            
-            # Save old filter values from session state
-            previous_sport = st.session_state.get("previous_sport_filter", "Tous")
-            previous_discipline = st.session_state.get("previous_discipline_filter", "Toutes")
-            
-            # --- Sport Filter ---
-            with col1:
-                sport_filter = st.selectbox("Sport", ["Tous"] + sorted({p.sport.value for p in all_perfs}), key="sport_filter_selectbox")
-
-            # Discipline Filter
-            with col2:
-                if sport_filter == "Tous":
-                    discipline_options = sorted({p.discipline for p in all_perfs})
-                else:
-                    discipline_options = sorted({p.discipline for p in all_perfs if p.sport.value == sport_filter})
-                discipline_filter = st.selectbox("Discipline", ["Toutes"] + discipline_options, key="discipline_filter_selectbox")
-            
-            # Filtre de tri par score
-            sort_by = "Plus Récent"
-            sort_by = st.selectbox(
-                "Trier",
-                ["Plus Récent", "Plus Ancien", "Meilleure Performance", "Pire Performance"],
-                key="sort_selectbox"
-            )
-            
-            # Detect change and reset page if needed
-            if (sport_filter != previous_sport or discipline_filter != previous_discipline):
-                st.session_state["current_page"] = 1
-
-            # Store new filter values for next run
-            st.session_state["previous_sport_filter"] = sport_filter
-            st.session_state["previous_discipline_filter"] = discipline_filter
-            
-        # --- Apply filters ---
-        query = select(Performance).where(Performance.user_id == selected_athlete_id)
-        if sport_filter != "Tous":
-            query = query.where(Performance.sport == sport_filter)
-        if discipline_filter != "Toutes":
-            query = query.where(Performance.discipline == discipline_filter)
-
-        all_perfs = session.exec(query).all()
+        # --- Sport Filter ---
+        with col1:
+            st.selectbox("Sport", ["Tous"] + sorted(result["facets"]), key="sport_filter_selectbox")
+
+        # Discipline Filter
+        with col2:
+            if sport_filter == "Tous":
+                discipline_options = sorted({d for disciplines in result["facets"].values() for d in disciplines})
+            else:
+                discipline_options = result["facets"].get(sport_filter, [])
+            st.selectbox("Discipline", ["Toutes"] + discipline_options, key="discipline_filter_selectbox")
         
-        # --- Calculate PBs ---
-        pbs_per_discipline = {}
-        discipline_groups = {}
-        for perf in all_perfs:
-            discipline_groups.setdefault(perf.discipline, []).append(perf)
+        # Filtre de tri par score
+        st.selectbox("Trier", list(sort_options.keys()), key="sort_selectbox")
+    
+    # --- Pagination ---
+    total_pages = (result["total"] - 1) // performances_per_page + 1 if result["total"] else 1
+    current_page = len(cursors)
+    
+    if total_pages > 1:
+        st.markdown("---")
         
-        for discipline, perfs in discipline_groups.items():
-            valid_perfs = [p for p in perfs if p.performance is not None]
-            if not valid_perfs:
-                continue
-            
-            if discipline in disciplines_to_min:
-                best_perf = min(valid_perfs, key=lambda p: p.performance)
-            elif discipline in disciplines_to_max:
-                best_perf = max(valid_perfs, key=lambda p: p.performance)
-            
-            pbs_per_discipline[discipline] = best_perf.performance
+    headers = f"""
+        <div style="
+            margin: 5px;
+        ">
+            <table style="width: 94%; border-collapse: collapse;">
+                <tr>
+                    <td style="padding: 4px; width: 8%;"><center><b>Date</b></center></td>
+                    <td style="padding: 4px; width: 8%;"><center><b>Discipline</b></center></td>
+                    <td style="padding: 4px; width: 12%;"><center><b>Performance</b></center></td>
+                    <td style="padding: 4px; width: 8%;"><center><b>Score</b></center></td>
+                    <td style="padding: 4px; width: 12%;"><center><b>Météo</b></center></td>
+                    <td style="padding: 4px; width: 16%;"><center><b>Remarques Techniques</b></center></td>
+                    <td style="padding: 4px; width: 16%;"><center><b>Remarques Physiques</b></center></td>
+                    <td style="padding: 4px; width: 16%;"><center><b>Remarques Mentales</b></center></td>
+                </tr>
+            </table>
+        </div>
+    """
+    st.markdown(headers, unsafe_allow_html=True)
+
+    st.markdown("---")
+    
+    # Performances rows
+    for perf_ in result["items"]:
+        # PB flag computed by the backend
+        is_pb = perf_["is_pb"]
+        pb_icon = "<br><span style='color:gold;'>🏅<b>PB</b></span>" if is_pb else ""
+
+        if is_pb:
+            # PB row design
+            row_html = f"""
+                        <div style="
+                            background-color: #fff2cc;
+                            border: 2px solid gold;
+                            border-radius: 6px;
+                            margin: 5px;
+                            opacity: 0.9;
+                            color: black;
+                        ">"""
+                    
+        else:
+            # Normal row rendering for non-PB
+            row_html = f"""
+                        <div style="
+                            border: none;
+                            border-radius: 6px;
+                            margin: 5px;
+                            opacity: 0.9;
+                            color: white;
+                        ">"""
+        if perf_["discipline"] == "Décathlon":
+            color_score = deca_score_color(perf_["score"])
+        elif perf_["discipline"] == "Heptathlon":
+            color_score = hepta_score_color(perf_["score"])
+        else:
+            color_score = score_color(perf_["score"])
+        row_html += f"""
+                        <table style="width: 100%; border-collapse: collapse;">
+                            <tr>
+                                <td style="padding: 4px; width: 8%;">{perf_["date"]}</td>
+                                <td style="padding: 4px; width: 8%;"><center>{perf_["discipline"]}</center></td>
+                                <td style="padding: 4px; width: 12%;"><center>{perf_["performance"]} {perf_["unit"]}{pb_icon}</center></td>
+                                <td style="padding: 4px; width: 8%; color:{color_score}; font-weight:bold; background: white; text-align:center; border-radius:8px; opacity: 0.8;">{perf_["score"] or 0}</td>
+                                <td style="padding: 4px; width: 12%;"><center>{perf_["meteo"]} ({perf_["temperature"]}°C)</center></td>
+                                <td style="padding: 4px; width: 16%;">{clip_text(perf_["technical_cues"], 100)}</td>
+                                <td style="padding: 4px; width: 16%;">{clip_text(perf_["physical_cues"], 100)}</td>
+                                <td style="padding: 4px; width: 16%;">{clip_text(perf_["mental_cues"], 100)}</td>
+                            </tr>
+                        </table>
+                    </div>
+                """
+
+        row_cols = st.columns([19, 1])
+        with row_cols[0]:
+            st.markdown(row_html, unsafe_allow_html=True)
         
-        # Trier les perfs
-        if sort_by == "Plus Récent":
-            all_perfs.sort(key=lambda p: p.date or datetime.min, reverse=True)
-        elif sort_by == "Plus Ancien":
-            all_perfs.sort(key=lambda p: p.date or datetime.min)
-        elif sort_by == "Meilleure Performance":
-            all_perfs.sort(
-                key=lambda p: (
-                    -(p.performance or 0) if p.discipline in disciplines_to_max else (float(p.performance) or float("inf"))
-                )
+        with row_cols[1]:
+            st.markdown(
+                """
+                <div style="display: flex; align-items: center; justify-content: center; height: 100%;">
+                """,
+                unsafe_allow_html=True,
             )
-        elif sort_by == "Pire Performance":
-            all_perfs.sort(
-                key=lambda p: (
-                    (p.performance or 0) if p.discipline in disciplines_to_max else -(float(p.performance) or 0)
+            if st.button("🗑️", key=f"delete_{perf_['id']}"):
+                response = api.post(
+                    "/performances/delete",
+                    data={"performance_id": perf_["id"]}
                 )
-            )
-        
-        # --- Pagination ---
-        performances_per_page = 6
-        total_pages = (len(all_perfs) - 1) // performances_per_page + 1 if all_perfs else 1
-        current_page = st.session_state.get("current_page", 1)
-        
-        if total_pages > 1:
-            st.markdown("---")
-        
-        start_idx = (current_page - 1) * performances_per_page
-        end_idx = start_idx + performances_per_page
-        performances_to_show = all_perfs[start_idx:end_idx]
-            
-        headers = f"""
-            <div style="
-                margin: 5px;
-            ">
-                <table style="width: 94%; border-collapse: collapse;">
-                    <tr>
-                        <td style="padding: 4px; width: 8%;"><center><b>Date</b></center></td>
-                        <td style="padding: 4px; width: 8%;"><center><b>Discipline</b></center></td>
-                        <td style="padding: 4px; width: 12%;"><center><b>Performance</b></center></td>
-                        <td style="padding: 4px; width: 8%;"><center><b>Score</b></center></td>
-                        <td style="padding: 4px; width: 12%;"><center><b>Météo</b></center></td>
-                        <td style="padding: 4px; width: 16%;"><center><b>Remarques Techniques</b></center></td>
-                        <td style="padding: 4px; width: 16%;"><center><b>Remarques Physiques</b></center></td>
-                        <td style="padding: 4px; width: 16%;"><center><b>Remarques Mentales</b></center></td>
-                    </tr>
-                </table>
-            </div>
-        """
-        st.markdown(headers, unsafe_allow_html=True)
-
-        st.markdown("---")
-        
-        # Performances rows
-        for perf_ in performances_to_show:
-            # Check if PB
-            is_pb = False
-            pb_icon = ""
-            pb_value = pbs_per_discipline.get(perf_.discipline)
-            if pb_value is not None and perf_.performance == pb_value:
-                is_pb = True
-                pb_icon = "<br><span style='color:gold;'>🏅<b>PB</b></span>"
-
-            if is_pb:
-                # PB row design
-                row_html = f"""
-                            <div style="
-                                background-color: #fff2cc;
-                                border: 2px solid gold;
-                                border-radius: 6px;
-                                margin: 5px;
-                                opacity: 0.9;
-                                color: black;
-                            ">"""
-                        
-            else:
-                # Normal row rendering for non-PB
-                row_html = f"""
-                            <div style="
-                                border: none;
-                                border-radius: 6px;
-                                margin: 5px;
-                                opacity: 0.9;
-                                color: white;
-                            ">"""
-            if perf_.discipline == "Décathlon":
-                color_score = deca_score_color(perf_.score)
-            elif perf_.discipline == "Heptathlon":
-                color_score = hepta_score_color(perf_.score)
-            else:
-                color_score = score_color(perf_.score)
-            row_html += f"""
-                            <table style="width: 100%; border-collapse: collapse;">
-                                <tr>
-                                    <td style="padding: 4px; width: 8%;">{perf_.date}</td>
-                                    <td style="padding: 4px; width: 8%;"><center>{perf_.discipline}</center></td>
-                                    <td style="padding: 4px; width: 12%;"><center>{perf_.performance} {perf_.unit}{pb_icon}</center></td>
-                                    <td style="padding: 4px; width: 8%; color:{color_score}; font-weight:bold; background: white; text-align:center; border-radius:8px; opacity: 0.8;">{perf_.score or 0}</td>
-                                    <td style="padding: 4px; width: 12%;"><center>{perf_.meteo.value} ({perf_.temperature}°C)</center></td>
-                                    <td style="padding: 4px; width: 16%;">{clip_text(perf_.technical_cues, 100)}</td>
-                                    <td style="padding: 4px; width: 16%;">{clip_text(perf_.physical_cues, 100)}</td>
-                                    <td style="padding: 4px; width: 16%;">{clip_text(perf_.mental_cues, 100)}</td>
-                                </tr>
-                            </table>
-                        </div>
-                    """
-
-            row_cols = st.columns([19, 1])
-            with row_cols[0]:
-                st.markdown(row_html, unsafe_allow_html=True)
-            
-            with row_cols[1]:
-                st.markdown(
-                    """
-                    <div style="display: flex; align-items: center; justify-content: center; height: 100%;">
-                    """,
-                    unsafe_allow_html=True,
-                )
-                if st.button("🗑️", key=f"delete_{perf_.id}"):
-                    response = requests.post(
-                        f"{API_URL}/performances/delete",
-                        data={"performance_id": perf_.id}
-                    )
-                    if response.status_code == 200:
-                        st.success("Performance supprimée.")
-                        st.rerun()
-                    else:
-                        st.error(f"Erreur lors de la suppression: {response.text}")
-                st.markdown("</div>", unsafe_allow_html=True)
+                if response.status_code == 200:
+                    st.success("Performance supprimée.")
+                    st.rerun()
+                else:
+                    st.error(f"Erreur lors de la suppression: {response.text}")
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    # --- Pagination control (previous/next, the backend paginates by cursor) ---
+    if total_pages > 1:
+        st.write(f"Page {current_page} sur {total_pages}")
+
+        _, prev_col, next_col, _ = st.columns([2, 1, 1, 2])
+        with prev_col:
+            if current_page > 1 and st.button("Précédent", key="performances_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with next_col:
+            if result["next_cursor"] and st.button("Suivant", key="performances_next_page"):
+                cursors.append(result["next_cursor"])
+                st.rerun()
 
-        # --- Pagination control ---
-        if total_pages > 1:
-            st.write(f"Page {current_page} sur {total_pages}")
-            
-            _, center_col, _ = st.columns([1, 1, 1])
-            with center_col:
-                cols = st.columns(total_pages)
-                for i in range(total_pages):
-                    page_num = i + 1
-                    
-                    button_label = f"**{page_num}**" if page_num == current_page else str(page_num)
-                    if cols[i].button(button_label, key=f"page_button_{page_num}"):
-                        st.session_state["current_page"] = page_num
-                        
 def hungarian_table():
     st.subheader("Table des points Décathlon")
 
@@ -314,24 +273,38 @@ def hungarian_table():
             "sex": sexe,
             "perf": performance
         }
-        response = requests.post("http://localhost:8000/compute_hungarian_score/", json=payload)
+        response = api.post("/compute_hungarian_score/", json=payload)
 
         if response.status_code == 200:
             st.success(f"Score: {response.json()['score']}")
         else:
             st.error(f"Erreur: {response.json()['detail']}")
 
+    # Recherche inverse: performance minimale pour un nombre de points
+    target_points = st.number_input("Points visés", min_value=0, max_value=1500, value=800, step=10)
+    if st.button("Calculer la performance nécessaire"):
+        response = api.get(
+            "/points_table/mark",
+            params={"event": discipline, "sex": sexe, "points": target_points}
+        )
+
+        if response.status_code == 200:
+            result = response.json()
+            unit = "s" if discipline in races else "cm"
+            st.success(f"Performance nécessaire: {result['mark']:g} {unit} ({result['mark_points']} pts)")
+        else:
+            st.error(f"Erreur: {response.json()['detail']}")
+
 def add_performance():
     # Enregistrer nouvelles performances
     st.subheader("Ajouter une performance")
     
-    with Session(engine_permanent) as session:
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
+    athletes = api.get("/athletes").json()
 
     selected_sport = st.selectbox("Sport", list(sport_disciplines.keys()), key="sport_selector")
     selected_discipline = st.selectbox("Discipline", sport_disciplines.get(selected_sport, []), key="discipline_selector")
     with st.form("add_performance"):
-        selected_athlete = st.selectbox("Athlète", athletes, format_func=lambda a: a.name)
+        selected_athlete = st.selectbox("Athlète", athletes, format_func=lambda a: a["name"])
         
         perf_date = st.date_input("Date", value=date.today())
         perf_mark = st.text_input("Performance")
@@ -348,7 +321,7 @@ def add_performance():
             if not selected_athlete:
                 st.warning("Veuillez sélectionner au moins un atlhète.")
                 return
-            sex = selected_athlete.sexe.value
+            sex = selected_athlete["sexe"]
             
             if selected_discipline in ["Décathlon", "Heptathlon"]:
                 score = perf_mark
@@ -361,8 +334,8 @@ def add_performance():
                 }
 
                 try:
-                    score_response = requests.post(
-                        f"{API_URL}/compute_hungarian_score/",
+                    score_response = api.post(
+                        "/compute_hungarian_score/",
                         json=score_payload
                     )
                     if score_response.status_code == 200:
@@ -379,7 +352,7 @@ def add_performance():
             
             
             payload = {
-                "user_id": selected_athlete.id,
+                "user_id": selected_athlete["id"],
                 "date": str(perf_date),
                 "sport": selected_sport,
                 "discipline": selected_discipline,
@@ -392,7 +365,7 @@ def add_performance():
                 "physical_cues": physique,
                 "mental_cues": mental,
             }
-            resp = requests.post(f"{API_URL}/performances/", json=payload)
+            resp = api.post("/performances/", json=payload)
             if resp.status_code == 200:
                 st.success("Performance enregistrée !")
                 st.info(f"Score calculé : {score}")
@@ -1,8 +1,19 @@
 import streamlit as st
-
-API_URL = "http://localhost:8000"
+import pandas as pd
+from api_client import api
 
 def settings():
     st.title("Paramètres")
 
-    st.info("Cette page est en cours de construction.")
\ No newline at end of file
+    st.info("Cette page est en cours de construction.")
+
+    # --- Appels à l'API depuis le démarrage du frontend ---
+    st.subheader("Requêtes API")
+    stats = api.stats()
+    if not stats:
+        st.caption("Aucune requête pour l'instant.")
+        return
+    st.dataframe(pd.DataFrame(stats), hide_index=True, use_container_width=True)
+    if st.button("Vider le cache"):
+        api.invalidate()
+        st.rerun()
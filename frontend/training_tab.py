@@ -1,18 +1,14 @@
 import streamlit as st
-from sqlmodel import Session, select
 import uuid
 import sys
 import pathlib
-import requests
+from api_client import api
 from helpers import *
 
 sys.path.append(str(pathlib.Path(__file__).parent.parent))
-API_URL = "http://127.0.0.1:8000"
+sessions_per_page = 6
 
-from backend.database import engine_permanent, engine_season
-from backend.models.user import User
 from backend.models.enumeration import Role, Sport, AthleTrainings, MuscuTrainings, VolleyTrainings, DiversTrainings, MobiliteTrainings
-from backend.models.training import TrainingSession, UserTrainingLinks, CoachTrainingLinks
 from datetime import date, timedelta
 
 def training_tab():
@@ -24,192 +20,161 @@ def training_tab():
 def display_trainings():
     st.subheader("Historique des entraînements")
 
-    with Session(engine_permanent) as session:
-        # --- Select Athlete ---
-        athletes = session.exec(select(User).where(User.role == Role.Athlete)).all()
-        
-        if not athletes:
-            st.warning("Aucun athlète trouvé. Veuillez d'abord créer un athlète.")
-            return
-        
-        athlete_options = {f"{a.name}": a.id for a in athletes}
-        selected_name = st.selectbox("Sélectionner un athlète", options= [""] + list(athlete_options.keys()))
-        athlete_id = athlete_options.get(selected_name)
-        
-        if not athlete_id:
-            st.info("Veuillez sélectionner un.e athlète pour afficher ses entraînements.")
-            return
+    # --- Select Athlete ---
+    athletes = api.get("/athletes").json()
+    
+    if not athletes:
+        st.warning("Aucun athlète trouvé. Veuillez d'abord créer un athlète.")
+        return
+    
+    athlete_options = {f"{a['name']}": a['id'] for a in athletes}
+    selected_name = st.selectbox("Sélectionner un athlète", options= [""] + list(athlete_options.keys()))
+    athlete_id = athlete_options.get(selected_name)
+    
+    if not athlete_id:
+        st.info("Veuillez sélectionner un.e athlète pour afficher ses entraînements.")
+        return
 
-    with Session(engine_season) as session:
-        # --- Get all training sessions linked to this athlete ---
-        link_query = select(UserTrainingLinks.training_id).where(UserTrainingLinks.user_id == athlete_id)
-        training_ids = [r for r in session.exec(link_query).all()]
+    # --- Filtres courants (valeurs des widgets au rerun précédent) ---
+    selected_sport = st.session_state.get("trainings_sport")
+    selected_type = st.session_state.get("trainings_type", "Tous")
+    min_intensity, max_intensity = st.session_state.get("trainings_intensity", (1, 10))
+    min_duration, max_duration = st.session_state.get("trainings_duration", (5, 240))
+    start_date = st.session_state.get("trainings_start_date")
+    end_date = st.session_state.get("trainings_end_date")
+    sort_options = {
+        "Plus Récente": "date",
+        "Plus Intense": "intensity",
+        "Plus Longue": "duration",
+    }
+    selected_sort = st.session_state.get("trainings_sort", "Plus Récente")
 
-        if not training_ids:
-            st.info("Aucun entraînement trouvé pour cet athlète.")
-            return
+    # Reset pagination if any filter changed
+    filters = (athlete_id, selected_sport, selected_type, min_intensity, max_intensity,
+               min_duration, max_duration, start_date, end_date, selected_sort)
+    if st.session_state.get("trainings_filters") != filters:
+        st.session_state["trainings_filters"] = filters
+        st.session_state["trainings_cursors"] = [None]
+    cursors = st.session_state["trainings_cursors"]
 
-        # --- Base query ---
-        base_query = select(TrainingSession).where(TrainingSession.id.in_(training_ids))
-        all_sessions = session.exec(base_query).all()
-        
-        # --- Build Filters ---
-        with st.expander("Filtres", expanded=True):
-            col1, col2, col3 = st.columns(3)
-            
-            # Save previous filter values
-            previous_sport = st.session_state.get("selected_sport")
-            previous_type = st.session_state.get("selected_type")
-            previous_min_intensity = st.session_state.get("min_intensity")
-            previous_max_intensity = st.session_state.get("max_intensity")
-            previous_min_duration = st.session_state.get("min_duration")
-            previous_max_duration = st.session_state.get("max_duration")
-            previous_start_date = st.session_state.get("start_date")
-            previous_end_date = st.session_state.get("end_date")
-            previous_sort_by = st.session_state.get("selected_sort")
-            
-            # Sport filter
-            with col1:
-                selected_sport = st.selectbox(
-                    "Sport",
-                    options=[None] + list(Sport),
-                    format_func=lambda x: x.value if x else "Tous sports"
-                )
+    # --- Filtrage, tri et pagination côté backend: seule la page affichée est transférée ---
+    params = {
+        "user_id": athlete_id,
+        "type": None if selected_type == "Tous" else selected_type,
+        "sport": selected_sport.value if selected_sport else None,
+        "min_intensity": min_intensity,
+        "max_intensity": max_intensity,
+        "min_duration": min_duration,
+        "max_duration": max_duration,
+        "start_date": start_date,
+        "end_date": end_date,
+        "sort": sort_options[selected_sort],
+        "limit": sessions_per_page,
+        "cursor": cursors[-1],
+    }
+    response = api.get("/trainings/search", params={k: v for k, v in params.items() if v is not None})
+    if response.status_code != 200:
+        st.error(f"Erreur lors de la récupération des entraînements: {response.text}")
+        return
+    result = response.json()
 
-            # Filter training sessions by selected sport
-            filtered_sessions = [s for s in all_sessions if (not selected_sport or s.sport == selected_sport)]
+    if not result["facets"]:
+        st.info("Aucun entraînement trouvé pour cet athlète.")
+        return
 
-            # Training types available for this sport only
-            available_types = sorted(set(s.type for s in filtered_sessions))
-            with col2:
-                selected_type = st.selectbox(
-                    "Type d'entraînement",
-                    options=["Tous"] + available_types
-                )
+    # --- Build Filters ---
+    with st.expander("Filtres", expanded=True):
+        col1, col2, col3 = st.columns(3)
+        
+        # Sport filter
+        with col1:
+            st.selectbox(
+                "Sport",
+                options=[None] + list(Sport),
+                format_func=lambda x: x.value if x else "Tous sports",
+                key="trainings_sport",
+            )
 
-            # Intensity range
-            with col3:
-                min_intensity, max_intensity = st.slider(
-                    "Intensité", 1, 10, (1, 10)
-                )
+        # Training types available for this sport only
+        if selected_sport:
+            available_types = result["facets"].get(selected_sport.value, [])
+        else:
+            available_types = sorted(set(t for types in result["facets"].values() for t in types))
+        with col2:
+            st.selectbox(
+                "Type d'entraînement",
+                options=["Tous"] + available_types,
+                key="trainings_type",
+            )
 
-            col4, col5, col6 = st.columns(3)
+        # Intensity range
+        with col3:
+            st.slider("Intensité", 1, 10, (1, 10), key="trainings_intensity")
 
-            # Date range
-            all_dates = [s.date for s in all_sessions]
-            default_start = min(all_dates) if all_dates else date.today()
-            default_end = max(all_dates) if all_dates else date.today()
+        col4, col5, col6 = st.columns(3)
 
-            with col4:
-                start_date = st.date_input("Date de début", value=default_start)
+        # Date range
+        default_start = date.fromisoformat(result["date_min"]) if result["date_min"] else date.today()
+        default_end = date.fromisoformat(result["date_max"]) if result["date_max"] else date.today()
 
-            with col5:
-                end_date = st.date_input("Date de fin", value=default_end)
-            
-            # Duration range
-            with col6:
-                min_duration, max_duration = st.slider(
-                    "Durée (min)", 5, 240, (5, 240), step=5
-                )
-            
-            with st.container():
-                sort_options = {
-                    "Plus Récente": lambda s: s.date,
-                    "Plus Intense": lambda s: s.intensity,
-                    "Plus Longue": lambda s: s.duration_minutes,
-                }
-                selected_sort = st.selectbox("Trier les entraînements par", options=list(sort_options.keys()))
-                reverse_sort = True
-            
-                
-            # Detect change and reset page if needed
-            if (selected_sport != previous_sport
-                or selected_type != previous_type
-                or min_intensity != previous_min_intensity
-                or max_intensity != previous_max_intensity
-                or min_duration != previous_min_duration
-                or max_duration != previous_max_duration
-                or start_date != previous_start_date
-                or end_date != previous_end_date
-                or selected_sort != previous_sort_by
-                ):
-                st.session_state["current_page"] = 1
-            
-            # Store new filter values for next run
-            st.session_state["selected_sport"] = selected_sport
-            st.session_state["selected_type"] = selected_type
-            st.session_state["min_intensity"] = min_intensity
-            st.session_state["max_intensity"] = max_intensity
-            st.session_state["min_duration"] = min_duration
-            st.session_state["max_duration"] = max_duration
-            st.session_state["start_date"] = start_date
-            st.session_state["end_date"] = end_date
-            st.session_state["selected_sort"] = selected_sort
+        with col4:
+            st.date_input("Date de début", value=default_start, key="trainings_start_date")
 
-        # --- Apply filters ---
-        final_sessions = [
-            s for s in filtered_sessions
-            if (selected_type == "Tous" or s.type == selected_type)
-            and (min_intensity <= s.intensity <= max_intensity)
-            and (min_duration <= s.duration_minutes <= max_duration)
-            and (start_date <= s.date <= end_date)
-        ]
+        with col5:
+            st.date_input("Date de fin", value=default_end, key="trainings_end_date")
         
-        # --- Sort Sessions ---
-        sort_key = sort_options[selected_sort]
-        final_sessions.sort(key=sort_key, reverse=reverse_sort)
+        # Duration range
+        with col6:
+            st.slider("Durée (min)", 5, 240, (5, 240), step=5, key="trainings_duration")
+        
+        with st.container():
+            st.selectbox("Trier les entraînements par", options=list(sort_options.keys()), key="trainings_sort")
 
-        # --- Pagination ---
-        sessions_per_page = 6
-        total_pages = (len(final_sessions) - 1) // sessions_per_page + 1 if final_sessions else 1
-        current_page = st.session_state.get("current_page", 1)
+    # --- Pagination ---
+    total_pages = (result["total"] - 1) // sessions_per_page + 1 if result["total"] else 1
+    current_page = len(cursors)
 
-        if total_pages > 1:
-            st.markdown("---")
+    if total_pages > 1:
+        st.markdown("---")
 
-        # Display trainings
-        start_idx = (current_page - 1) * sessions_per_page
-        end_idx = start_idx + sessions_per_page
-        sessions_to_show = final_sessions[start_idx:end_idx]
-        
-        # Headers row
-        cols = st.columns([1, 1, 1, 1, 1, 2])  # width ratios
-        headers = ["Date", "Type", "Sport", "Durée", "Intensité", "Notes"]
-        for col, header in zip(cols, headers):
-            col.markdown(f"**{header}**")
-        st.markdown("---")  # separator below header# Rows: each training session
-        
-        # Training session rows
-        for session_ in sessions_to_show:
-            cols = st.columns([1, 1, 1, 1, 1, 2])
-            cols[0].write(session_.date)
-            cols[1].write(session_.type)
-            cols[2].write(session_.sport.value)
-            color_d = duration_color(session_.duration_minutes)
-            cols[3].markdown(
-                f'<span style="color:{color_d}; font-weight:bold;">{session_.duration_minutes} minutes</span>',
-                unsafe_allow_html=True,
-            )
-            color_i = intensity_color(session_.intensity)
-            cols[4].markdown(
-                f'<span style="color:{color_i}; font-weight:bold;">{session_.intensity}/10</span>',
-                unsafe_allow_html=True,
-            )
-            cols[5].write(clip_text(session_.notes, 100))
-        
-        # --- Pagination control with numbered buttons (bottom only) ---
-        if total_pages > 1:
-            st.write(f"Page {current_page} sur {total_pages}")
+    # Headers row
+    cols = st.columns([1, 1, 1, 1, 1, 2])  # width ratios
+    headers = ["Date", "Type", "Sport", "Durée", "Intensité", "Notes"]
+    for col, header in zip(cols, headers):
+        col.markdown(f"**{header}**")
+    st.markdown("---")  # separator below header# Rows: each training session
+    
+    # Training session rows
+    for session_ in result["items"]:
+        cols = st.columns([1, 1, 1, 1, 1, 2])
+        cols[0].write(session_["date"])
+        cols[1].write(session_["type"])
+        cols[2].write(session_["sport"])
+        color_d = duration_color(session_["duration_minutes"] or 0)
+        cols[3].markdown(
+            f'<span style="color:{color_d}; font-weight:bold;">{session_["duration_minutes"]} minutes</span>',
+            unsafe_allow_html=True,
+        )
+        color_i = intensity_color(session_["intensity"])
+        cols[4].markdown(
+            f'<span style="color:{color_i}; font-weight:bold;">{session_["intensity"]}/10</span>',
+            unsafe_allow_html=True,
+        )
+        cols[5].write(clip_text(session_["notes"], 100))
+    
+    # --- Pagination control (previous/next, the backend paginates by cursor) ---
+    if total_pages > 1:
+        st.write(f"Page {current_page} sur {total_pages}")
 
-            _, center_col, _ = st.columns([1, 1, 1])
-            with center_col:
-                cols = st.columns(total_pages)
-                for i in range(total_pages):
-                    page_num = i + 1
-                    # Highlight the button of current page
-                    button_label = f"**{page_num}**" if page_num == current_page else str(page_num)
-                    if cols[i].button(button_label, key=f"page_button_{page_num}"):
-                        st.session_state["current_page"] = page_num
+        _, prev_col, next_col, _ = st.columns([2, 1, 1, 2])
+        with prev_col:
+            if current_page > 1 and st.button("Précédent", key="trainings_prev_page"):
+                cursors.pop()
+                st.rerun()
+        with next_col:
+            if result["next_cursor"] and st.button("Suivant", key="trainings_next_page"):
+                cursors.append(result["next_cursor"])
+                st.rerun()
 
 def add_training_session():
     st.subheader("Créer un entraînement")
@@ -227,16 +192,15 @@ def add_training_session():
     #sport = st.selectbox("Sport", options=list(Sport), format_func=lambda x: x.value, index=0)
     sport = st.selectbox("Sport", options=session_types.keys())
         
-    with Session(engine_permanent) as session_perm:
-        # Récup tous les athlètes
-        athletes = session_perm.exec(select(User).where(User.role == Role.Athlete)).all()
-        
-        # Récup tous les coachs
-        coaches = session_perm.exec(select(User).where(User.role == Role.Coach)).all()
+    # Récup tous les athlètes
+    athletes = api.get("/athletes").json()
+    
+    # Récup tous les coachs
+    coaches = [u for u in api.get("/users/").json() if u["role"] == Role.Coach.value]
         
-    athlete_options = {f"{a.name}": a.id for a in athletes}
+    athlete_options = {f"{a['name']}": a['id'] for a in athletes}
     selected_names = st.multiselect("Sélectionner des athlètes", options=list(athlete_options.keys()))
-    coach_mapping = {f"{c.name} ({c.sport.value})": c.id for c in coaches}
+    coach_mapping = {f"{c['name']} ({c['sport']})": c['id'] for c in coaches}
     coach_display_options = ["Aucun"] + list(coach_mapping.keys())
     selected_coach = st.selectbox("Désigner un coach", options=coach_display_options)
     
@@ -253,44 +217,30 @@ def add_training_session():
             st.warning("Veuillez sélectionner au moins un atlhète.")
             return
             
-        with Session(engine_season) as session_season:
-            if not sport:
-                st.warning("Veuillez sélectionner un sport.")
+        if not sport:
+            st.warning("Veuillez sélectionner un sport.")
 
-            # pas besoin de faire pareil avec les coach pcq coach n'est pas obligatoire
-            else:
-                new_session = TrainingSession(
-                    sport=sport,
-                    type=session_type,
-                    duration_minutes=duration,
-                    date=training_date,
-                    intensity=intensity,
-                    notes=notes,
-                    coach_id = None if selected_coach == "Aucun" else coach_mapping[selected_coach]
-                )
-                session_season.add(new_session)
-                session_season.flush()
-
-                # Link selected athletes
-                for name in selected_names:
-                    athlete_id = athlete_options[name]
-                    link = UserTrainingLinks(
-                        user_id=athlete_id,
-                        training_id=new_session.id,
-                    )
-                    session_season.add(link)
-                
-                # Link selected coaches
-                if selected_coach != "Aucun":
-                    coach_id = coach_mapping[selected_coach]
-                    link = CoachTrainingLinks(
-                        coach_id=coach_id,
-                        training_id=new_session.id,
-                    )
-                    session_season.add(link)
-
-                session_season.commit()
+        # pas besoin de faire pareil avec les coach pcq coach n'est pas obligatoire
+        else:
+            coach_id = None if selected_coach == "Aucun" else coach_mapping[selected_coach]
+            # séance, liens athlètes et coach créés par l'API (une transaction, caches invalidés)
+            response = api.post("/trainings/", json={
+                "training": {
+                    "sport": sport,
+                    "type": session_type,
+                    "duration_minutes": duration,
+                    "date": str(training_date),
+                    "intensity": intensity,
+                    "notes": notes,
+                    "coach_id": coach_id,
+                },
+                "athlete_ids": [athlete_options[name] for name in selected_names],
+                "coach_ids": [] if coach_id is None else [coach_id],
+            })
+            if response.status_code == 200:
                 st.success(f"Entraînement créé et lié à {len(selected_names)} athlète(s).")
+            else:
+                st.error(f"Erreur: {response.json().get('detail')}")
 
 def edit_training_session():
     st.title("Modifier un entraînement")
@@ -1,8 +1,7 @@
 # frontend/app.py
 import streamlit as st
-import requests
+from api_client import api
 
-API_URL = "http://127.0.0.1:8000"
 
 def user_tab():
     st.title("Athlete Monitoring System")
@@ -41,7 +40,7 @@ def add_user():
                 "age": age,
                 "sexe": sexe,
             }
-            response = requests.post(f"{API_URL}/users/", json=payload)
+            response = api.post("/users/", json=payload)
 
             if response.status_code == 200:
                 st.success("Utilisateur ajouté!")
@@ -51,7 +50,7 @@ def add_user():
 def display_and_modify_user():
     st.subheader("Utilisateurs actuels")
 
-    response = requests.get(f"{API_URL}/users/")
+    response = api.get("/users/")
     if response.status_code == 200:
         users = response.json()
         for user in users:
@@ -63,10 +62,9 @@ def display_and_modify_user():
 
                 # --- Delete button ---
                 if st.button("Supprimer", key=f"delete_{user['id']}"):
-                    delete_response = requests.delete(f"{API_URL}/users/{user['id']}")
+                    delete_response = api.delete(f"/users/{user['id']}")
                     if delete_response.status_code == 200:
                         st.success("Suppression réussie.")
-                        st.cache_data.clear()
                         st.rerun()
                     else:
                         st.error("Échec de la suppression.")
@@ -105,10 +103,9 @@ def update_user(user):
                 "age": new_age,
                 "sexe": new_sexe,
             }
-            update_response = requests.put(f"{API_URL}/users/{user['id']}", json=update_payload)
+            update_response = api.put(f"/users/{user['id']}", json=update_payload)
             if update_response.status_code == 200:
                 st.success("Mise à jour réussie.")
-                st.cache_data.clear()
                 st.rerun()
             else:
                 st.error("Mise à jour échouée.")
\ No newline at end of file
@@ -0,0 +1,67 @@
+# Nombre de requêtes SQL par appel constant, quel que soit le nombre de séances de l'athlète (pas de N+1)
+from contextlib import contextmanager
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # les bases sont dans backend/data, relatif au répertoire courant: on travaille dans un dossier temporaire
+    root = tmp_path_factory.mktemp("openams")
+    (root / "backend" / "data").mkdir(parents=True)
+    (root / "frontend").symlink_to(Path(__file__).resolve().parents[1] / "frontend")  # fichiers statiques montés par l'app
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(root)
+        from fastapi.testclient import TestClient
+        from backend.main import app
+        with TestClient(app) as client:
+            yield client
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(Engine, "before_cursor_execute", record)
+
+
+def create_athlete(client, name, sessions):
+    user = client.post("/users/", json={"name": name, "role": "Athlète", "sport": "Athlétisme", "age": 20, "sexe": "M"}).json()
+    for day in range(sessions):
+        training = {"sport": "Athlétisme", "type": "PPG", "duration_minutes": 60,
+                    "date": (date(2025, 10, 1) + timedelta(days=day)).isoformat(), "intensity": 5}
+        response = client.post("/trainings/", json={"training": training, "athlete_ids": [user["id"]]})
+        assert response.status_code == 200
+    return user["id"]
+
+
+def test_training_reads_run_constant_number_of_queries(client):
+    one = create_athlete(client, "Une séance", 1)
+    many = create_athlete(client, "Dix séances", 10)
+
+    for path, params in [
+        ("/users/{}/trainings", {}),
+        ("/training_data", {"start_date": "2025-01-01", "end_date": "2026-01-01"}),
+    ]:
+        counts = {}
+        for user_id, expected in [(one, 1), (many, 10)]:
+            url = path.format(user_id)
+            query = dict(params, user_id=user_id) if "{}" not in path else params
+            with count_statements() as statements:
+                response = client.get(url, params=query)
+            assert response.status_code == 200
+            assert len(response.json()) == expected
+            counts[user_id] = len(statements)
+        assert counts[one] > 0
+        assert counts[one] == counts[many], f"{path}: {counts}"